@@ -12,95 +12,116 @@ import signal
 import threading
 import socket
 import argparse
-from src.core import FileMonitor, AudioProcessor
-from src.utils import ConfigManager, log_info, log_error
-from src.web.app import create_app
-import uvicorn
+from pathlib import Path
+from src.utils import ConfigManager, log_info, log_error, probe_folders
+
+# src.core, src.web and uvicorn pull in watchdog, the API SDKs and FastAPI; they
+# are imported where first needed so `main.py --help` stays fast
+
+# Ports never picked for the web server (system, well-known services, security issues)
+AVOID_PORTS = frozenset({
+    # System/privileged ports
+    22,    # SSH
+    23,    # Telnet
+    25,    # SMTP
+    53,    # DNS
+    80,    # HTTP
+    110,   # POP3
+    143,   # IMAP
+    443,   # HTTPS
+    993,   # IMAPS
+    995,   # POP3S
+    
+    # Database ports
+    1433,  # SQL Server
+    1521,  # Oracle
+    3306,  # MySQL
+    5432,  # PostgreSQL
+    6379,  # Redis
+    27017, # MongoDB
+    
+    # Development/common conflicts
+    3000,  # React dev server
+    4200,  # Angular dev server
+    5000,  # Flask default
+    5173,  # Vite dev server
+    8080,  # Common alt HTTP
+    8443,  # Common alt HTTPS
+    9000,  # Common dev port
+    
+    # Security/malware associated
+    1337,  # Often used by malware
+    31337, # Elite/hacker port
+    
+    # System services
+    135,   # Windows RPC
+    139,   # NetBIOS
+    445,   # SMB
+    1900,  # UPnP
+    5353,  # mDNS
+})
+
+PROCESSING_FOLDERS = ('watch', 'processed', 'error', 'output')
 
 class AudioProcessorApp:
     def __init__(self, port_override=None):
         self.config = ConfigManager()
         self.file_monitor = None
+        self.processor = None
         self.web_server = None
         self.running = False
         self.actual_port = None
         self.port_override = port_override
+        self.folders = {}
+        self._shutdown = threading.Event()
     
-    def find_available_port(self, start_port, max_attempts=20):
-        """Find an available port starting from start_port, avoiding problematic ports"""
-        # Ports to avoid (system, well-known services, security issues)
-        avoid_ports = {
-            # System/privileged ports
-            22,    # SSH
-            23,    # Telnet
-            25,    # SMTP
-            53,    # DNS
-            80,    # HTTP
-            110,   # POP3
-            143,   # IMAP
-            443,   # HTTPS
-            993,   # IMAPS
-            995,   # POP3S
-            
-            # Database ports
-            1433,  # SQL Server
-            1521,  # Oracle
-            3306,  # MySQL
-            5432,  # PostgreSQL
-            6379,  # Redis
-            27017, # MongoDB
-            
-            # Development/common conflicts
-            3000,  # React dev server
-            4200,  # Angular dev server
-            5000,  # Flask default
-            5173,  # Vite dev server
-            8080,  # Common alt HTTP
-            8443,  # Common alt HTTPS
-            9000,  # Common dev port
-            
-            # Security/malware associated
-            1337,  # Often used by malware
-            31337, # Elite/hacker port
-            
-            # System services
-            135,   # Windows RPC
-            139,   # NetBIOS
-            445,   # SMB
-            1900,  # UPnP
-            5353,  # mDNS
-        }
+    def find_available_port(self, start_port, host='127.0.0.1', max_attempts=20):
+        """Bind start_port if free, else an ephemeral port outside AVOID_PORTS; returns the bound socket"""
+        # Prefer the configured port; otherwise let the kernel pick a free one
+        try:
+            return self._bind_socket(host, start_port)
+        except OSError:
+            pass
         
-        for i in range(max_attempts):
-            port = start_port + i
-            
-            # Skip ports we want to avoid
-            if port in avoid_ports:
-                continue
-                
-            # Skip privileged ports (< 1024) unless specifically requested
-            if port < 1024 and start_port >= 1024:
-                continue
-                
-            try:
-                with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                    s.bind(('127.0.0.1', port))
-                    return port
-            except OSError:
-                continue
-                
-        raise RuntimeError(f"Could not find available port after {max_attempts} attempts starting from {start_port}")
+        for _ in range(max_attempts):
+            sock = self._bind_socket(host, 0)
+            if sock.getsockname()[1] not in AVOID_PORTS:
+                return sock
+            sock.close()
+        
+        raise RuntimeError(f"Could not find available port after {max_attempts} attempts (port {start_port} busy)")
+    
+    @staticmethod
+    def _bind_socket(host, port):
+        """Bind a TCP socket for the web server; the caller owns (and must close) it"""
+        family = socket.AF_INET6 if ':' in host else socket.AF_INET
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        try:
+            # No SO_REUSEADDR: on macOS/BSD it lets 127.0.0.1:port bind while another
+            # process listens on *:port, so a taken port would look free
+            if hasattr(socket, 'SO_EXCLUSIVEADDRUSE'):
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_EXCLUSIVEADDRUSE, 1)
+            sock.bind((host, port))
+        except OSError:
+            sock.close()
+            raise
+        return sock
     
     def start(self):
         """Start the complete application"""
+        from src.core import FileMonitor, AudioProcessor
+        
         try:
             log_info("Starting Audio Processor Application")
             log_info(f"Version: {self.config.get('app.version', '1.0.0')}")
             
+            self._ensure_folders()
+            
             # Test system health before starting (tolerant of missing keys)
             health = None
+            processor = None
             try:
-                processor = AudioProcessor()
+                processor = AudioProcessor(folders=self.folders)
                 health = processor.get_health_status()
             except Exception as e:
                 log_error(f"Health check limited: {e}")
@@ -110,13 +131,7 @@ class AudioProcessorApp:
                     'openai': False,
                     'database': True,
                 }
-                folders = {
-                    'watch': self.config.get("processing.watch_folder"),
-                    'processed': self.config.get("processing.processed_folder"),
-                    'error': self.config.get("processing.error_folder"),
-                    'output': self.config.get("processing.output_folder"),
-                }
-                folders = {k: bool(v and os.path.exists(v) and os.access(v, os.W_OK)) for k, v in folders.items()}
+                folders = probe_folders({name: self.folders.get(name) for name in PROCESSING_FOLDERS})
                 health = {
                     'connections': connections,
                     'folders': folders,
@@ -128,12 +143,15 @@ class AudioProcessorApp:
             if not health['healthy']:
                 log_error("System health check reported issues")
             
+            # One processor (and one set of API clients) for the file monitor and the web app
+            self.processor = processor
+            
             # Start file monitor only if watch folder configured
             try:
-                watch_folder = self.config.get('processing.watch_folder')
-                if watch_folder and os.path.isdir(watch_folder):
+                if self.folders.get('watch'):
                     log_info("Starting file monitor...")
-                    self.file_monitor = FileMonitor()
+                    # Reuses the health-check processor rather than opening a second set of clients
+                    self.file_monitor = FileMonitor(folders=self.folders, processor=processor)
                     self.file_monitor.start()
                 else:
                     log_error("Watch folder not configured or missing; skipping monitor. Configure on /admin")
@@ -154,43 +172,77 @@ class AudioProcessorApp:
             self.stop()
             raise
     
+    def _ensure_folders(self):
+        """Create the configured processing folders once and cache their absolute paths"""
+        folders = {}
+        for name in PROCESSING_FOLDERS:
+            path = self.config.get(f"processing.{name}_folder")
+            # Unset environment variables are left as {{$VAR}} placeholders
+            if not path or '{{' in path:
+                continue
+            try:
+                folder = Path(path).expanduser().absolute()
+                folder.mkdir(parents=True, exist_ok=True)
+            except OSError as e:
+                log_error(f"Cannot create {name} folder {path}: {e}")
+                continue
+            folders[name] = str(folder)
+        self.folders = folders
+    
     def _start_web_server(self):
         """Start the web server in a separate thread"""
         # Determine port to use
         desired_port = self.port_override or self.config.get('web.port', 8005)
         auto_port = self.config.get('web.auto_port', True)
+        host = self.config.get('web.host', '127.0.0.1')
         
+        # Bind here and hand the socket to uvicorn so nothing can take the port in between
+        sock = None
         if auto_port:
             try:
-                self.actual_port = self.find_available_port(desired_port)
-                if self.actual_port != desired_port:
-                    log_info(f"Port {desired_port} busy, using port {self.actual_port} instead")
-            except RuntimeError as e:
+                sock = self.find_available_port(desired_port, host)
+            except (RuntimeError, OSError) as e:
                 log_error(f"Port conflict resolution failed: {e}")
-                self.actual_port = desired_port  # Fall back to original port
-        else:
-            self.actual_port = desired_port
+        if sock is None:
+            try:
+                sock = self._bind_socket(host, desired_port)
+            except OSError as e:
+                log_error(f"Web server error: cannot bind {host}:{desired_port}: {e}")
+                self.actual_port = desired_port
+                return
+        
+        self.actual_port = sock.getsockname()[1]
+        if self.actual_port != desired_port:
+            log_info(f"Port {desired_port} busy, using port {self.actual_port} instead")
         
         def run_server():
             try:
-                app = create_app()
-                uvicorn.run(
+                import uvicorn
+                from src.web.app import create_app
+                
+                app = create_app(processor=self.processor)
+                # "auto" picks uvloop/httptools when installed (uvicorn[standard])
+                config = uvicorn.Config(
                     app,
-                    host=self.config.get('web.host', '127.0.0.1'),
-                    port=self.actual_port,
+                    loop=self.config.get('web.loop', 'auto'),
+                    http=self.config.get('web.http', 'auto'),
                     log_level="info" if self.config.get('app.debug', False) else "warning",
                     access_log=False
                 )
+                uvicorn.Server(config).run(sockets=[sock])
             except Exception as e:
                 log_error(f"Web server error: {e}")
+            finally:
+                sock.close()
         
         self.web_server = threading.Thread(target=run_server, daemon=True)
         self.web_server.start()
     
     def stop(self):
         """Stop the application gracefully"""
-        if not self.running:
+        if not self.running or self._shutdown.is_set():
             return
+        self._shutdown.set()
         
         log_info("Stopping Audio Processor Application...")
         
@@ -202,6 +254,10 @@ class AudioProcessorApp:
             
             # Web server will stop automatically as it's a daemon thread
             
+            # Flush queued database log rows and release pooled SQLite connections
+            from src.core import Database
+            Database.close_all()
+            
             self.running = False
             log_info("Audio Processor Application stopped")
             
@@ -210,22 +266,46 @@ class AudioProcessorApp:
     
     def run_forever(self):
         """Run the application indefinitely"""
+        shutdown_signals = {signal.SIGINT, signal.SIGTERM}
+        
+        if not hasattr(signal, 'sigwait'):
+            # Platforms without sigwait (Windows) keep asynchronous handlers
+            self._run_with_signal_handlers()
+            return
+        
+        # Block shutdown signals before any worker thread starts so every thread
+        # inherits the mask and only the sigwait below ever receives them
+        signal.pthread_sigmask(signal.SIG_BLOCK, shutdown_signals)
+        try:
+            self.start()
+            signum = signal.sigwait(shutdown_signals)
+            log_info(f"Received signal {signum}, shutting down...")
+            # A second signal kills the process outright in case stop() hangs or a
+            # non-daemon worker keeps it alive
+            for sig in shutdown_signals:
+                signal.signal(sig, signal.SIG_DFL)
+            signal.pthread_sigmask(signal.SIG_UNBLOCK, shutdown_signals)
+        finally:
+            self.stop()
+    
+    def _run_with_signal_handlers(self):
+        """Fallback run loop using signal.signal handlers"""
         self.start()
         
         # Setup signal handlers for graceful shutdown
         def signal_handler(signum, frame):
             log_info(f"Received signal {signum}, shutting down...")
             self.stop()
-            sys.exit(0)
         
         signal.signal(signal.SIGINT, signal_handler)
         signal.signal(signal.SIGTERM, signal_handler)
         
+        # Park the main thread until stop() sets the shutdown event. Windows cannot
+        # interrupt a blocking wait with Ctrl+C, so it wakes up periodically instead.
+        wait_timeout = 1 if os.name == 'nt' else None
         try:
-            # Keep main thread alive
-            while self.running:
-                import time
-                time.sleep(1)
+            while not self._shutdown.wait(wait_timeout):
+                pass
         except KeyboardInterrupt:
             log_info("Received keyboard interrupt")
         finally:
@@ -245,9 +325,9 @@ def main():
         
         # Override config with command line args
         if args.host:
-            app.config.config['web']['host'] = args.host
+            app.config.set('web.host', args.host)
         if args.no_auto_port:
-            app.config.config['web']['auto_port'] = False
+            app.config.set('web.auto_port', False)
             
         app.run_forever()
     except KeyboardInterrupt:
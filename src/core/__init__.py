@@ -1,8 +1,11 @@
 from .database import Database
+from .sqlite_cache import SQLiteLRUCache
+from .transcript_cache import TranscriptCache
+from .llm_cache import LLMCache
 from .deepgram_client import DeepgramTranscriber
 from .openai_client import OpenAIProcessor
 from .file_namer import IntelligentFileNamer
 from .processor import AudioProcessor
 from .file_monitor import FileMonitor
 
-__all__ = ['Database', 'DeepgramTranscriber', 'OpenAIProcessor', 'IntelligentFileNamer', 'AudioProcessor', 'FileMonitor']
+__all__ = ['Database', 'SQLiteLRUCache', 'TranscriptCache', 'LLMCache', 'DeepgramTranscriber', 'OpenAIProcessor', 'IntelligentFileNamer', 'AudioProcessor', 'FileMonitor']
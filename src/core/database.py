@@ -1,19 +1,94 @@
+import os
 import sqlite3
+import threading
+import weakref
+from functools import lru_cache
+from urllib.parse import quote
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Callable, Optional, List, Dict, Any, Tuple
 from contextlib import contextmanager
 from src.utils import ConfigManager, log_error, log_info
 
+# Per-connection tuning applied once when a pooled connection is opened
+_CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA wal_autocheckpoint=1000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+)
+
+_SCHEMA_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_jobs_status_created ON jobs(status, created_at DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_jobs_created ON jobs(created_at)",
+    # Log pages are read newest-first by id; every index ends with the rowid, so these also order by it
+    "CREATE INDEX IF NOT EXISTS idx_logs_job_level ON logs(job_id, level)",
+    "CREATE INDEX IF NOT EXISTS idx_logs_level ON logs(level)",
+)
+
+# Indexes from earlier schema versions, dropped so log inserts stop maintaining them
+_OBSOLETE_INDEXES = ('idx_logs_job_ts', 'idx_logs_level_ts')
+
+# Hot-path statements, kept as constants so the connection statement cache reuses them
+_STATEMENT_CACHE_SIZE = 256
+_SQL_INSERT_JOB = 'INSERT INTO jobs (filename, file_path, original_filename) VALUES (?, ?, ?)'
+_SQL_INSERT_LOG = 'INSERT INTO logs (job_id, level, message) VALUES (?, ?, ?)'
+
+_JOB_STATUSES = ('pending', 'processing', 'completed', 'failed')
+
+# Job columns that update_job_result may set
+_JOB_RESULT_FIELDS = frozenset({
+    'transcript_length', 'output_file', 'suggested_filename', 'final_filename',
+    'naming_confidence', 'manual_override', 'status', 'error_message',
+    'started_at', 'completed_at',
+})
+
+def _database_uri(db_path: str, shared_cache: bool = False) -> str:
+    """SQLite URI for db_path; mode=rwc creates the file if it is missing"""
+    uri = f"file:{quote(os.path.abspath(db_path))}?mode=rwc"
+    if shared_cache:
+        uri += "&cache=shared"
+    return uri
+
+@lru_cache(maxsize=None)
+def _update_job_sql(columns: tuple) -> str:
+    """UPDATE statement for one combination of job columns (the set of combinations is small)"""
+    assignments = ", ".join(f"{column} = ?" for column in columns)
+    return f'UPDATE jobs SET {assignments} WHERE id = ?'
+
+class _PooledConnection:
+    """One thread's connection; released with the thread-local when the thread exits"""
+    __slots__ = ('conn', 'closed', '__weakref__')
+    
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self.closed = False
+
 class Database:
+    # Every live pooled connection opened by any instance, so close_all() can release them
+    _pool: "weakref.WeakSet[_PooledConnection]" = weakref.WeakSet()
+    # Set by close_all(); later log_message calls are dropped rather than reopening a connection
+    _closed = False
+    # Callbacks run in the writing thread after each change to the jobs table (replaced, never mutated)
+    _job_listeners: tuple = ()
+    _registry_lock = threading.Lock()
+    
     def __init__(self):
         self.config = ConfigManager()
         self.db_path = self.config.get("DATABASE_URL", "sqlite:///data/audio_processor.db").replace("sqlite:///", "")
+        # Shared cache is opt-in: it trades WAL's reader/writer concurrency for table-level locks
+        self.db_uri = _database_uri(self.db_path, self.config.get("database.shared_cache", False))
+        self._local = threading.local()
         self._init_database()
     
     def _init_database(self):
         """Initialize database with required tables"""
-        with self.get_connection() as conn:
+        with self.get_write_connection() as conn:
+            # WAL is persistent in the database file; the other pragmas are per-connection
+            conn.execute("PRAGMA journal_mode=WAL")
             cursor = conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
             
             # Jobs table
             cursor.execute('''
@@ -57,126 +132,219 @@ class Database:
                 )
             ''')
             
-            conn.commit()
+            # OpenAI Batch API jobs and the job ids whose requests they carry
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS openai_batches (
+                    batch_id TEXT PRIMARY KEY,
+                    job_ids TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'submitted',
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    completed_at TIMESTAMP
+                )
+            ''')
+            
+            # Indexes backing the job listing, stats, log and cleanup queries
+            for index_sql in _SCHEMA_INDEXES:
+                cursor.execute(index_sql)
+            for index_name in _OBSOLETE_INDEXES:
+                cursor.execute(f"DROP INDEX IF EXISTS {index_name}")
+            
+            cursor.execute("COMMIT")
             log_info("Database initialized successfully")
     
+    def _open_connection(self, row_factory=None) -> _PooledConnection:
+        """Open a new connection for one of the calling thread's pool slots"""
+        conn = sqlite3.connect(
+            self.db_uri,
+            uri=True,
+            isolation_level=None,
+            check_same_thread=False,
+            cached_statements=_STATEMENT_CACHE_SIZE,
+        )
+        conn.row_factory = row_factory
+        for pragma in _CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        pooled = _PooledConnection(conn)
+        with Database._registry_lock:
+            Database._pool.add(pooled)
+        return pooled
+    
     @contextmanager
-    def get_connection(self):
-        """Get database connection with context manager"""
-        conn = None
+    def _pooled_connection(self, slot: str, row_factory=None):
+        """Yield the calling thread's pooled connection for the given slot"""
+        pooled = getattr(self._local, slot, None)
+        if pooled is None or pooled.closed:
+            pooled = self._open_connection(row_factory)
+            setattr(self._local, slot, pooled)
+        conn = pooled.conn
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row  # Enable dict-like access
             yield conn
         except Exception as e:
-            if conn:
+            if conn.in_transaction:
                 conn.rollback()
             log_error(f"Database error: {e}")
             raise
-        finally:
-            if conn:
-                conn.close()
+    
+    def get_read_connection(self):
+        """Get the calling thread's pooled connection for queries (rows as sqlite3.Row)"""
+        return self._pooled_connection('read', sqlite3.Row)  # Enable dict-like access
+    
+    def get_write_connection(self):
+        """Get the calling thread's pooled connection for INSERT/UPDATE/DELETE (plain tuples)"""
+        return self._pooled_connection('write')
+    
+    # Historical name; callers that read rows by column name get the read connection
+    get_connection = get_read_connection
+    
+    @classmethod
+    def close_all(cls):
+        """Close every pooled connection (call once on application shutdown)"""
+        with cls._registry_lock:
+            cls._closed = True
+            pool = list(cls._pool)
+            cls._pool.clear()
+        for pooled in pool:
+            pooled.closed = True
+            try:
+                pooled.conn.close()
+            except Exception as e:
+                log_error(f"Error closing database connection: {e}")
+    
+    @classmethod
+    def add_job_listener(cls, callback: Callable[[], None]):
+        """Call callback (from the writing thread, so keep it cheap) whenever any job is created, updated or deleted"""
+        with cls._registry_lock:
+            cls._job_listeners += (callback,)
+    
+    @classmethod
+    def remove_job_listener(cls, callback: Callable[[], None]):
+        with cls._registry_lock:
+            cls._job_listeners = tuple(listener for listener in cls._job_listeners if listener is not callback)
+    
+    def _jobs_changed(self):
+        for listener in Database._job_listeners:
+            try:
+                listener()
+            except Exception as e:
+                log_error(f"Job listener failed: {e}")
     
     def create_job(self, filename: str, file_path: str) -> int:
         """Create a new job record"""
-        with self.get_connection() as conn:
+        with self.get_write_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute('''
-                INSERT INTO jobs (filename, file_path, original_filename)
-                VALUES (?, ?, ?)
-            ''', (filename, file_path, filename))
+            cursor.execute(_SQL_INSERT_JOB, (filename, file_path, filename))
             job_id = cursor.lastrowid
             conn.commit()
-            log_info(f"Created job {job_id} for file: {filename}")
-            return job_id
+        log_info(f"Created job {job_id} for file: {filename}")
+        self._jobs_changed()
+        return job_id
     
-    def update_job_status(self, job_id: int, status: str, error_message: Optional[str] = None):
-        """Update job status"""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            update_fields = ["status = ?"]
-            params = [status]
-            
-            if status == 'processing':
-                update_fields.append("started_at = ?")
-                params.append(datetime.now())
-            elif status in ['completed', 'failed']:
-                update_fields.append("completed_at = ?")
-                params.append(datetime.now())
-            
-            if error_message:
-                update_fields.append("error_message = ?")
-                params.append(error_message)
-            
-            params.append(job_id)
-            
-            cursor.execute(f'''
-                UPDATE jobs SET {", ".join(update_fields)}
-                WHERE id = ?
-            ''', params)
-            conn.commit()
-            log_info(f"Updated job {job_id} status to: {status}", job_id)
+    def update_job_result(self, job_id: int, **fields):
+        """Update several job columns in a single UPDATE (one commit per state transition)"""
+        unknown = fields.keys() - _JOB_RESULT_FIELDS
+        if unknown:
+            raise ValueError(f"Unknown job fields: {', '.join(sorted(unknown))}")
+        if not fields:
+            return
+        
+        with self.get_write_connection() as conn:
+            conn.execute(_update_job_sql(tuple(fields)), (*fields.values(), job_id))
+        self._jobs_changed()
+    
+    def update_job_status(self, job_id: int, status: str, error_message: Optional[str] = None, **fields):
+        """Update job status, optionally together with other result columns"""
+        fields['status'] = status
+        if status == 'processing':
+            fields['started_at'] = datetime.now()
+        elif status in ['completed', 'failed']:
+            fields['completed_at'] = datetime.now()
+        
+        if error_message:
+            fields['error_message'] = error_message
+        
+        self.update_job_result(job_id, **fields)
+        log_info(f"Updated job {job_id} status to: {status}", job_id)
     
     def update_job_transcript(self, job_id: int, transcript_length: int):
         """Update job with transcript information"""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                UPDATE jobs SET transcript_length = ?
-                WHERE id = ?
-            ''', (transcript_length, job_id))
-            conn.commit()
+        self.update_job_result(job_id, transcript_length=transcript_length)
     
     def update_job_output(self, job_id: int, output_file: str):
         """Update job with output file information"""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                UPDATE jobs SET output_file = ?
-                WHERE id = ?
-            ''', (output_file, job_id))
-            conn.commit()
+        self.update_job_result(job_id, output_file=output_file)
     
     def update_job_naming(self, job_id: int, suggested_filename: str, 
                          final_filename: str, confidence: float, manual_override: bool = False):
         """Update job with naming information"""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                UPDATE jobs SET 
-                    suggested_filename = ?,
-                    final_filename = ?,
-                    naming_confidence = ?,
-                    manual_override = ?
-                WHERE id = ?
-            ''', (suggested_filename, final_filename, confidence, manual_override, job_id))
-            conn.commit()
+        self.update_job_result(
+            job_id,
+            suggested_filename=suggested_filename,
+            final_filename=final_filename,
+            naming_confidence=confidence,
+            manual_override=manual_override,
+        )
+    
+    def create_batch(self, batch_id: str, job_ids: List[int]):
+        """Record a submitted OpenAI batch and the jobs waiting on it"""
+        with self.get_write_connection() as conn:
+            conn.execute(
+                'INSERT INTO openai_batches (batch_id, job_ids) VALUES (?, ?)',
+                (batch_id, ','.join(map(str, job_ids))),
+            )
+    
+    def update_batch_status(self, batch_id: str, status: str):
+        """Record the final state of an OpenAI batch"""
+        with self.get_write_connection() as conn:
+            conn.execute(
+                'UPDATE openai_batches SET status = ?, completed_at = ? WHERE batch_id = ?',
+                (status, datetime.now(), batch_id),
+            )
+    
+    def get_pending_batches(self) -> List[Tuple[str, List[int]]]:
+        """(batch_id, job_ids) of OpenAI batches that have not finished yet, oldest first"""
+        with self.get_read_connection() as conn:
+            rows = conn.execute(
+                "SELECT batch_id, job_ids FROM openai_batches WHERE status = 'submitted' ORDER BY created_at"
+            ).fetchall()
+        return [(batch_id, [int(job_id) for job_id in job_ids.split(',') if job_id]) for batch_id, job_ids in rows]
     
     def get_job(self, job_id: int) -> Optional[Dict[str, Any]]:
         """Get job by ID"""
-        with self.get_connection() as conn:
+        with self.get_read_connection() as conn:
             cursor = conn.cursor()
             cursor.execute('SELECT * FROM jobs WHERE id = ?', (job_id,))
             row = cursor.fetchone()
             return dict(row) if row else None
     
-    def get_jobs(self, status: Optional[str] = None, limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
-        """Get jobs with optional filtering"""
-        with self.get_connection() as conn:
+    @staticmethod
+    def _jobs_query(status: Optional[str], limit: int, offset: int, q: Optional[str] = None):
+        """SELECT statement and parameters for get_jobs"""
+        query = 'SELECT * FROM jobs'
+        params = []
+        conditions = []
+        
+        if status:
+            conditions.append('status = ?')
+            params.append(status)
+        
+        if q:
+            # Case-insensitive substring match; LIKE wildcards typed by the user match literally
+            conditions.append("filename LIKE ? ESCAPE '\\'")
+            params.append('%' + q.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%')
+        
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(conditions)
+        
+        query += ' ORDER BY created_at DESC LIMIT ? OFFSET ?'
+        params.extend([limit, offset])
+        return query, params
+    
+    def get_jobs(self, status: Optional[str] = None, limit: int = 50, offset: int = 0,
+                 q: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Get jobs with optional filtering (q matches anywhere in the filename)"""
+        with self.get_read_connection() as conn:
             cursor = conn.cursor()
-            
-            query = 'SELECT * FROM jobs'
-            params = []
-            
-            if status:
-                query += ' WHERE status = ?'
-                params.append(status)
-            
-            query += ' ORDER BY created_at DESC LIMIT ? OFFSET ?'
-            params.extend([limit, offset])
-            
-            cursor.execute(query, params)
+            cursor.execute(*self._jobs_query(status, limit, offset, q))
             return [dict(row) for row in cursor.fetchall()]
     
     def get_recent_jobs(self, limit: int = 10) -> List[Dict[str, Any]]:
@@ -185,55 +353,46 @@ class Database:
     
     def get_job_stats(self) -> Dict[str, Any]:
         """Get job statistics"""
-        with self.get_connection() as conn:
+        with self.get_read_connection() as conn:
             cursor = conn.cursor()
             
-            # Total jobs
-            cursor.execute('SELECT COUNT(*) as total FROM jobs')
-            total = cursor.fetchone()['total']
-            
-            # Jobs by status
+            # Totals, per-status counts and today's jobs in a single scan
             cursor.execute('''
-                SELECT status, COUNT(*) as count 
-                FROM jobs 
-                GROUP BY status
+                SELECT COUNT(*) AS total,
+                       COALESCE(SUM(status = 'pending'), 0) AS pending,
+                       COALESCE(SUM(status = 'processing'), 0) AS processing,
+                       COALESCE(SUM(status = 'completed'), 0) AS completed,
+                       COALESCE(SUM(status = 'failed'), 0) AS failed,
+                       COALESCE(SUM(created_at >= DATE('now', 'start of day')), 0) AS today
+                FROM jobs
             ''')
-            status_counts = {row['status']: row['count'] for row in cursor.fetchall()}
-            
-            # Jobs today
-            cursor.execute('''
-                SELECT COUNT(*) as today 
-                FROM jobs 
-                WHERE DATE(created_at) = DATE('now')
-            ''')
-            today = cursor.fetchone()['today']
+            row = cursor.fetchone()
+            status_counts = {status: row[status] for status in _JOB_STATUSES if row[status]}
             
             # Success rate
-            completed = status_counts.get('completed', 0)
-            failed = status_counts.get('failed', 0)
+            completed = row['completed']
+            failed = row['failed']
             success_rate = (completed / (completed + failed) * 100) if (completed + failed) > 0 else 0
             
             return {
-                'total': total,
+                'total': row['total'],
                 'status_counts': status_counts,
-                'today': today,
+                'today': row['today'],
                 'success_rate': round(success_rate, 1)
             }
     
     def log_message(self, job_id: Optional[int], level: str, message: str):
-        """Log a message to the database"""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                INSERT INTO logs (job_id, level, message)
-                VALUES (?, ?, ?)
-            ''', (job_id, level, message))
-            conn.commit()
+        """Log a message to the database (ignored once close_all has run)"""
+        if Database._closed:
+            return
+        with self.get_write_connection() as conn:
+            conn.execute(_SQL_INSERT_LOG, (job_id, level, message))
     
     def get_logs(self, job_id: Optional[int] = None, level: Optional[str] = None, 
-                limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
-        """Get logs with optional filtering"""
-        with self.get_connection() as conn:
+                limit: int = 100, offset: int = 0, before_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get logs with optional filtering, newest first.
+        For the next page pass the last row's id as before_id (an index seek) rather than a growing offset."""
+        with self.get_read_connection() as conn:
             cursor = conn.cursor()
             
             query = 'SELECT * FROM logs'
@@ -248,10 +407,14 @@ class Database:
                 conditions.append('level = ?')
                 params.append(level)
             
+            if before_id is not None:
+                conditions.append('id < ?')
+                params.append(before_id)
+            
             if conditions:
                 query += ' WHERE ' + ' AND '.join(conditions)
             
-            query += ' ORDER BY timestamp DESC LIMIT ? OFFSET ?'
+            query += ' ORDER BY id DESC LIMIT ? OFFSET ?'
             params.extend([limit, offset])
             
             cursor.execute(query, params)
@@ -259,13 +422,15 @@ class Database:
     
     def cleanup_old_jobs(self, days: int = 90):
         """Clean up old job records"""
-        with self.get_connection() as conn:
+        with self.get_write_connection() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 DELETE FROM jobs 
-                WHERE created_at < datetime('now', '-{} days')
-            '''.format(days))
+                WHERE created_at < datetime('now', ?)
+            ''', (f'-{int(days)} days',))
             deleted = cursor.rowcount
             conn.commit()
-            log_info(f"Cleaned up {deleted} old job records")
-            return deleted
+        log_info(f"Cleaned up {deleted} old job records")
+        if deleted:
+            self._jobs_changed()
+        return deleted
@@ -1,10 +1,119 @@
+import io
 import os
+import asyncio
+import json
+import mmap
+import random
+import shutil
+import signal
+import subprocess
+import threading
 import time
+import uuid
+from functools import lru_cache
+from itertools import groupby
+from operator import attrgetter
 from typing import Dict, Any, Optional
-from deepgram import DeepgramClient, DeepgramClientOptions, FileSource
-from src.utils import ConfigManager, log_info, log_error, log_warning
+import httpx
+from deepgram import DeepgramClient, DeepgramClientOptions, DeepgramApiError, FileSource, LiveTranscriptionEvents
+from mutagen import File as MutagenFile
+
+try:
+    import webrtcvad
+except ImportError:  # optional: silence preflight is skipped without it
+    webrtcvad = None
+from src.core.transcript_cache import TranscriptCache
+from src.utils import ConfigManager, close_on_exit, log_info, log_error, log_warning, log_debug, log_enabled
+
+# Raw PCM fed to the live endpoint: 16 kHz mono s16le, sent in 100 ms frames
+_STREAM_SAMPLE_RATE = 16000
+_STREAM_FRAME_BYTES = 3200
+# webrtcvad takes 10/20/30 ms frames; 30 ms of 16 kHz s16le
+_VAD_FRAME_BYTES = 960
+
+# Formats worth transcoding to Opus before upload; compressed inputs are sent as-is
+_UNCOMPRESSED_FORMATS = frozenset({".wav", ".wave", ".flac", ".aif", ".aiff"})
+
+NO_SPEECH_TRANSCRIPT = "No speech detected in audio file."
+
+def _unblock_signals():
+    """preexec_fn for ffmpeg: main.py blocks SIGINT/SIGTERM in every thread, and children inherit the mask"""
+    signal.pthread_sigmask(signal.SIG_SETMASK, ())
+
+# Lets Ctrl+C and SIGTERM reach ffmpeg again (Windows has no signal masks)
+_FFMPEG_PREEXEC = _unblock_signals if hasattr(signal, "pthread_sigmask") else None
+
+# Grouping key for runs of words by the same speaker
+_get_speaker = attrgetter("speaker")
+
+@lru_cache(maxsize=None)
+def _shared_client(api_key: str, verbose: int) -> DeepgramClient:
+    """Build the Deepgram client once per API key rather than once per transcriber"""
+    config_options = DeepgramClientOptions(
+        verbose=verbose,
+        # Keeps live streaming sockets open while ffmpeg is slow to produce audio
+        options={"keepalive": "true"},
+    )
+    return DeepgramClient(api_key, config_options)
+
+class _PooledTransport(httpx.HTTPTransport):
+    """Transport whose connection pool outlives the SDK's per-request httpx.Client.
+    The SDK closes the transport it was given when that client exits; closing is ignored here
+    so later requests reuse warm TLS connections to the API."""
+    
+    def __exit__(self, *exc_info):
+        pass
+    
+    def close(self):
+        pass
+
+class _PooledAsyncTransport(httpx.AsyncHTTPTransport):
+    """Async counterpart of _PooledTransport; DeepgramTranscriber.aclose() really closes it"""
+    
+    async def __aexit__(self, *exc_info):
+        pass
+    
+    async def aclose(self):
+        pass
+
+# Idle connections are kept past the 30 s health-probe interval so each probe reuses one
+_KEEPALIVE_EXPIRY = 60
+
+@lru_cache(maxsize=None)
+def _shared_transport() -> httpx.HTTPTransport:
+    """One process-wide pool for Deepgram REST calls (HTTP/1.1: uploads stream faster than over h2)"""
+    return _PooledTransport(limits=httpx.Limits(max_connections=32, max_keepalive_connections=32, keepalive_expiry=_KEEPALIVE_EXPIRY))
+
+# Upper bound on a single retry backoff, in seconds
+_RETRY_MAX_WAIT = 30
+
+def _is_retriable(error: Exception) -> bool:
+    """Network failures, 429 and 5xx are worth retrying; other API errors will fail the same way again"""
+    status = getattr(error, "status", None)
+    if status is None:
+        return True
+    try:
+        code = int(status)
+    except (TypeError, ValueError):
+        return True
+    return code == 429 or code >= 500
+
+class _MappedAudio(mmap.mmap):
+    """Read-only file mapping that httpx can send as a streamed request body"""
+    
+    def seek(self, pos: int, whence: int = os.SEEK_SET) -> int:
+        # mmap.seek returns None before 3.13; httpx needs the offset to size the body
+        super().seek(pos, whence)
+        return self.tell()
+    
+    def __iter__(self):
+        return iter(lambda: self.read(1 << 16), b"")
 
 class DeepgramTranscriber:
+    # Shared by every transcriber in the process so parallel workers stay under the API rate limit
+    _request_slots = None
+    _request_slots_lock = threading.Lock()
+    
     def __init__(self):
         self.config = ConfigManager()
         self.api_key = os.getenv("DEEPGRAM_API_KEY")
@@ -12,11 +121,27 @@ class DeepgramTranscriber:
         if not self.api_key or self.api_key == "your_deepgram_key_here":
             raise ValueError("Deepgram API key not configured. Please set DEEPGRAM_API_KEY in your .env file")
         
-        # Configure Deepgram client
-        config_options = DeepgramClientOptions(
-            verbose=1 if self.config.get("app.debug", False) else 0
-        )
-        self.client = DeepgramClient(self.api_key, config_options)
+        # One client per process, shared by every worker thread
+        self.client = _shared_client(self.api_key, 1 if self.config.get("app.debug", False) else 0)
+        # Async transports by event loop (an async pool cannot be shared across loops), for the health probe
+        self._async_transports = {}
+        close_on_exit(self.aclose)
+        
+        # Reprocessing the same audio with the same options skips the API entirely
+        self.cache = None
+        if self.config.get("deepgram.cache.enabled", True):
+            try:
+                self.cache = TranscriptCache(
+                    self.config.get("deepgram.cache.path"),
+                    self.config.get("deepgram.cache.max_entries", 1000),
+                )
+            except Exception as e:
+                log_warning(f"Transcript cache unavailable: {e}")
+        
+        with DeepgramTranscriber._request_slots_lock:
+            if DeepgramTranscriber._request_slots is None:
+                max_concurrent = max(1, int(self.config.get("processing.max_concurrent", 4)))
+                DeepgramTranscriber._request_slots = threading.BoundedSemaphore(max_concurrent)
     
     def transcribe_file(self, file_path: str, job_id: Optional[int] = None) -> str:
         """
@@ -32,14 +157,6 @@ class DeepgramTranscriber:
         try:
             log_info(f"Starting Deepgram transcription for: {file_path}", job_id)
             
-            # Read audio file
-            with open(file_path, "rb") as audio_file:
-                buffer_data = audio_file.read()
-            
-            payload: FileSource = {
-                "buffer": buffer_data,
-            }
-            
             # Configure transcription options
             options = {
                 "model": self.config.get("deepgram.model", "nova-2"),
@@ -51,15 +168,23 @@ class DeepgramTranscriber:
                 "numerals": self.config.get("deepgram.features.numerals", True),
             }
             
-            log_info(f"Sending file to Deepgram with options: {options}", job_id)
+            # One mapping serves both the cache hash and the upload, so the file is read from disk once
+            with open(file_path, "rb") as audio_file, \
+                    _MappedAudio(audio_file.fileno(), 0, access=mmap.ACCESS_READ) as audio:
+                cache_key = None
+                if self.cache:
+                    streaming = self.config.get("deepgram.streaming.enabled", False)
+                    cache_key = self.cache.make_key(audio, {**options, "streaming": streaming})
+                    cached = self.cache.get(cache_key)
+                    if cached is not None:
+                        log_info(f"Using cached transcript ({self.cache.stats()}). Length: {len(cached)} characters", job_id)
+                        return cached
+                
+                with self._request_slots:
+                    transcript = self._transcribe_uncached(file_path, audio, options, job_id)
             
-            # Make API call with retry logic
-            response = self._transcribe_with_retry(payload, options, job_id)
-            
-            # Process response to get formatted transcript
-            transcript = self._format_transcript(response, job_id)
-            
-            log_info(f"Deepgram transcription completed. Length: {len(transcript)} characters", job_id)
+            if cache_key and transcript != "Error processing transcript":
+                self.cache.put(cache_key, transcript)
             return transcript
             
         except Exception as e:
@@ -67,77 +192,280 @@ class DeepgramTranscriber:
             log_error(error_msg, job_id)
             raise Exception(error_msg)
     
+    def _transcribe_uncached(self, file_path: str, audio: "_MappedAudio", options: Dict[str, Any],
+                             job_id: Optional[int] = None) -> str:
+        """Run the transcription against the API (live stream for long files when enabled)"""
+        if self._is_silent(file_path, job_id):
+            log_info("No speech found by local voice detection, skipping Deepgram", job_id)
+            return NO_SPEECH_TRANSCRIPT
+        
+        if self._should_stream(file_path):
+            try:
+                return self.transcribe_file_streaming(file_path, job_id)
+            except Exception as e:
+                log_warning(f"Streaming transcription failed, falling back to prerecorded: {e}", job_id)
+        
+        if log_enabled():
+            log_debug(f"Sending file to Deepgram with options: {options}", job_id)
+        
+        opus = self._transcode_to_opus(file_path, len(audio), job_id)
+        if opus:
+            payload: FileSource = {"buffer": opus}
+        else:
+            # The upload reads the mapping in chunks as the request body is sent
+            payload = {"stream": audio}
+        
+        # Make API call with retry logic
+        response = self._transcribe_with_retry(payload, options, job_id)
+        
+        # Process response to get formatted transcript
+        transcript = self._format_transcript(response, job_id)
+        
+        log_info(f"Deepgram transcription completed. Length: {len(transcript)} characters", job_id)
+        return transcript
+    
+    def _transcode_to_opus(self, file_path: str, source_size: int, job_id: Optional[int] = None) -> Optional[bytes]:
+        """Compress uncompressed audio to mono voice-grade Opus for upload; None means send the original"""
+        if not self.config.get("deepgram.transcode.enabled", False):
+            return None
+        if os.path.splitext(file_path)[1].lower() not in _UNCOMPRESSED_FORMATS:
+            return None
+        if not shutil.which("ffmpeg"):
+            return None
+        
+        cmd = [
+            "ffmpeg", "-nostdin", "-loglevel", "error", "-i", file_path,
+            "-c:a", "libopus", "-b:a", str(self.config.get("deepgram.transcode.bitrate", "24k")),
+            "-ac", "1", "-ar", str(_STREAM_SAMPLE_RATE), "-f", "ogg", "-",
+        ]
+        try:
+            opus = subprocess.run(
+                cmd,
+                capture_output=True,
+                check=True,
+                timeout=self.config.get("deepgram.transcode.timeout", 300),
+                preexec_fn=_FFMPEG_PREEXEC,
+            ).stdout
+        except (subprocess.SubprocessError, OSError) as e:
+            log_warning(f"Opus transcode failed, uploading original file: {e}", job_id)
+            return None
+        
+        if not opus:
+            return None
+        log_info(f"Transcoded to Opus for upload: {source_size} -> {len(opus)} bytes", job_id)
+        return opus
+    
+    def _is_silent(self, file_path: str, job_id: Optional[int] = None) -> bool:
+        """Run a local VAD over the start of the file; True only when it is confidently speech-free"""
+        if webrtcvad is None or not self.config.get("deepgram.vad.enabled", False):
+            return False
+        if not shutil.which("ffmpeg"):
+            return False
+        
+        window = self.config.get("deepgram.vad.window", 30)
+        cmd = [
+            "ffmpeg", "-nostdin", "-loglevel", "error",
+            "-t", str(window), "-i", file_path,
+            "-ac", "1", "-ar", str(_STREAM_SAMPLE_RATE), "-f", "s16le", "-",
+        ]
+        try:
+            pcm = subprocess.run(cmd, capture_output=True, check=True, timeout=120, preexec_fn=_FFMPEG_PREEXEC).stdout
+        except (subprocess.SubprocessError, OSError) as e:
+            log_warning(f"Voice detection preflight failed, sending file anyway: {e}", job_id)
+            return False
+        
+        frames = len(pcm) // _VAD_FRAME_BYTES
+        if not frames:
+            # Nothing decoded; let Deepgram report on the file
+            return False
+        
+        vad = webrtcvad.Vad(self.config.get("deepgram.vad.aggressiveness", 2))
+        voiced = sum(
+            vad.is_speech(pcm[i:i + _VAD_FRAME_BYTES], _STREAM_SAMPLE_RATE)
+            for i in range(0, frames * _VAD_FRAME_BYTES, _VAD_FRAME_BYTES)
+        )
+        return voiced / frames < self.config.get("deepgram.vad.min_speech_ratio", 0.05)
+    
+    def _should_stream(self, file_path: str) -> bool:
+        """Use the live endpoint only when enabled, ffmpeg is available and the file is long enough"""
+        if not self.config.get("deepgram.streaming.enabled", False):
+            return False
+        if not shutil.which("ffmpeg"):
+            log_warning("Deepgram streaming enabled but ffmpeg not found; using prerecorded API")
+            return False
+        try:
+            audio = MutagenFile(file_path)
+            duration = audio.info.length if audio and audio.info else 0
+        except Exception:
+            return False
+        return duration >= self.config.get("deepgram.streaming.min_duration", 30)
+    
+    def transcribe_file_streaming(self, file_path: str, job_id: Optional[int] = None) -> str:
+        """
+        Transcribe audio file over Deepgram's live WebSocket endpoint
+        
+        The file is decoded to 16 kHz mono PCM by ffmpeg and pushed in 100 ms frames,
+        so recognition runs while the rest of the file is still being decoded and sent.
+        
+        Args:
+            file_path: Path to the audio file
+            job_id: Optional job ID for logging
+            
+        Returns:
+            Formatted transcript with speaker labels
+        """
+        options = {
+            "model": self.config.get("deepgram.model", "nova-2"),
+            "punctuate": self.config.get("deepgram.features.punctuate", True),
+            "diarize": self.config.get("deepgram.features.speaker_diarize", True),
+            "smart_format": self.config.get("deepgram.features.smart_format", True),
+            "numerals": self.config.get("deepgram.features.numerals", True),
+            "encoding": "linear16",
+            "sample_rate": _STREAM_SAMPLE_RATE,
+            "channels": 1,
+        }
+        
+        final_words = []
+        errors = []
+        done = threading.Event()
+        
+        def on_transcript(_client, result, **kwargs):
+            if result.is_final and result.channel.alternatives:
+                final_words.extend(result.channel.alternatives[0].words or [])
+        
+        def on_error(_client, error, **kwargs):
+            errors.append(error)
+            done.set()
+        
+        def on_finished(_client, *args, **kwargs):
+            # Metadata follows the last results once the server has flushed the stream
+            done.set()
+        
+        listen = self.client.listen
+        connection = (listen.websocket if hasattr(listen, "websocket") else listen.live).v("1")
+        connection.on(LiveTranscriptionEvents.Transcript, on_transcript)
+        connection.on(LiveTranscriptionEvents.Error, on_error)
+        connection.on(LiveTranscriptionEvents.Metadata, on_finished)
+        connection.on(LiveTranscriptionEvents.Close, on_finished)
+        
+        if log_enabled():
+            log_debug(f"Streaming file to Deepgram live endpoint with options: {options}", job_id)
+        if connection.start(options) is False:
+            raise Exception("Could not open Deepgram live connection")
+        
+        ffmpeg = subprocess.Popen(
+            ["ffmpeg", "-nostdin", "-loglevel", "error", "-i", file_path,
+             "-f", "s16le", "-ar", str(_STREAM_SAMPLE_RATE), "-ac", "1", "-"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            preexec_fn=_FFMPEG_PREEXEC,
+        )
+        try:
+            while not done.is_set():
+                frame = ffmpeg.stdout.read(_STREAM_FRAME_BYTES)
+                if not frame:
+                    break
+                connection.send(frame)
+            
+            # Ask the server to flush outstanding results, then wait for it to finish
+            connection.send(json.dumps({"type": "CloseStream"}))
+            done.wait(timeout=self.config.get("deepgram.streaming.finish_timeout", 60))
+        finally:
+            ffmpeg.stdout.close()
+            ffmpeg.kill()
+            ffmpeg.wait()
+            connection.finish()
+        
+        if ffmpeg.returncode not in (0, -9) and not final_words:
+            raise Exception(f"ffmpeg failed to decode audio: {ffmpeg.stderr.read().decode(errors='replace').strip()}")
+        if errors:
+            raise Exception(f"Deepgram live transcription error: {errors[0]}")
+        
+        transcript = "\n\n".join(
+            f"[Speaker {speaker}]: {' '.join(word.punctuated_word or word.word for word in words)}"
+            if speaker is not None else ' '.join(word.punctuated_word or word.word for word in words)
+            for speaker, words in groupby(final_words, key=_get_speaker)
+        )
+        if not transcript.strip():
+            log_warning("Empty transcript generated from Deepgram live stream", job_id)
+            return NO_SPEECH_TRANSCRIPT
+        
+        log_info(f"Deepgram streaming transcription completed. Length: {len(transcript)} characters", job_id)
+        return transcript
+    
     def _transcribe_with_retry(self, payload: FileSource, options: Dict[str, Any], 
                               job_id: Optional[int] = None, max_retries: int = 3) -> Any:
-        """Transcribe with retry logic"""
+        """Transcribe with retry logic (jittered backoff; client errors other than 429 are not retried)"""
+        # Correlates every attempt of this transcription in the logs
+        attempt_tag = uuid.uuid4().hex[:12]
         for attempt in range(max_retries):
             try:
-                response = self.client.listen.prerecorded.v("1").transcribe_file(payload, options)
+                if "stream" in payload:
+                    # A failed attempt may have consumed part of the stream
+                    payload["stream"].seek(0)
+                response = self.client.listen.prerecorded.v("1").transcribe_file(payload, options, transport=_shared_transport())
+                request_id = getattr(getattr(response, "metadata", None), "request_id", None)
+                if request_id:
+                    log_info(f"Deepgram request {request_id} completed (attempt {attempt + 1}, {attempt_tag})", job_id)
                 return response
             except Exception as e:
-                if attempt < max_retries - 1:
-                    wait_time = 2 ** attempt  # Exponential backoff
-                    log_warning(f"Deepgram API attempt {attempt + 1} failed: {e}. Retrying in {wait_time}s", job_id)
+                if attempt < max_retries - 1 and _is_retriable(e):
+                    # Full jitter keeps parallel workers from retrying in lockstep
+                    wait_time = random.uniform(0, min(_RETRY_MAX_WAIT, 2 ** attempt))
+                    log_warning(f"Deepgram API attempt {attempt + 1} ({attempt_tag}) failed: {e}. Retrying in {wait_time:.1f}s", job_id)
                     time.sleep(wait_time)
                 else:
                     raise e
     
+    def _format_alternative(self, out: io.StringIO, alternative: Any, job_id: Optional[int] = None):
+        """Write one alternative to out as speaker-labelled blocks, each followed by a blank line"""
+        if alternative.paragraphs and alternative.paragraphs.paragraphs:
+            # Use paragraph-based formatting (preferred for diarization)
+            for paragraph in alternative.paragraphs.paragraphs:
+                # Extract text from words in the paragraph, falling back to sentences
+                if getattr(paragraph, 'words', None):
+                    transcript_text = " ".join(word.word for word in paragraph.words)
+                else:
+                    transcript_text = " ".join(sentence.text for sentence in paragraph.sentences)
+                
+                if transcript_text.strip():
+                    out.write(f"[Speaker {paragraph.speaker}]: {transcript_text}\n\n")
+        
+        elif alternative.words:
+            # Fallback: one utterance per run of consecutive words from the same speaker
+            for speaker, words in groupby(alternative.words, key=_get_speaker):
+                out.write(f"[Speaker {speaker}]: {' '.join(word.word for word in words)}\n\n")
+        
+        else:
+            # Last resort: Use transcript without speaker labels
+            log_warning("No speaker diarization data found, using basic transcript", job_id)
+            transcript_text = getattr(alternative, 'transcript', None)
+            if transcript_text:
+                out.write(f"{transcript_text}\n\n")
+    
     def _format_transcript(self, response: Any, job_id: Optional[int] = None) -> str:
         """Format Deepgram response into readable transcript with speaker labels"""
         try:
-            full_transcript = []
-            
             if not response.results or not response.results.channels:
                 log_warning("No transcription results found in Deepgram response", job_id)
                 return ""
             
-            for channel in response.results.channels:
-                for alternative in channel.alternatives:
-                    if alternative.paragraphs and alternative.paragraphs.paragraphs:
-                        # Use paragraph-based formatting (preferred for diarization)
-                        for paragraph in alternative.paragraphs.paragraphs:
-                            speaker = paragraph.speaker
-                            # Extract text from words in the paragraph
-                            if hasattr(paragraph, 'words') and paragraph.words:
-                                transcript_text = " ".join([word.word for word in paragraph.words])
-                            else:
-                                # Fallback to sentences if words not available
-                                transcript_text = " ".join([sentence.text for sentence in paragraph.sentences])
-                            
-                            if transcript_text.strip():
-                                full_transcript.append(f"[Speaker {speaker}]: {transcript_text}")
-                    
-                    elif alternative.words:
-                        # Fallback: Use word-level speaker information
-                        current_speaker = -1
-                        current_utterance = []
-                        
-                        for word_data in alternative.words:
-                            if hasattr(word_data, 'speaker') and word_data.speaker != current_speaker:
-                                # Speaker changed, save previous utterance
-                                if current_utterance and current_speaker != -1:
-                                    full_transcript.append(f"[Speaker {current_speaker}]: {' '.join(current_utterance)}")
-                                
-                                current_speaker = word_data.speaker
-                                current_utterance = [word_data.word]
-                            else:
-                                current_utterance.append(word_data.word)
-                        
-                        # Add final utterance
-                        if current_utterance and current_speaker != -1:
-                            full_transcript.append(f"[Speaker {current_speaker}]: {' '.join(current_utterance)}")
-                    
-                    else:
-                        # Last resort: Use transcript without speaker labels
-                        log_warning("No speaker diarization data found, using basic transcript", job_id)
-                        if hasattr(alternative, 'transcript'):
-                            full_transcript.append(alternative.transcript)
+            # Blocks are written straight into one buffer rather than collected and joined
+            out = io.StringIO()
+            channels = response.results.channels
+            if len(channels) == 1 and len(channels[0].alternatives) == 1:
+                # Practically every response: one channel, one alternative
+                self._format_alternative(out, channels[0].alternatives[0], job_id)
+            else:
+                for channel in channels:
+                    for alternative in channel.alternatives:
+                        self._format_alternative(out, alternative, job_id)
             
-            result = "\n\n".join(full_transcript)
+            result = out.getvalue().removesuffix("\n\n")
             
             if not result.strip():
                 log_warning("Empty transcript generated from Deepgram response", job_id)
-                return "No speech detected in audio file."
+                return NO_SPEECH_TRANSCRIPT
             
             return result
             
@@ -148,30 +476,52 @@ class DeepgramTranscriber:
                 if response.results and response.results.channels:
                     for channel in response.results.channels:
                         for alternative in channel.alternatives:
-                            if hasattr(alternative, 'transcript'):
-                                return alternative.transcript
+                            transcript_text = getattr(alternative, 'transcript', None)
+                            if transcript_text is not None:
+                                return transcript_text
                 return "Error processing transcript"
             except:
                 return "Error processing transcript"
     
     def test_connection(self) -> bool:
-        """Test Deepgram API connection"""
+        """Test Deepgram API connection with a zero-payload project listing"""
         try:
-            # Create a minimal test payload (empty buffer)
-            payload: FileSource = {"buffer": b""}
-            options = {"model": "nova-2"}
-            
-            # This will fail but should give us a proper API response indicating connection works
-            try:
-                self.client.listen.prerecorded.v("1").transcribe_file(payload, options)
-            except Exception as e:
-                # If we get a specific error about the audio format, the API is working
-                if "audio" in str(e).lower() or "format" in str(e).lower():
-                    return True
-                raise e
-            
+            self.client.manage.v("1").get_projects(transport=_shared_transport())
             return True
             
+        except DeepgramApiError as e:
+            # The API answered, so the network is fine; the key is rejected or lacks access
+            log_error(f"Deepgram connection test failed, API rejected the request: {e}")
+            return False
+        except Exception as e:
+            log_error(f"Deepgram connection test failed, API unreachable: {e}")
+            return False
+    
+    def _async_transport(self) -> httpx.AsyncHTTPTransport:
+        """Pooled async transport bound to the running event loop"""
+        loop = asyncio.get_running_loop()
+        transport = self._async_transports.get(loop)
+        if transport is None:
+            transport = self._async_transports[loop] = _PooledAsyncTransport(
+                limits=httpx.Limits(max_connections=4, keepalive_expiry=_KEEPALIVE_EXPIRY)
+            )
+        return transport
+    
+    async def aclose(self):
+        """Close the running loop's async transport (call before that loop ends)"""
+        transport = self._async_transports.pop(asyncio.get_running_loop(), None)
+        if transport is not None:
+            await httpx.AsyncHTTPTransport.aclose(transport)
+    
+    async def atest_connection(self) -> bool:
+        """Async test_connection through the SDK's asyncio management client"""
+        try:
+            await self.client.asyncmanage.v("1").get_projects(transport=self._async_transport())
+            return True
+        
+        except DeepgramApiError as e:
+            log_error(f"Deepgram connection test failed, API rejected the request: {e}")
+            return False
         except Exception as e:
-            log_error(f"Deepgram connection test failed: {e}")
+            log_error(f"Deepgram connection test failed, API unreachable: {e}")
             return False
@@ -1,17 +1,59 @@
 import os
+import sys
 import time
 import threading
-from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from watchdog.events import FileSystemEventHandler, FileCreatedEvent, FileMovedEvent
 from src.core.processor import AudioProcessor
-from src.utils import ConfigManager, log_info, log_error, log_warning
+from src.utils import ConfigManager, log_info, log_error, log_warning, log_debug, log_enabled
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+try:
+    from watchdog.events import FileClosedEvent
+except ImportError:  # watchdog < 2.1
+    FileClosedEvent = None
+
+# Prefer kernel notifications on Linux; other platforms use watchdog's native default
+CLOSE_EVENTS_SUPPORTED = False
+if sys.platform.startswith('linux'):
+    try:
+        from watchdog.observers.inotify import InotifyObserver as Observer
+        # inotify reports IN_CLOSE_WRITE, i.e. exactly when the writer is done
+        CLOSE_EVENTS_SUPPORTED = FileClosedEvent is not None
+    except ImportError:
+        from watchdog.observers import Observer
+else:
+    from watchdog.observers import Observer
 
 class AudioFileHandler(FileSystemEventHandler):
-    def __init__(self, processor: AudioProcessor):
+    def __init__(self, processor: AudioProcessor, executor: ThreadPoolExecutor):
         self.processor = processor
+        self.executor = executor
         self.config = ConfigManager()
-        self.processing_files = set()  # Track files currently being processed
-        self.lock = threading.Lock()
+        # Files currently being processed; setdefault/pop are atomic under the GIL, so no lock
+        self.processing_files = {}
+        # Config consulted on every event, resolved once
+        self._supported = self.config.supported_formats
+        self._stability_wait = self.config.get("processing.file_stability_wait", 10)
+        # Per-path timers coalescing bursts of events (rsync temp names, repeated closes)
+        self._debounce = float(self.config.get("processing.event_debounce", 0.5))
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+        # Our own moves into these folders must not be picked up as new arrivals
+        self.excluded_dirs = tuple(
+            os.path.join(os.path.abspath(p), '')
+            for p in (
+                self.config.get("processing.processed_folder"),
+                self.config.get("processing.error_folder"),
+                self.config.get("processing.output_folder"),
+            )
+            if p
+        )
     
     def on_created(self, event):
         """Handle new file creation events"""
@@ -19,28 +61,83 @@ class AudioFileHandler(FileSystemEventHandler):
             return
         
         file_path = event.src_path
+        if os.path.abspath(file_path).startswith(self.excluded_dirs):
+            return
+        if CLOSE_EVENTS_SUPPORTED:
+            # A close-write event normally follows and replaces this timer. Files moved in from outside
+            # the watched tree (and hard links) arrive as creations with no write, so none ever comes:
+            # they fall back to the stability check once the wait has passed
+            log_info(f"New file detected, waiting for writer to close: {file_path}")
+            self._schedule(file_path, delay=self._stability_wait)
+            return
         log_info(f"New file detected: {file_path}")
         
-        # Schedule file for processing after stability check
-        threading.Thread(
-            target=self._process_file_safely,
-            args=(file_path,),
-            daemon=True
-        ).start()
-    
-    def _process_file_safely(self, file_path: str):
-        """Process file with safety checks and stability waiting"""
+        # Queue file for processing after stability check
+        self._schedule(file_path)
+    
+    def on_closed(self, event):
+        """Handle a writer closing a file (inotify IN_CLOSE_WRITE)"""
+        if event.is_directory:
+            return
+        
+        file_path = event.src_path
+        if os.path.abspath(file_path).startswith(self.excluded_dirs):
+            return
+        log_info(f"File written and closed: {file_path}")
+        
+        self._schedule(file_path, True)
+    
+    def on_moved(self, event):
+        """Handle files renamed into the watch folder (e.g. temp file -> final name)"""
+        if event.is_directory:
+            return
+        
+        file_path = event.dest_path
+        if os.path.abspath(file_path).startswith(self.excluded_dirs):
+            return
+        log_info(f"File moved into watch folder: {file_path}")
+        
+        self._schedule(file_path)
+    
+    def _schedule(self, file_path: str, closed: bool = False, delay: Optional[float] = None):
+        """Debounce events per path: a burst of events for one file becomes a single task"""
+        timer = threading.Timer(self._debounce if delay is None else delay, self._submit, args=(file_path, closed))
+        timer.daemon = True
+        with self._pending_lock:
+            previous = self._pending.get(file_path)
+            if previous:
+                previous.cancel()
+            self._pending[file_path] = timer
+        timer.start()
+    
+    def _submit(self, file_path: str, closed: bool):
+        """Timer callback: hand the file to the worker pool once its events have gone quiet"""
+        with self._pending_lock:
+            # A newer event may have replaced this timer before it fired; that timer submits instead
+            if self._pending.get(file_path) is not threading.current_thread():
+                return
+            del self._pending[file_path]
+        self.executor.submit(self._process_file_safely, file_path, closed)
+    
+    def cancel_pending(self):
+        """Drop debounced events that have not been handed to the pool yet"""
+        with self._pending_lock:
+            for timer in self._pending.values():
+                timer.cancel()
+            self._pending.clear()
+    
+    def _process_file_safely(self, file_path: str, closed: bool = False):
+        """Process file with safety checks and stability waiting (skipped once the writer has closed it)"""
         try:
-            # Check if already processing this file
-            with self.lock:
-                if file_path in self.processing_files:
-                    log_warning(f"File already being processed: {file_path}")
-                    return
-                self.processing_files.add(file_path)
+            # Check if already processing this file (claim it in the same step)
+            token = object()
+            if self.processing_files.setdefault(file_path, token) is not token:
+                log_warning(f"File already being processed: {file_path}")
+                return
             
             try:
                 # Wait for file stability
-                if not self._wait_for_file_stability(file_path):
+                if not closed and not self._wait_for_file_stability(file_path):
                     log_warning(f"File stability check failed: {file_path}")
                     return
                 
@@ -49,9 +146,9 @@ class AudioFileHandler(FileSystemEventHandler):
                     log_info(f"Unsupported file format, skipping: {file_path}")
                     return
                 
-                # Process the file
+                # Process the file; the close event or stability wait above stands in for its write check
                 log_info(f"Starting processing for: {file_path}")
-                success = self.processor.process_file(file_path)
+                success = self.processor.process_file(file_path, already_closed=True)
                 
                 if success:
                     log_info(f"Successfully processed: {file_path}")
@@ -59,50 +156,46 @@ class AudioFileHandler(FileSystemEventHandler):
                     log_error(f"Processing failed for: {file_path}")
                     
             finally:
-                # Remove from processing set
-                with self.lock:
-                    self.processing_files.discard(file_path)
+                # Release the claim
+                self.processing_files.pop(file_path, None)
                     
         except Exception as e:
             log_error(f"Error in file processing thread: {e}")
-            with self.lock:
-                self.processing_files.discard(file_path)
     
     def _wait_for_file_stability(self, file_path: str) -> bool:
-        """Wait for file to be completely written"""
+        """Wait until the file size holds for several poll intervals and no writer holds a lock on it"""
         try:
-            stability_wait = self.config.get("processing.file_stability_wait", 10)
-            max_checks = 10
-            check_interval = max(1, stability_wait // max_checks)
+            check_interval = 1
+            # A copy that takes no lock (Finder, SMB, rsync) is only caught by the size settling
+            required_stable_checks = 3
+            max_checks = max(required_stable_checks + 1, int(self._stability_wait))
             
-            log_info(f"Waiting for file stability: {file_path}")
+            if log_enabled():
+                log_debug(f"Waiting for file stability: {file_path}")
             
             previous_size = -1
             stable_count = 0
-            required_stable_checks = 3
             
             for i in range(max_checks):
-                if not os.path.exists(file_path):
+                try:
+                    current_size = os.stat(file_path).st_size
+                except FileNotFoundError:
                     log_warning(f"File disappeared during stability check: {file_path}")
                     return False
-                
-                try:
-                    current_size = os.path.getsize(file_path)
-                    
-                    if current_size == previous_size and current_size > 0:
-                        stable_count += 1
-                        if stable_count >= required_stable_checks:
-                            log_info(f"File stable after {i + 1} checks: {file_path}")
-                            return True
-                    else:
-                        stable_count = 0
-                    
-                    previous_size = current_size
-                    
                 except OSError as e:
                     log_warning(f"Error checking file size: {e}")
+                    current_size = -1
+                
+                if current_size == previous_size and current_size > 0:
+                    stable_count += 1
+                    if stable_count >= required_stable_checks and self._is_unlocked(file_path):
+                        if log_enabled():
+                            log_debug(f"File stable after {i + 1} checks: {file_path}")
+                        return True
+                else:
                     stable_count = 0
                 
+                previous_size = current_size
                 time.sleep(check_interval)
             
             # Final check - if file has size and hasn't changed recently, proceed
@@ -117,30 +210,52 @@ class AudioFileHandler(FileSystemEventHandler):
             log_error(f"Error in file stability check: {e}")
             return False
     
+    @staticmethod
+    def _is_unlocked(file_path: str) -> bool:
+        """True if no other process holds an exclusive flock on the file"""
+        if fcntl is None:
+            return True
+        try:
+            with open(file_path, 'rb') as f:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            return True
+        except OSError:
+            return False
+    
     def _is_supported_format(self, file_path: str) -> bool:
         """Check if file format is supported"""
         try:
-            supported_formats = self.config.get("processing.supported_formats", [])
-            file_ext = os.path.splitext(file_path)[1].lower()
-            return file_ext in supported_formats
+            return os.path.splitext(file_path)[1].lower() in self._supported
         except Exception as e:
             log_error(f"Error checking file format: {e}")
             return False
 
 class FileMonitor:
-    def __init__(self):
+    def __init__(self, folders: Optional[dict] = None, processor: Optional[AudioProcessor] = None):
         self.config = ConfigManager()
-        self.processor = None
+        self.folders = folders or {}
+        # An already-built processor (e.g. the one from the startup health check) saves creating another
+        self.processor = processor
         self.observer = None
         self.running = False
+        self.recursive = bool(self.config.get("processing.recursive_watch", True))
+        # Bounded so a backlog of files queues up instead of spawning a thread each
+        self.max_concurrent = max(1, int(self.config.get("processing.max_concurrent", 4)))
+        self._pool = None
+        self.event_handler = None
+        self._stop_event = threading.Event()
+        self._batch_poller = None
         
-        # Get watch folder from config
-        self.watch_folder = self.config.get("processing.watch_folder")
+        # Folders passed in were already created at startup; otherwise fall back to config
+        self.watch_folder = self.folders.get('watch')
         if not self.watch_folder:
-            raise ValueError("Watch folder not configured. Please set WATCH_FOLDER in your .env file")
-        
-        # Ensure watch folder exists
-        os.makedirs(self.watch_folder, exist_ok=True)
+            self.watch_folder = self.config.get("processing.watch_folder")
+            if not self.watch_folder:
+                raise ValueError("Watch folder not configured. Please set WATCH_FOLDER in your .env file")
+            
+            # Ensure watch folder exists
+            os.makedirs(self.watch_folder, exist_ok=True)
         
         log_info(f"File monitor initialized for: {self.watch_folder}")
     
@@ -152,22 +267,38 @@ class FileMonitor:
         
         try:
             # Lazily create processor at start time
-            self.processor = AudioProcessor()
+            if self.processor is None:
+                self.processor = AudioProcessor(folders=self.folders)
+            self._pool = ThreadPoolExecutor(max_workers=self.max_concurrent, thread_name_prefix="audio-worker")
             # Create event handler
-            event_handler = AudioFileHandler(self.processor)
+            event_handler = self.event_handler = AudioFileHandler(self.processor, self._pool)
             
             # Create observer
             self.observer = Observer()
-            recursive_flag = bool(self.config.get("processing.recursive_watch", True))
-            self.observer.schedule(event_handler, self.watch_folder, recursive=recursive_flag)
+            try:
+                # Only subscribe to the events we act on (IN_CREATE/IN_MOVED_TO/IN_CLOSE_WRITE on inotify)
+                event_filter = [FileCreatedEvent, FileMovedEvent]
+                if CLOSE_EVENTS_SUPPORTED:
+                    event_filter.append(FileClosedEvent)
+                self.observer.schedule(
+                    event_handler,
+                    self.watch_folder,
+                    recursive=self.recursive,
+                    event_filter=event_filter,
+                )
+            except TypeError:
+                # watchdog < 4 has no event filtering
+                self.observer.schedule(event_handler, self.watch_folder, recursive=self.recursive)
             
             # Start monitoring
             self.observer.start()
+            self._stop_event.clear()
             self.running = True
             
             log_info(f"File monitor started, watching: {self.watch_folder}")
             
-            # Process any existing files in the folder
+            # Resume OpenAI batches submitted before a restart, then process any existing files in the folder
+            self._start_batch_poller()
             self._process_existing_files(event_handler)
             
         except Exception as e:
@@ -176,6 +307,7 @@ class FileMonitor:
     
     def stop(self):
         """Stop monitoring"""
+        self._stop_event.set()
         if not self.running:
             return
         
@@ -184,6 +316,18 @@ class FileMonitor:
                 self.observer.stop()
                 self.observer.join(timeout=5)
             
+            if self.event_handler:
+                self.event_handler.cancel_pending()
+            
+            if self._batch_poller:
+                self._batch_poller.cancel()
+                self._batch_poller = None
+            
+            if self._pool:
+                # Drop queued files; they are picked up again from the watch folder on next start
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+            
             self.running = False
             log_info("File monitor stopped")
             
@@ -196,37 +340,63 @@ class FileMonitor:
             if not os.path.exists(self.watch_folder):
                 return
             
-            existing_files = []
-            recursive_flag = bool(self.config.get("processing.recursive_watch", True))
-            if recursive_flag:
-                for root, _, files in os.walk(self.watch_folder):
-                    for filename in files:
-                        file_path = os.path.join(root, filename)
-                        existing_files.append(file_path)
-            else:
-                for filename in os.listdir(self.watch_folder):
-                    file_path = os.path.join(self.watch_folder, filename)
-                    if os.path.isfile(file_path):
-                        existing_files.append(file_path)
-            
-            if existing_files:
-                log_info(f"Found {len(existing_files)} existing files to process")
-                
-                for file_path in existing_files:
-                    log_info(f"Processing existing file: {file_path}")
-                    # Use the same handler logic
-                    threading.Thread(
-                        target=handler._process_file_safely,
-                        args=(file_path,),
-                        daemon=True
-                    ).start()
-                    
-                    # Small delay between files to avoid overwhelming the system
-                    time.sleep(1)
+            # Files of unfinished OpenAI batches stay in the watch folder; the batch poller completes them
+            batched = self.processor.batch_file_paths()
+            existing = (path for path in self._iter_audio_files(self.watch_folder, handler) if path not in batched)
+            
+            if self.config.get("openai.use_batch_api", False):
+                # A backlog is the bulk case the Batch API is for: one worker transcribes and submits the batch
+                file_paths = list(existing)
+                if file_paths:
+                    log_info(f"Queueing {len(file_paths)} existing files as one OpenAI batch")
+                    self._pool.submit(self.processor.process_batch, file_paths)
+                return
+            
+            queued = 0
+            for file_path in existing:
+                log_info(f"Queueing existing file: {file_path}")
+                # Use the same handler logic; the pool bounds how many run at once
+                self._pool.submit(handler._process_file_safely, file_path)
+                queued += 1
+            
+            if queued:
+                log_info(f"Queued {queued} existing files for processing")
             
         except Exception as e:
             log_error(f"Error processing existing files: {e}")
     
+    def _start_batch_poller(self):
+        """Poll unfinished OpenAI batches from a timer while the Batch API is in use or batches remain"""
+        if not self.config.get("openai.use_batch_api", False) and not self.processor.db.get_pending_batches():
+            return
+        interval = self.config.get("openai.batch_poll_interval", 60)
+        
+        def poll():
+            try:
+                self.processor.poll_batches()
+            except Exception as e:
+                log_error(f"Error polling OpenAI batches: {e}")
+            if not self._stop_event.is_set():
+                schedule(interval)
+        
+        def schedule(delay):
+            timer = self._batch_poller = threading.Timer(delay, poll)
+            timer.daemon = True
+            timer.start()
+        
+        # First check straight away so batches that finished while we were down complete promptly
+        schedule(0)
+    
+    def _iter_audio_files(self, root: str, handler: AudioFileHandler):
+        """Yield supported files under root using the file type cached by scandir (no stat per entry)"""
+        with os.scandir(root) as entries:
+            for entry in entries:
+                if entry.is_file(follow_symlinks=False):
+                    if handler._is_supported_format(entry.name):
+                        yield entry.path
+                elif self.recursive and entry.is_dir(follow_symlinks=False):
+                    yield from self._iter_audio_files(entry.path, handler)
+    
     def is_running(self) -> bool:
         """Check if monitor is running"""
         return self.running
@@ -244,9 +414,11 @@ class FileMonitor:
         """Run the monitor indefinitely (blocking)"""
         self.start()
         
+        # Windows can't interrupt an untimed wait with Ctrl+C, so wake there once a second
+        wait_timeout = 1 if sys.platform == 'win32' else None
         try:
-            while self.running:
-                time.sleep(1)
+            while not self._stop_event.wait(wait_timeout):
+                pass
         except KeyboardInterrupt:
             log_info("Received interrupt signal, stopping file monitor")
         finally:
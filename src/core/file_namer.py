@@ -1,13 +1,263 @@
+import calendar
+import copy
 import os
 import re
-from datetime import datetime
-from typing import Dict, Any, Optional, Tuple
+import string
+import struct
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+from itertools import chain
+from typing import Dict, Any, List, Optional, Tuple
 from mutagen import File as MutagenFile
-from src.utils import ConfigManager, log_info, log_error, log_warning
+from mutagen.mp3 import MP3
+from mutagen.mp4 import MP4
+from src.utils import ConfigManager, log_info, log_error, log_warning, log_enabled
+
+try:
+    import re2
+except ImportError:  # optional: google-re2 gives linear-time matching, re is used without it
+    re2 = None
+
+def _compile_linear(pattern: str):
+    """Compile with RE2 when installed. Only for patterns without lookaround or backreferences whose
+    digit/space/word-boundary classes may be ASCII-only under RE2; flags go inline, e.g. (?i)."""
+    if re2 is not None:
+        return re2.compile(pattern)
+    return re.compile(pattern)
+
+# Patterns are compiled once at import rather than looked up in re's cache per call
+# All filename date formats in one alternation; lastgroup tells which one matched
+_DATE_ANY = _compile_linear(
+    r'(?P<ymd_sep>\d{4}[-_]\d{2}[-_]\d{2})'  # YYYY-MM-DD or YYYY_MM_DD
+    r'|(?P<dmy_sep>\d{2}[-_]\d{2}[-_]\d{4})'  # DD-MM-YYYY or DD_MM_YYYY
+    r'|(?P<digits>\d{8})'  # YYYYMMDD or DDMMYYYY
+)
+# Preference when a filename contains more than one date-like run
+_DATE_KINDS = ('ymd_sep', 'dmy_sep', 'digits')
+
+# Name extraction: every leader-prefixed form in one alternation, each alternative naming its group.
+# Wrapped in a lookahead so one finditer pass tries every position without alternatives consuming each other.
+# These run on the already-lowercased filename, so they spell out lowercase classes instead of paying for
+# IGNORECASE; there is no capitalisation left to check, names are title-cased afterwards.
+_FULL_NAME = r'[a-z][a-z]+(?:[_\s]+[a-z][a-z]+)+'
+_TWO_NAMES = r'[a-z][a-z]+[_\s]+[a-z][a-z]+'
+_NAME_LEADS = re.compile(
+    r'(?='
+    # "TA/MTG [Full Name]" (highest priority - legal format)
+    rf'(?<![^_\s])(?:ta|telephone\s+attendance|mtg|meeting)[_\s]+(?P<legal>{_FULL_NAME})'
+    # "with [Full Name]" or "w [Full Name]"
+    rf'|(?:with|w)[_\s]+(?P<with>{_FULL_NAME})'
+    # Full names after date but before keywords
+    rf'|(?<!\d)(?:\d{{8}}|\d{{4}}[-_]\d{{2}}[-_]\d{{2}})[_\s]+(?:ta|mtg|meeting|call)?[_\s]*(?P<dated>{_TWO_NAMES})'
+    # Full names before "re" (e.g., "John Smith re contract")
+    rf'|(?<![a-z])(?P<before_re>{_TWO_NAMES})[_\s]+re[_\s]'
+    r')'
+)
+# Order in which lead matches are taken, highest priority first
+_NAME_LEAD_PRIORITY = ('legal', 'with', 'before_re', 'dated')
+
+# Only consulted when no leader-prefixed name was accepted
+_NAME_FALLBACKS = [re.compile(p) for p in (
+    # Standalone full names (First Last format)
+    r'\b([a-z][a-z]+[_\s]+[a-z][a-z]+)\b(?![_\s]*(?:meeting|call|interview|discussion|about|re|regarding))',
+    # Single names after TA/MTG
+    r'(?:ta|mtg)[_\s]+([a-z][a-z]{2,15})\b(?![_\s]*(?:meeting|call|interview|discussion|about|re|regarding))',
+)]
+
+# Common words to exclude from name detection, built once rather than per parsed filename
+_EXCLUDE_WORDS = frozenset((
+    'meeting', 'call', 'interview', 'discussion', 'about', 'regarding',
+    'admin', 'estate', 'contract', 'review', 'notes', 'client', 'matter',
+    'phone', 'zoom', 'teams', 'conference', 'legal', 'law', 'firm',
+    'ta', 'mtg', 'telephone', 'attendance', 'question', 'issue', 'land',
+    'gst', 'tax', 'advice', 'consultation', 'update', 'follow', 'up',
+))
+
+# Topic after an indicator word. Indicators must start a word, the topic is capped at a dozen
+# words, and the lookahead lets "re budget review notes" yield both "budget review notes" and "notes".
+_TOPIC_RE = re.compile(
+    r'(?=(?<![a-z])(?:re|about|regarding|discussion|review)[_\s]+([a-z]+(?:[_\s]+[a-z]+){0,11}))'
+)
+
+# Matter numbers: [12345], _12345_ or _12345 (typically at the end); the group index identifies the form
+_MATTER_RE = _compile_linear(r'\[(\d{5})\]|_(\d{5})_|_(\d{5})(?:\.|$)')
+_MATTER_FORMS = {1: 'in brackets', 2: 'with underscores', 3: 'with left underscore'}
+
+# Date separators are deleted with a translate table rather than a regex
+_STRIP_DATE_SEPARATORS = str.maketrans('', '', '-_')
+_INVALID_FS_CHARS = _compile_linear(r'[<>:"/\\|?*]')
+_INVALID_FS_CHAR_SET = frozenset('<>:"/\\|?*')
+_MULTI_WS = re.compile(r'\s+')
+# Applied after whitespace is collapsed to plain spaces, so ASCII-only matching changes nothing
+_RE_RE = _compile_linear(r'(?i)\bre\s+re\b')
+_WITH_WITH = _compile_linear(r'(?i)\bwith\s+with\b')
+_AND_AND = _compile_linear(r'(?i)\band\s+and\b')
+# A whole word followed by one or more case-insensitive repeats of itself
+_DUP_WORDS = re.compile(r'(?<!\S)(\S+)(?:\s+\1(?!\S))+', re.IGNORECASE)
+_ALWAYS_DEDUP = frozenset(('re', 'with', 'and'))
+_KEEP_REPEATS = frozenset(('re', 'with', 'and', 'the', 'a', 'an', 'of', 'in', 'on', 'at'))
+# Character classes for name validation, checked with set operations instead of regex searches
+_NAME_LETTERS = frozenset(string.ascii_letters)
+_NAME_ALLOWED = _NAME_LETTERS | frozenset(string.whitespace + '-')
+
+def _wav_duration(file_path: str) -> Optional[float]:
+    """Duration of a RIFF/WAVE file from its fmt and data chunk headers, without reading the samples"""
+    with open(file_path, 'rb') as f:
+        header = f.read(12)
+        if len(header) < 12 or header[:4] != b'RIFF' or header[8:12] != b'WAVE':
+            return None
+        byte_rate = None
+        while True:
+            chunk = f.read(8)
+            if len(chunk) < 8:
+                return None
+            chunk_id, size = chunk[:4], struct.unpack('<I', chunk[4:])[0]
+            if chunk_id == b'fmt ':
+                fmt = f.read(size)
+                if len(fmt) < 12:
+                    return None
+                # audio format, channels, sample rate, then the byte rate
+                byte_rate = struct.unpack_from('<I', fmt, 8)[0]
+                if size & 1:
+                    f.seek(1, os.SEEK_CUR)
+            elif chunk_id == b'data':
+                if not byte_rate:
+                    return None
+                if size == 0xFFFFFFFF:
+                    # Size unknown (streamed recording): the data runs to the end of the file
+                    size = os.fstat(f.fileno()).st_size - f.tell()
+                return size / byte_rate
+            else:
+                f.seek(size + (size & 1), os.SEEK_CUR)
+
+def _read_duration(file_path: str) -> Optional[float]:
+    """Duration in seconds using the cheapest reader for the container; None if it can't be determined"""
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext in ('.wav', '.wave'):
+        duration = _wav_duration(file_path)
+        if duration is not None:
+            return duration
+    elif ext == '.mp3':
+        return MP3(file_path).info.length
+    elif ext in ('.m4a', '.mp4', '.mov'):
+        return MP4(file_path).info.length
+    
+    audio_file = MutagenFile(file_path)
+    if audio_file is None or not hasattr(audio_file.info, 'length'):
+        return None
+    return audio_file.info.length
+
+def _drop_repeats(match) -> str:
+    """Collapse a run of repeated words: connectors always, capitalised name-like words too, anything else is kept"""
+    first, *repeats = match.group(0).split()
+    kept = [first]
+    for word in repeats:
+        lower = word.lower()
+        if lower in _ALWAYS_DEDUP:
+            continue
+        if lower not in _KEEP_REPEATS and len(word) > 2 and word[0].isupper():
+            # This looks like a name, skip the duplicate
+            continue
+        kept.append(word)
+    return ' '.join(kept)
+
+def _words_from_separators(text: str) -> str:
+    """Turn underscore/whitespace runs into single spaces and trim; plain str methods beat a regex on short names"""
+    return ' '.join(text.replace('_', ' ').split())
+
+def _is_ascii_digits(text: str) -> bool:
+    """str.isdigit() also accepts digits int() cannot parse (superscripts) and non-ASCII numerals"""
+    return text.isascii() and text.isdigit()
+
+def _name_tokens(name: str) -> frozenset:
+    """Lowercased words of a name, computed once per name"""
+    return frozenset(name.lower().split())
+
+def _same_person(tokens1: frozenset, tokens2: frozenset) -> bool:
+    """Names match when one's words are a subset of the other's ("Rob" / "Rob Veitch", "Veitch" / "Rob Veitch")"""
+    return tokens1 <= tokens2 or tokens2 <= tokens1
+
+class _PersonIndex:
+    """Names seen so far, tokenized once, with a word index answering single-name lookups directly"""
+    
+    def __init__(self):
+        self.entries = []
+        self.by_word = {}
+    
+    def match(self, name: str) -> Optional[str]:
+        """Return the known name that refers to the same person, if any"""
+        tokens = _name_tokens(name)
+        if len(tokens) == 1:
+            (word,) = tokens
+            if word in self.by_word:
+                return self.by_word[word]
+        for known_name, known_tokens in self.entries:
+            if _same_person(tokens, known_tokens):
+                return known_name
+        return None
+    
+    def add(self, name: str):
+        tokens = _name_tokens(name)
+        self.entries.append((name, tokens))
+        for word in tokens:
+            self.by_word.setdefault(word, name)
+
+# Per-namer result cache size; entries are small dicts (copied on every return), the oldest is dropped first
+_FILE_CACHE_MAX = 256
+
+def _cached_per_file(kind: str, uses_stat: bool = True):
+    """Cache a namer helper's result per file path. Helpers that read the file (uses_stat) are keyed on
+    its mtime and size as well, so a changed file is re-read; a path that cannot be stat'ed is not cached."""
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, file_path: str, job_id: Optional[int] = None,
+                    stat_result: Optional[os.stat_result] = None, **options):
+            if uses_stat:
+                if stat_result is None:
+                    try:
+                        stat_result = os.stat(file_path)
+                    except OSError:
+                        # Let the helper report the problem itself
+                        return method(self, file_path, job_id, stat_result, **options)
+                key = (kind, file_path, stat_result.st_mtime_ns, stat_result.st_size, *sorted(options.items()))
+                compute = lambda: method(self, file_path, job_id, stat_result, **options)
+            else:
+                key = (kind, file_path)
+                compute = lambda: method(self, file_path, job_id)
+            
+            with self._cache_lock:
+                cached = self._cache.get(key)
+            if cached is None:
+                cached = compute()
+                with self._cache_lock:
+                    self._cache[key] = cached
+                    if len(self._cache) > _FILE_CACHE_MAX:
+                        self._cache.pop(next(iter(self._cache)))
+            # Callers get their own copy, nested lists (participants, topic_keywords) included
+            return copy.deepcopy(cached)
+        return wrapper
+    return decorator
 
 class IntelligentFileNamer:
+    # Shared by every namer and only loaded when first needed; nothing on the naming path reads it today
+    _config = None
+    
     def __init__(self):
-        self.config = ConfigManager()
+        # Helper results per (kind, path[, mtime, size, options]), see _cached_per_file
+        self._cache = {}
+        self._cache_lock = threading.Lock()
+    
+    @classmethod
+    def _get_config(cls) -> ConfigManager:
+        if cls._config is None:
+            cls._config = ConfigManager()
+        return cls._config
+    
+    @property
+    def config(self) -> ConfigManager:
+        return self._get_config()
     
     def generate_name(self, original_file: str, transcript: str, 
                      ai_info: Dict[str, Any], job_id: Optional[int] = None) -> Tuple[str, float]:
@@ -24,12 +274,17 @@ class IntelligentFileNamer:
             Tuple of (suggested_filename, confidence_score)
         """
         try:
-            log_info(f"Using AI-generated filename for: {original_file}", job_id)
+            # Skip building the messages when INFO is filtered out
+            info_enabled = log_enabled("info")
+            if info_enabled:
+                log_info(f"Using AI-generated filename for: {original_file}", job_id)
             
             # Use AI-generated complete filename directly
-            if ai_info.get('complete_filename'):
-                filename = self._clean_filename(ai_info['complete_filename'])
-                log_info(f"AI-generated filename: '{filename}'", job_id)
+            ai_filename = ai_info.get('complete_filename')
+            if ai_filename:
+                filename = self._clean_filename(ai_filename)
+                if info_enabled:
+                    log_info(f"AI-generated filename: '{filename}'", job_id)
                 return filename, 0.9
             
             # Fallback only if AI completely failed
@@ -42,85 +297,104 @@ class IntelligentFileNamer:
             fallback = self._generate_fallback_filename(original_file)
             return fallback, 0.1
     
-    def _extract_date(self, file_path: str, job_id: Optional[int] = None) -> Dict[str, Any]:
-        """Extract date from file metadata and filename"""
+    def extract_metadata_batch(self, file_paths: List[str], job_id: Optional[int] = None,
+                               duration_only: bool = False) -> Dict[str, Dict[str, Any]]:
+        """Read metadata for many files at once, keyed by path.
+        
+        Opening and parsing each file is IO-bound and releases the GIL, so the reads overlap in a thread pool.
+        """
+        if not file_paths:
+            return {}
+        
+        workers = min(len(file_paths), 32, (os.cpu_count() or 1) * 4)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="namer-metadata") as pool:
+            results = pool.map(
+                lambda path: self._extract_metadata(path, job_id, duration_only=duration_only),
+                file_paths,
+            )
+            return dict(zip(file_paths, results))
+    
+    @_cached_per_file('date')
+    def _extract_date(self, file_path: str, job_id: Optional[int] = None,
+                      stat_result: Optional[os.stat_result] = None) -> Dict[str, Any]:
+        """Extract date from file metadata and filename (pass stat_result to reuse a stat the caller already made)"""
         date_info = {
             'date': None,
             'source': None,
             'confidence': 0.0
         }
         
+        # Try to extract from filename first
+        filename = os.path.basename(file_path)
+        # One scan collects the first candidate of each format
+        candidates = {}
+        for match in _DATE_ANY.finditer(filename):
+            candidates.setdefault(match.lastgroup, match.group())
+        
+        for kind in _DATE_KINDS:
+            date_str = candidates.get(kind)
+            if date_str:
+                parsed_date = self._parse_date_string(date_str)
+                if parsed_date:
+                    date_info['date'] = parsed_date
+                    date_info['source'] = 'filename'
+                    date_info['confidence'] = 0.9
+                    log_info(f"Extracted date from filename: {parsed_date}", job_id)
+                    return date_info
+        
+        # Try file metadata; only the stat and timestamp conversion can fail here
         try:
-            # Try to extract from filename first
-            filename = os.path.basename(file_path)
-            date_patterns = [
-                r'(\d{4}[-_]\d{2}[-_]\d{2})',  # YYYY-MM-DD or YYYY_MM_DD
-                r'(\d{2}[-_]\d{2}[-_]\d{4})',  # DD-MM-YYYY or DD_MM_YYYY
-                r'(\d{8})',                     # YYYYMMDD
-                r'(\d{2}\d{2}\d{4})',          # DDMMYYYY
-            ]
-            
-            for pattern in date_patterns:
-                match = re.search(pattern, filename)
-                if match:
-                    date_str = match.group(1)
-                    parsed_date = self._parse_date_string(date_str)
-                    if parsed_date:
-                        date_info['date'] = parsed_date
-                        date_info['source'] = 'filename'
-                        date_info['confidence'] = 0.9
-                        log_info(f"Extracted date from filename: {parsed_date}", job_id)
-                        return date_info
-            
-            # Try file metadata
-            stat = os.stat(file_path)
-            creation_time = datetime.fromtimestamp(stat.st_ctime)
-            modification_time = datetime.fromtimestamp(stat.st_mtime)
-            
+            stat = stat_result or os.stat(file_path)
             # Use the earlier of creation or modification time
-            file_date = min(creation_time, modification_time)
-            date_info['date'] = file_date.strftime('%Y%m%d')
-            date_info['source'] = 'file_metadata'
-            date_info['confidence'] = 0.7
-            
-            log_info(f"Using file metadata date: {date_info['date']}", job_id)
-            
-        except Exception as e:
+            file_date = time.localtime(min(stat.st_ctime, stat.st_mtime))
+        except (OSError, OverflowError, ValueError) as e:
             log_warning(f"Error extracting date: {e}", job_id)
             # Fallback to current date
-            date_info['date'] = datetime.now().strftime('%Y%m%d')
+            date_info['date'] = time.strftime('%Y%m%d')
             date_info['source'] = 'current_date'
             date_info['confidence'] = 0.3
+            return date_info
+        
+        date_info['date'] = time.strftime('%Y%m%d', file_date)
+        date_info['source'] = 'file_metadata'
+        date_info['confidence'] = 0.7
+        
+        log_info(f"Using file metadata date: {date_info['date']}", job_id)
         
         return date_info
     
     def _parse_date_string(self, date_str: str) -> Optional[str]:
         """Parse various date string formats to YYYYMMDD"""
-        try:
-            # Remove separators
-            clean_date = re.sub(r'[-_]', '', date_str)
-            
-            if len(clean_date) == 8:
-                # YYYYMMDD
-                if clean_date[:4].isdigit() and int(clean_date[:4]) > 1900:
-                    return clean_date
-                # DDMMYYYY
-                elif clean_date[4:].isdigit() and int(clean_date[4:]) > 1900:
-                    return clean_date[4:] + clean_date[2:4] + clean_date[:2]
+        # Every branch checks for ASCII digits before converting, so nothing here raises
+        # Remove separators
+        clean_date = date_str.translate(_STRIP_DATE_SEPARATORS)
+        
+        if len(clean_date) == 8:
+            # YYYYMMDD
+            if _is_ascii_digits(clean_date[:4]) and int(clean_date[:4]) > 1900:
+                return clean_date
+            # DDMMYYYY
+            elif _is_ascii_digits(clean_date[4:]) and int(clean_date[4:]) > 1900:
+                return clean_date[4:] + clean_date[2:4] + clean_date[:2]
+        
+        # Older years only parse with consistent separators and a real calendar date;
+        # the separator position says which field order it is, so no format is tried and discarded
+        if len(date_str) == 10:
+            if date_str[4] in '-_' and date_str[7] == date_str[4]:
+                year, month, day = date_str[:4], date_str[5:7], date_str[8:]
+            elif date_str[2] in '-_' and date_str[5] == date_str[2]:
+                day, month, year = date_str[:2], date_str[3:5], date_str[6:]
+            else:
+                return None
             
-            # Try parsing with separators
-            for fmt in ['%Y-%m-%d', '%Y_%m_%d', '%d-%m-%Y', '%d_%m_%Y']:
-                try:
-                    parsed = datetime.strptime(date_str, fmt)
-                    return parsed.strftime('%Y%m%d')
-                except ValueError:
-                    continue
-                    
-        except Exception:
-            pass
+            if _is_ascii_digits(year + month + day):
+                y, m, d = int(year), int(month), int(day)
+                if y >= 1 and 1 <= m <= 12 and 1 <= d <= calendar.monthrange(y, m)[1]:
+                    return f"{y:04d}{m:02d}{d:02d}"
         
         return None
     
+    @_cached_per_file('filename', uses_stat=False)
     def _parse_filename(self, file_path: str, job_id: Optional[int] = None) -> Dict[str, Any]:
         """Parse existing filename for useful information"""
         filename_info = {
@@ -132,7 +406,9 @@ class IntelligentFileNamer:
         }
         
         try:
-            filename = os.path.splitext(os.path.basename(file_path))[0].lower()
+            # Split the path once; the stem drives parsing, the full name keeps the extension for matter numbers
+            basename = os.path.basename(file_path)
+            filename = os.path.splitext(basename)[0].lower()
             
             # Look for meeting type keywords and abbreviations
             meeting_types = {
@@ -149,69 +425,39 @@ class IntelligentFileNamer:
                     log_info(f"Detected meeting type from filename: {meeting_type} (from keyword: {[k for k in keywords if k in filename]})", job_id)
                     break
             
-            # Enhanced name extraction - prioritize full names and handle legal formats
-            name_patterns = [
-                # Pattern: "TA [Full Name]" (highest priority - legal format)
-                r'(?:^|[_\s])(?:ta|telephone\s+attendance)[_\s]+([A-Z][a-z]+(?:[_\s]+[A-Z][a-z]+)+)',
-                # Pattern: "MTG [Full Name]" 
-                r'(?:^|[_\s])(?:mtg|meeting)[_\s]+([A-Z][a-z]+(?:[_\s]+[A-Z][a-z]+)+)',
-                # Pattern: "with [Full Name]" or "w [Full Name]"
-                r'(?:with|w)[_\s]+([A-Z][a-z]+(?:[_\s]+[A-Z][a-z]+)+)',
-                # Pattern: Full names before "re" (e.g., "John Smith re contract")
-                r'([A-Z][a-z]+[_\s]+[A-Z][a-z]+)(?:[_\s]+re[_\s])',
-                # Pattern: Full names after date but before keywords
-                r'(?:\d{8}|\d{4}[-_]\d{2}[-_]\d{2})[_\s]+(?:ta|mtg|meeting|call)?[_\s]*([A-Z][a-z]+[_\s]+[A-Z][a-z]+)',
-                # Pattern: Standalone full names (First Last format)
-                r'\b([A-Z][a-z]+[_\s]+[A-Z][a-z]+)\b(?![_\s]*(?:meeting|call|interview|discussion|about|re|regarding))',
-                # Pattern: Single names after TA/MTG (fallback)
-                r'(?:ta|mtg)[_\s]+([A-Z][a-z]{2,15})\b(?![_\s]*(?:meeting|call|interview|discussion|about|re|regarding))',
-            ]
-            
-            # Common words to exclude from name detection
-            exclude_words = {
-                'meeting', 'call', 'interview', 'discussion', 'about', 'regarding', 
-                'admin', 'estate', 'contract', 'review', 'notes', 'client', 'matter',
-                'phone', 'zoom', 'teams', 'conference', 'legal', 'law', 'firm',
-                'ta', 'mtg', 'telephone', 'attendance', 'question', 'issue', 'land',
-                'gst', 'tax', 'advice', 'consultation', 'update', 'follow', 'up'
-            }
-            
             # Process patterns in order of priority
-            for i, pattern in enumerate(name_patterns):
-                matches = re.findall(pattern, filename, re.IGNORECASE)
-                for match in matches:
-                    name = re.sub(r'[_\s]+', ' ', match).strip().title()
-                    
-                    # Validate name
-                    if self._is_valid_name(name, exclude_words):
-                        # Check if this name is already represented (avoid duplicates like "Jim Hunwick" and "Hunwick")
-                        is_duplicate = False
-                        for existing_name in filename_info['participants']:
-                            if self._are_same_person(existing_name, name):
-                                is_duplicate = True
-                                log_info(f"Skipping duplicate name from filename: '{name}' (matches existing '{existing_name}')", job_id)
-                                break
-                        
-                        if not is_duplicate:
-                            filename_info['participants'].append(name)
-                            # Higher confidence for full names and legal format patterns
-                            confidence_boost = 0.5 if i < 2 else 0.4 if ' ' in name else 0.3
-                            filename_info['confidence'] += confidence_boost
-                            log_info(f"Extracted name from filename (pattern {i+1}): {name}", job_id)
+            # Enhanced name extraction - prioritize full names and handle legal formats
+            known_people = _PersonIndex()
+            for source, match in chain(
+                self._lead_name_matches(filename),
+                # Bare names are only considered when no leader-prefixed name was accepted
+                (m for m in self._fallback_name_matches(filename) if not filename_info['participants']),
+            ):
+                name = _words_from_separators(match).title()
+                
+                # Validate name
+                if self._is_valid_name(name):
+                    # Check if this name is already represented (avoid duplicates like "Jim Hunwick" and "Hunwick")
+                    existing_name = known_people.match(name)
+                    if existing_name is not None:
+                        log_info(f"Skipping duplicate name from filename: '{name}' (matches existing '{existing_name}')", job_id)
+                    else:
+                        known_people.add(name)
+                        filename_info['participants'].append(name)
+                        # Higher confidence for full names and legal format patterns
+                        confidence_boost = 0.5 if source == 'legal' else 0.4 if ' ' in name else 0.3
+                        filename_info['confidence'] += confidence_boost
+                        log_info(f"Extracted name from filename ({source}): {name}", job_id)
             
             # Extract topic keywords
-            topic_indicators = ['re', 'about', 'regarding', 'discussion', 'review']
-            for indicator in topic_indicators:
-                pattern = f'{indicator}[_\\s]+([a-zA-Z]+(?:[_\\s]+[a-zA-Z]+)*)'
-                matches = re.findall(pattern, filename)
-                for match in matches:
-                    topic = re.sub(r'[_\s]+', ' ', match).strip().title()
-                    if len(topic) > 2:
-                        filename_info['topic_keywords'].append(topic)
-                        filename_info['confidence'] += 0.2
+            for match in _TOPIC_RE.finditer(filename):
+                topic = _words_from_separators(match.group(1)).title()
+                if len(topic) > 2:
+                    filename_info['topic_keywords'].append(topic)
+                    filename_info['confidence'] += 0.2
             
             # Extract matter number
-            matter_number = self._extract_matter_number(os.path.basename(file_path), job_id)
+            matter_number = self._extract_matter_number(basename, job_id)
             if matter_number:
                 filename_info['matter_number'] = matter_number
                 filename_info['confidence'] += 0.3
@@ -223,8 +469,27 @@ class IntelligentFileNamer:
         
         return filename_info
     
-    def _extract_metadata(self, file_path: str, job_id: Optional[int] = None) -> Dict[str, Any]:
-        """Extract metadata from audio file"""
+    def _lead_name_matches(self, filename: str):
+        """Yield (source, raw name) for leader-prefixed names, highest priority first, from a single scan"""
+        found = {source: [] for source in _NAME_LEAD_PRIORITY}
+        for match in _NAME_LEADS.finditer(filename):
+            found[match.lastgroup].append(match.group(match.lastgroup))
+        
+        for source in _NAME_LEAD_PRIORITY:
+            for name in found[source]:
+                yield source, name
+    
+    def _fallback_name_matches(self, filename: str):
+        """Yield (source, raw name) for bare names; only needed when no leader-prefixed name was usable"""
+        for pattern in _NAME_FALLBACKS:
+            for name in pattern.findall(filename):
+                yield 'standalone', name
+    
+    @_cached_per_file('metadata')
+    def _extract_metadata(self, file_path: str, job_id: Optional[int] = None,
+                          stat_result: Optional[os.stat_result] = None,
+                          duration_only: bool = False) -> Dict[str, Any]:
+        """Extract metadata from audio file (a caller's stat_result lets empty files skip parsing)"""
         metadata_info = {
             'duration': None,
             'title': None,
@@ -232,6 +497,21 @@ class IntelligentFileNamer:
             'confidence': 0.0
         }
         
+        if stat_result is not None and stat_result.st_size == 0:
+            return metadata_info
+        
+        if duration_only:
+            # Format-specific readers skip the generic sniffer and the tag decoding
+            try:
+                duration = _read_duration(file_path)
+                if duration is not None:
+                    metadata_info['duration'] = int(duration)
+                    metadata_info['confidence'] += 0.1
+                    log_info(f"Extracted metadata: duration={metadata_info['duration']}s", job_id)
+                    return metadata_info
+            except Exception as e:
+                log_warning(f"Fast duration read failed, parsing full metadata: {e}", job_id)
+        
         try:
             audio_file = MutagenFile(file_path)
             if audio_file is not None:
@@ -267,48 +547,39 @@ class IntelligentFileNamer:
         - _52366_ (underscores on both sides) -> [52366]
         - _52366 (underscore on left side, typically at end of filename) -> [52366]
         """
-        try:
-            # Pattern for 5-digit numbers with square brackets: [12345]
-            bracket_pattern = r'\[(\d{5})\]'
-            match = re.search(bracket_pattern, filename)
-            if match:
-                matter_num = match.group(1)
-                log_info(f"Found matter number in brackets: {matter_num}", job_id)
-                return f"[{matter_num}]"
-            
-            # Pattern for 5-digit numbers with underscores on both sides: _12345_
-            underscore_both_pattern = r'_(\d{5})_'
-            match = re.search(underscore_both_pattern, filename)
-            if match:
-                matter_num = match.group(1)
-                log_info(f"Found matter number with underscores: {matter_num} -> converting to [{matter_num}]", job_id)
-                return f"[{matter_num}]"
-            
-            # Pattern for 5-digit numbers with underscore on left: _12345 (typically at end)
-            underscore_left_pattern = r'_(\d{5})(?:\.|$)'
-            match = re.search(underscore_left_pattern, filename)
-            if match:
-                matter_num = match.group(1)
-                log_info(f"Found matter number with left underscore: {matter_num} -> converting to [{matter_num}]", job_id)
-                return f"[{matter_num}]"
-            
-            # No matter number found
-            return None
-            
-        except Exception as e:
-            log_warning(f"Error extracting matter number: {e}", job_id)
+        # One scan over all three forms; on multiple hits brackets win, then _12345_, then _12345
+        best = None
+        for match in _MATTER_RE.finditer(filename):
+            if best is None or match.lastindex < best.lastindex:
+                best = match
+                if match.lastindex == 1:
+                    break
+        
+        # No matter number found
+        if best is None:
             return None
-    
+        
+        matter_num = best.group(best.lastindex)
+        log_info(f"Found matter number {_MATTER_FORMS[best.lastindex]}: {matter_num} -> [{matter_num}]", job_id)
+        return f"[{matter_num}]"
     
     def _clean_filename(self, filename: str) -> str:
         """Clean filename to be filesystem-safe and remove duplications"""
+        # Each pass is skipped when a cheap check shows it has nothing to do (the usual case for AI names)
         # Remove or replace invalid characters
-        filename = re.sub(r'[<>:"/\\|?*]', '', filename)
-        filename = re.sub(r'\s+', ' ', filename)  # Multiple spaces to single
+        if not _INVALID_FS_CHAR_SET.isdisjoint(filename):
+            filename = _INVALID_FS_CHARS.sub('', filename)
+        # Multiple spaces to single; any whitespace other than a plain space is non-printable
+        if '  ' in filename or not filename.isprintable():
+            filename = _MULTI_WS.sub(' ', filename)
         filename = filename.strip()
         
         # Fix common duplication patterns
-        filename = self._fix_duplications(filename)
+        lower = filename.lower()
+        words = lower.split()
+        if (len(set(words)) != len(words) or
+                're re' in lower or 'with with' in lower or 'and and' in lower):
+            filename = self._fix_duplications(filename)
         
         # Limit length
         if len(filename) > 200:
@@ -319,90 +590,47 @@ class IntelligentFileNamer:
     def _fix_duplications(self, filename: str) -> str:
         """Fix common duplication patterns in filename"""
         # Fix "Re re" patterns
-        filename = re.sub(r'\bre\s+re\b', 're', filename, flags=re.IGNORECASE)
+        filename = _RE_RE.sub('re', filename)
         
         # Fix "With with" patterns  
-        filename = re.sub(r'\bwith\s+with\b', 'with', filename, flags=re.IGNORECASE)
+        filename = _WITH_WITH.sub('with', filename)
         
         # Fix "And and" patterns
-        filename = re.sub(r'\band\s+and\b', 'and', filename, flags=re.IGNORECASE)
-        
-        # Fix repeated words in general (but be careful with names)
-        words = filename.split()
-        cleaned_words = []
-        
-        for i, word in enumerate(words):
-            # Don't deduplicate if it might be part of a name
-            if i > 0 and word.lower() == words[i-1].lower():
-                # Check if this might be a name duplication
-                if (word.lower() not in ['re', 'with', 'and', 'the', 'a', 'an', 'of', 'in', 'on', 'at'] and
-                    len(word) > 2 and word[0].isupper()):
-                    # This looks like a name, skip the duplicate
-                    continue
-                elif word.lower() in ['re', 'with', 'and']:
-                    # These are definitely duplicates to remove
-                    continue
-            
-            cleaned_words.append(word)
+        filename = _AND_AND.sub('and', filename)
         
-        return ' '.join(cleaned_words)
+        # Fix repeated words in general (but be careful with names); whitespace was already collapsed by _clean_filename
+        return _DUP_WORDS.sub(_drop_repeats, filename)
     
     def _deduplicate_participants(self, filename_participants: list, ai_participants: list, job_id: Optional[int] = None) -> list:
         """Intelligently deduplicate participants from different sources"""
         result = []
         
+        known_people = _PersonIndex()
+        
         # Start with filename participants (highest priority)
         for participant in filename_participants:
             if participant not in result:
                 result.append(participant)
+                known_people.add(participant)
         
         # Add AI participants, but check for duplicates intelligently
         for ai_participant in ai_participants:
-            is_duplicate = False
-            
             # Check if this AI participant is already represented
-            for existing in result:
-                if self._are_same_person(existing, ai_participant):
-                    is_duplicate = True
-                    log_info(f"Detected duplicate participant: '{ai_participant}' matches existing '{existing}'", job_id)
-                    break
+            existing = known_people.match(ai_participant)
+            if existing is not None:
+                log_info(f"Detected duplicate participant: '{ai_participant}' matches existing '{existing}'", job_id)
             
             # Add if not duplicate and we have space
-            if not is_duplicate and len(result) < 3:
+            elif len(result) < 3:
                 result.append(ai_participant)
+                known_people.add(ai_participant)
         
         log_info(f"Deduplicated participants: {result}", job_id)
         return result
     
     def _are_same_person(self, name1: str, name2: str) -> bool:
         """Check if two names refer to the same person"""
-        # Normalize names for comparison
-        norm1 = name1.lower().strip()
-        norm2 = name2.lower().strip()
-        
-        # Exact match
-        if norm1 == norm2:
-            return True
-        
-        # Check if one name is contained in the other (e.g., "Rob" vs "Rob Veitch")
-        words1 = set(norm1.split())
-        words2 = set(norm2.split())
-        
-        # If one set is a subset of the other, they're likely the same person
-        if words1.issubset(words2) or words2.issubset(words1):
-            return True
-        
-        # Check for common surname patterns (e.g., "Rob Veitch" and "Veitch")
-        if len(words1) > 1 and len(words2) == 1:
-            # Check if single name matches any word in full name
-            if words2.pop() in words1:
-                return True
-        elif len(words2) > 1 and len(words1) == 1:
-            # Check if single name matches any word in full name
-            if words1.pop() in words2:
-                return True
-        
-        return False
+        return _same_person(_name_tokens(name1), _name_tokens(name2))
     
     def _is_topic_actually_name(self, topic: str, participants: list) -> bool:
         """Check if the AI topic is actually a person's name"""
@@ -428,34 +656,27 @@ class IntelligentFileNamer:
         
         return False
     
-    def _is_valid_name(self, name: str, exclude_words: set) -> bool:
+    def _is_valid_name(self, name: str) -> bool:
         """Validate if extracted text is a valid name"""
         # Check basic criteria
         if len(name) < 2 or len(name) > 50:
             return False
         
         # Check if it's in exclude words
-        if name.lower() in exclude_words:
+        if name.lower() in _EXCLUDE_WORDS:
             return False
         
         # Check if any word in the name is in exclude words
         name_words = name.lower().split()
-        if any(word in exclude_words for word in name_words):
-            return False
-        
-        # Must contain at least one letter
-        if not re.search(r'[a-zA-Z]', name):
+        if any(word in _EXCLUDE_WORDS for word in name_words):
             return False
         
-        # Should not be all numbers
-        if name.replace(' ', '').isdigit():
+        # Must contain at least one letter (which also rules out all-digit names)
+        if _NAME_LETTERS.isdisjoint(name):
             return False
         
         # Should not contain special characters (except spaces and hyphens)
-        if re.search(r'[^a-zA-Z\s\-]', name):
-            return False
-        
-        return True
+        return _NAME_ALLOWED.issuperset(name)
     
     def _generate_fallback_filename(self, original_file: str) -> str:
         """Generate fallback filename when all else fails"""
@@ -0,0 +1,17 @@
+import json
+import hashlib
+from typing import Dict, Any, Optional
+from src.core.sqlite_cache import SQLiteLRUCache
+
+DEFAULT_CACHE_PATH = "~/.cache/transcription/llm_responses.db"
+
+class LLMCache(SQLiteLRUCache):
+    """Persistent exact-match cache of model responses keyed by a hash of the full request"""
+    
+    def __init__(self, path: Optional[str] = None, max_entries: int = 1000, ttl: Optional[float] = None):
+        super().__init__(path or DEFAULT_CACHE_PATH, 'responses', max_entries, ttl, label="LLM cache")
+    
+    @staticmethod
+    def make_key(request: Dict[str, Any]) -> str:
+        """SHA-256 of the request arguments (model, messages/instructions, sampling and length limits)"""
+        return hashlib.sha256(json.dumps(request, sort_keys=True).encode()).hexdigest()
@@ -1,12 +1,173 @@
+import asyncio
 import os
+import random
 import re
 import time
 import json
-from typing import Dict, Any, Optional, Tuple
-from openai import OpenAI
-from src.utils import ConfigManager, log_info, log_error, log_warning, read_prompt_file
+from itertools import islice
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, List, Optional, Tuple
+import httpx
+from openai import AsyncOpenAI, OpenAI
+from src.core.llm_cache import LLMCache
+from src.core.rate_limiter import RateLimiter, estimate_tokens
+from src.utils import ConfigManager, close_on_exit, log_info, log_error, log_warning, read_prompt_file, run_coroutine
 from src.utils.prompt_manager import build_transcript_summary, combine_prompt, resolve_openai_params
 
+try:
+    import h2  # noqa: F401  (httpx needs it for HTTP/2)
+    _HTTP2 = True
+except ImportError:  # optional: without it connections are HTTP/1.1 keep-alive
+    _HTTP2 = False
+
+# Long-lived pools so retries and concurrent requests reuse warm TLS connections.
+# Read timeout matches the SDK default; o1 summaries can take minutes.
+# Idle connections outlive the 30 s health-probe interval, so probes reuse them too.
+_HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=64, keepalive_expiry=60)
+_HTTP_TIMEOUT = httpx.Timeout(600.0, connect=10.0)
+
+def _http_client_options() -> Dict[str, Any]:
+    return dict(http2=_HTTP2, limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT, follow_redirects=True)
+
+# Retries are done here (the SDK's own are disabled) so waits follow one policy
+_RETRY_MAX_WAIT = 30
+# Longest server-requested wait we honour before retrying anyway
+_RETRY_AFTER_MAX = 120
+_RESET_PART = re.compile(r'(\d+(?:\.\d+)?)(ms|s|m|h)')
+_RESET_UNITS = {'ms': 0.001, 's': 1, 'm': 60, 'h': 3600}
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """Seconds the server asked us to wait (retry-after-ms, Retry-After, or the rate-limit reset headers)"""
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        retry_after = headers.get("retry-after")
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                # HTTP-date form
+                return parsedate_to_datetime(retry_after).timestamp() - time.time()
+    except (TypeError, ValueError):
+        pass
+    # e.g. "1s", "6m0s", "250ms"
+    reset = headers.get("x-ratelimit-reset-requests") or headers.get("x-ratelimit-reset-tokens")
+    parts = _RESET_PART.findall(reset or "")
+    if parts:
+        return sum(float(value) * _RESET_UNITS[unit] for value, unit in parts)
+    return None
+
+def _retry_wait(error: Exception, attempt: int) -> Optional[float]:
+    """How long to wait before retrying after error, or None if retrying cannot help.
+    Connection errors, timeouts, 408/409/429 and 5xx are retried; other API errors (bad request,
+    authentication, permissions) would fail the same way again."""
+    status = getattr(error, "status_code", None)
+    if status is not None and status not in (408, 409, 429) and status < 500:
+        return None
+    server_wait = _retry_after(error)
+    if server_wait is not None:
+        return max(0.0, min(server_wait, _RETRY_AFTER_MAX))
+    # Full jitter keeps parallel workers from retrying in lockstep
+    return random.uniform(0, min(_RETRY_MAX_WAIT, 2 ** attempt))
+
+# Requests about a transcript carry it once, in the system message after the fixed instructions, so
+# every step for that transcript starts with the same prefix and OpenAI's prompt caching can reuse it;
+# the step prompts' {transcript} placeholders point there instead
+_SYSTEM_INSTRUCTIONS = "You are a helpful meeting assistant that analyzes transcripts and extracts key information."
+_TRANSCRIPT_REF = "(see the transcript in the system message)"
+# Shared by every chat request without a transcript (the SDK only reads it)
+_SYSTEM_MSG = {"role": "system", "content": _SYSTEM_INSTRUCTIONS}
+
+def _make_messages(prompt: str, system: Optional[str] = None) -> List[Dict[str, str]]:
+    """Chat messages for a prompt; system replaces the default instructions"""
+    system_msg = _SYSTEM_MSG if system is None else {"role": "system", "content": system}
+    return [system_msg, {"role": "user", "content": prompt}]
+
+_FUSED_SCHEMA = {
+    "name": "summary_and_filename",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "properties": {
+            "summary": {"type": "string"},
+            "filename": {"type": "string"},
+        },
+        "required": ["summary", "filename"],
+        "additionalProperties": False,
+    },
+}
+
+# The fused request with the filename check folded in as well
+_FUSED_VALIDATED_SCHEMA = {
+    "name": "summary_and_validated_filename",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "properties": {
+            "summary": {"type": "string"},
+            "filename": {"type": "string"},
+            "validated_filename": {"type": "string"},
+        },
+        "required": ["summary", "filename", "validated_filename"],
+        "additionalProperties": False,
+    },
+}
+
+# Stands in for the proposed filename when the check runs in the same request that proposes it
+_FILENAME_REF = "(the Task 2 filename)"
+
+# How long a successful connection test is trusted before the API is asked again
+_CONNECTION_OK_TTL = 300
+
+# Batch API states in which the output is not ready yet
+_BATCH_RUNNING = frozenset({"validating", "in_progress", "finalizing", "cancelling"})
+
+# Components of a corrected "... with [Names] re [Topic] - ..." filename
+_CORRECTED_PARTICIPANTS = re.compile(r'with\s+([^-]+?)\s+re')
+_CORRECTED_TOPIC = re.compile(r're\s+([^-]+?)\s*-')
+
+# Fallback naming: diarized speaker lines, and keywords searched case-insensitively so the
+# (possibly very long) transcript is never lowercased into a copy
+_SPEAKER_LINE = re.compile(r'^[ \t]*\[Speaker[^\n]*:', re.MULTILINE)
+_MEETING_TYPE_WORDS = re.compile(r'call|interview|presentation', re.IGNORECASE)
+_TOPIC_HINT_WORDS = re.compile(r'regarding|about|discuss', re.IGNORECASE)
+
+class _JSONScanner:
+    """Brace depth of streamed JSON text, ignoring brackets inside strings"""
+    __slots__ = ('depth', 'in_string', 'escaped')
+    
+    def __init__(self):
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+    
+    def feed(self, text: str) -> Optional[bool]:
+        """True once the top-level object or array has closed, False if the text cannot be JSON, None to keep reading"""
+        for ch in text:
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif ch == '\\':
+                    self.escaped = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch in '{[':
+                self.depth += 1
+            elif self.depth == 0:
+                # Anything but whitespace before the opening bracket (prose, a code fence) is not JSON
+                if not ch.isspace():
+                    return False
+            elif ch in '}]':
+                self.depth -= 1
+                if self.depth == 0:
+                    return True
+            elif ch == '"':
+                self.in_string = True
+        return None
+
 class OpenAIProcessor:
     def __init__(self):
         self.config = ConfigManager()
@@ -15,7 +176,55 @@ class OpenAIProcessor:
         if not self.api_key or self.api_key == "your_openai_key_here":
             raise ValueError("OpenAI API key not configured. Please set OPENAI_API_KEY in your .env file")
         
-        self.client = OpenAI(api_key=self.api_key)
+        self._http = httpx.Client(**_http_client_options())
+        self.client = OpenAI(api_key=self.api_key, http_client=self._http, max_retries=0)
+        # AsyncOpenAI clients by event loop: a connection pool cannot be shared across loops
+        self._async_clients = {}
+        # The background loop's client serves every synchronous call; close it only at shutdown
+        close_on_exit(self.aclose)
+        
+        # Re-running a job with an identical request returns the stored response without an API call
+        self.cache = None
+        self._cache_deterministic_only = bool(self.config.get("openai.cache.deterministic_only", True))
+        if self.config.get("openai.cache.enabled", True):
+            try:
+                self.cache = LLMCache(
+                    self.config.get("openai.cache.path"),
+                    self.config.get("openai.cache.max_entries", 1000),
+                    self.config.get("openai.cache.ttl"),
+                )
+            except Exception as e:
+                log_warning(f"OpenAI response cache unavailable: {e}")
+        
+        # Queue requests to stay under the account's per-minute limits rather than running into 429s
+        rpm = self.config.get("openai.rpm")
+        tpm = self.config.get("openai.tpm")
+        self.limiter = RateLimiter(rpm, tpm) if rpm or tpm else None
+        
+        # monotonic time of the last successful test_connection
+        self._connection_ok_at = None
+
+    def _async_client(self) -> AsyncOpenAI:
+        """AsyncOpenAI client bound to the running event loop"""
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            client = self._async_clients[loop] = AsyncOpenAI(
+                api_key=self.api_key,
+                http_client=httpx.AsyncClient(**_http_client_options()),
+                max_retries=0,
+            )
+        return client
+    
+    def close(self):
+        """Release the pooled connections of the synchronous client"""
+        self._http.close()
+    
+    async def aclose(self):
+        """Close the running loop's AsyncOpenAI client (call before that loop ends)"""
+        client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.close()
     
     def process_transcript(self, transcript: str, original_filename: str = "", job_id: Optional[int] = None, duration_minutes: Optional[int] = None, *, prompt_overrides: Optional[Dict[str, Any]] = None, extra_instructions: str = "") -> str:
         """
@@ -30,31 +239,25 @@ class OpenAIProcessor:
         Returns:
             Processed content with summary, action items, and decisions
         """
+        return self._run_blocking(
+            self.aprocess_transcript,
+            transcript,
+            original_filename,
+            job_id,
+            duration_minutes,
+            prompt_overrides=prompt_overrides,
+            extra_instructions=extra_instructions,
+        )
+    
+    async def aprocess_transcript(self, transcript: str, original_filename: str = "", job_id: Optional[int] = None, duration_minutes: Optional[int] = None, *, prompt_overrides: Optional[Dict[str, Any]] = None, extra_instructions: str = "") -> str:
+        """Async process_transcript; the request is awaited instead of blocking a thread"""
         try:
             log_info(f"Starting OpenAI processing for transcript ({len(transcript)} chars)", job_id)
             
-            duration_str = str(duration_minutes) if duration_minutes else 'Unknown'
-            base_template = read_prompt_file('summary', self.config)
-            placeholders = {
-                'transcript': transcript,
-                'original_filename': original_filename,
-                'duration_minutes': duration_str,
-            }
-            smode = (prompt_overrides or {}).get('prompts', {}).get('summary_mode', 'replace')
-            summary_prompt = combine_prompt(
-                base_template=base_template,
-                folder_body=extra_instructions or '',
-                placeholders=placeholders,
-                mode=smode,
-                section_heading='Folder Instructions',
-            )
+            summary_prompt = self._summary_prompt(_TRANSCRIPT_REF, original_filename, duration_minutes, prompt_overrides, extra_instructions)
             
-            if not summary_prompt.strip():
-                raise ValueError("Summary prompt not configured")
-            
-            # Process with retry logic
-            model, temperature, max_tokens = resolve_openai_params(config=self.config, overrides=prompt_overrides)
-            processed_content = self._process_with_retry(summary_prompt, job_id, model=model, temperature=temperature, max_tokens=max_tokens)
+            model, temperature, max_tokens = resolve_openai_params(config=self.config, overrides=prompt_overrides, step='summary')
+            processed_content = await self._aprocess_with_retry(summary_prompt, job_id, model=model, temperature=temperature, max_tokens=max_tokens, transcript=transcript)
             
             log_info(f"OpenAI processing completed. Output length: {len(processed_content)} chars", job_id)
             return processed_content
@@ -64,6 +267,28 @@ class OpenAIProcessor:
             log_error(error_msg, job_id)
             raise Exception(error_msg)
     
+    def _summary_prompt(self, transcript: str, original_filename: str, duration_minutes: Optional[int], prompt_overrides: Optional[Dict[str, Any]], extra_instructions: str) -> str:
+        """Build the summary prompt (base template plus any folder instructions)"""
+        duration_str = str(duration_minutes) if duration_minutes else 'Unknown'
+        base_template = read_prompt_file('summary', self.config)
+        placeholders = {
+            'transcript': transcript,
+            'original_filename': original_filename,
+            'duration_minutes': duration_str,
+        }
+        smode = (prompt_overrides or {}).get('prompts', {}).get('summary_mode', 'replace')
+        summary_prompt = combine_prompt(
+            base_template=base_template,
+            folder_body=extra_instructions or '',
+            placeholders=placeholders,
+            mode=smode,
+            section_heading='Folder Instructions',
+        )
+        
+        if not summary_prompt.strip():
+            raise ValueError("Summary prompt not configured")
+        return summary_prompt
+    
     def extract_naming_info(self, transcript: str, original_filename: str = "", job_id: Optional[int] = None, duration_minutes: Optional[int] = None, *, prompt_overrides: Optional[Dict[str, Any]] = None, extra_instructions: str = "", validation_overrides: Optional[Dict[str, Any]] = None, validation_extra: str = "") -> Dict[str, Any]:
         """
         Extract naming information from transcript for intelligent file naming using two-step validation
@@ -76,11 +301,24 @@ class OpenAIProcessor:
         Returns:
             Dictionary with participants, topic, and meeting_type
         """
+        return self._run_blocking(
+            self.aextract_naming_info,
+            transcript,
+            original_filename,
+            job_id,
+            duration_minutes,
+            prompt_overrides=prompt_overrides,
+            extra_instructions=extra_instructions,
+            validation_overrides=validation_overrides,
+            validation_extra=validation_extra,
+        )
+    
+    async def aextract_naming_info(self, transcript: str, original_filename: str = "", job_id: Optional[int] = None, duration_minutes: Optional[int] = None, *, prompt_overrides: Optional[Dict[str, Any]] = None, extra_instructions: str = "", validation_overrides: Optional[Dict[str, Any]] = None, validation_extra: str = "") -> Dict[str, Any]:
+        """Async extract_naming_info; validation still waits for the proposed filename"""
         try:
             log_info("Step 1: Extracting naming information from transcript", job_id)
             
-            # Step 1: Extract initial naming info
-            naming_info = self._extract_initial_naming_info(
+            naming_info = await self._aextract_initial_naming_info(
                 transcript,
                 original_filename,
                 job_id,
@@ -89,8 +327,7 @@ class OpenAIProcessor:
                 extra_instructions=extra_instructions
             )
             
-            # Step 2: Validate and correct the proposed filename
-            validated_info = self._validate_filename(
+            return await self._avalidate_filename(
                 naming_info,
                 transcript,
                 original_filename,
@@ -99,124 +336,269 @@ class OpenAIProcessor:
                 extra_instructions=validation_extra
             )
             
-            return validated_info
-            
         except Exception as e:
             log_error(f"Naming extraction failed: {e}", job_id)
             return self._get_default_naming_info()
     
-    def _extract_initial_naming_info(self, transcript: str, original_filename: str, job_id: Optional[int] = None, duration_minutes: Optional[int] = None, *, prompt_overrides: Optional[Dict[str, Any]] = None, extra_instructions: str = "") -> Dict[str, Any]:
-        """Step 1: Extract complete filename from AI"""
-        try:
-            duration_str = str(duration_minutes) if duration_minutes else 'Unknown'
-            base_template = read_prompt_file('naming', self.config)
-            tsummary = build_transcript_summary(transcript)
-            placeholders = {
-                'transcript': transcript,
-                'transcript_summary': tsummary,
-                'original_filename': original_filename,
-                'duration_minutes': duration_str,
-            }
-            nmode = (prompt_overrides or {}).get('prompts', {}).get('naming_mode', 'append')
-            naming_prompt = combine_prompt(
-                base_template=base_template,
-                folder_body=extra_instructions or '',
-                placeholders=placeholders,
-                mode=nmode,
-                section_heading='Folder Instructions',
+    async def aanalyze_transcript(self, transcript: str, original_filename: str = "", job_id: Optional[int] = None, duration_minutes: Optional[int] = None, *, summary_overrides: Optional[Dict[str, Any]] = None, summary_extra: str = "", naming_overrides: Optional[Dict[str, Any]] = None, naming_extra: str = "", validation_overrides: Optional[Dict[str, Any]] = None, validation_extra: str = "") -> Tuple[str, Dict[str, Any]]:
+        """
+        Summarise and name a transcript with the summary and naming requests in flight together
+        
+        Neither depends on the other, so the job waits for the slower of the two
+        rather than their sum. With openai.fused_summary_naming both come from a single
+        structured request instead (see aprocess_transcript_and_naming). Returns
+        (processed_content, naming_info); a summary failure is raised as from process_transcript.
+        """
+        if self.config.get("openai.fused_summary_naming", False):
+            fused = await self.aprocess_transcript_and_naming(
+                transcript,
+                original_filename,
+                job_id,
+                duration_minutes,
+                summary_overrides=summary_overrides,
+                summary_extra=summary_extra,
+                naming_overrides=naming_overrides,
+                naming_extra=naming_extra,
+                validation_overrides=validation_overrides,
+                validation_extra=validation_extra,
             )
-            
-            if not naming_prompt.strip():
-                log_warning("Naming extraction prompt not configured, using default", job_id)
-                naming_prompt = self._get_default_naming_prompt().format(
-                    transcript=transcript,
-                    original_filename=original_filename
+            if fused is not None:
+                return fused
+        
+        summary, naming_info = await asyncio.gather(
+            self.aprocess_transcript(
+                transcript,
+                original_filename,
+                job_id,
+                duration_minutes,
+                prompt_overrides=summary_overrides,
+                extra_instructions=summary_extra,
+            ),
+            self.aextract_naming_info(
+                transcript,
+                original_filename,
+                job_id,
+                duration_minutes,
+                prompt_overrides=naming_overrides,
+                extra_instructions=naming_extra,
+                validation_overrides=validation_overrides,
+                validation_extra=validation_extra,
+            ),
+            return_exceptions=True,
+        )
+        if isinstance(summary, BaseException):
+            raise summary
+        if isinstance(naming_info, BaseException):
+            log_error(f"Naming extraction failed: {naming_info}", job_id)
+            naming_info = self._get_default_naming_info()
+        return summary, naming_info
+    
+    async def aprocess_transcript_and_naming(self, transcript: str, original_filename: str = "", job_id: Optional[int] = None, duration_minutes: Optional[int] = None, *, summary_overrides: Optional[Dict[str, Any]] = None, summary_extra: str = "", naming_overrides: Optional[Dict[str, Any]] = None, naming_extra: str = "", validation_overrides: Optional[Dict[str, Any]] = None, validation_extra: str = "") -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        Summary, Step 1 naming and Step 2 validation from one structured request, sending the transcript once
+        
+        Returns None if the fused request fails, so the caller can fall back to separate
+        requests. If the answer leaves the filename check empty, it runs as its own request.
+        """
+        try:
+            log_info(f"Starting fused OpenAI summary and naming for transcript ({len(transcript)} chars)", job_id)
+            
+            # All prompts point at the one copy of the transcript in the system message
+            summary_prompt = self._summary_prompt(_TRANSCRIPT_REF, original_filename, duration_minutes, summary_overrides, summary_extra)
+            naming_prompt = self._naming_prompt(transcript, original_filename, duration_minutes, naming_overrides, naming_extra, job_id, shared=True)
+            validation_prompt = self._validation_prompt(_FILENAME_REF, _TRANSCRIPT_REF, original_filename, validation_overrides or naming_overrides, validation_extra)
+            if validation_prompt.strip():
+                prompt = (
+                    'Complete the three tasks below for the same meeting. Answer with a JSON object whose "summary" '
+                    'is the Task 1 output (Markdown), whose "filename" is the Task 2 output and whose '
+                    '"validated_filename" is the Task 3 output.\n\n'
+                    f"# Task 1: Summary\n\n{summary_prompt}\n\n"
+                    f"# Task 2: Filename\n\n{naming_prompt}\n\n"
+                    f"# Task 3: Filename check\n\n{validation_prompt}\n"
+                )
+                schema = _FUSED_VALIDATED_SCHEMA
+            else:
+                prompt = (
+                    'Complete both tasks below for the same meeting. Answer with a JSON object whose "summary" '
+                    'is the Task 1 output (Markdown) and whose "filename" is the Task 2 output.\n\n'
+                    f"# Task 1: Summary\n\n{summary_prompt}\n\n"
+                    f"# Task 2: Filename\n\n{naming_prompt}\n"
                 )
+                schema = _FUSED_SCHEMA
             
-            # Process with retry logic - no longer expecting JSON
-            model, temperature, max_tokens = resolve_openai_params(config=self.config, overrides=prompt_overrides)
-            response = self._process_with_retry(naming_prompt, job_id, expect_json=False, model=model, temperature=temperature, max_tokens=max_tokens)
+            model, temperature, max_tokens = resolve_openai_params(config=self.config, overrides=summary_overrides, step='summary')
+            response = await self._aprocess_with_retry(
+                prompt, job_id, expect_json=True, model=model, temperature=temperature, max_tokens=max_tokens,
+                json_schema=schema, transcript=transcript,
+            )
+            result = json.loads(response)
+            summary, filename = result["summary"], result["filename"]
+            if not summary.strip():
+                raise ValueError("empty summary")
+        except Exception as e:
+            log_warning(f"Fused summary and naming failed, using separate requests: {e}", job_id)
+            return None
+        
+        log_info(f"OpenAI processing completed. Output length: {len(summary)} chars", job_id)
+        naming_info = self._naming_from_response(filename, transcript, job_id)
+        validated = result.get("validated_filename", "").strip()
+        if validated and naming_info.get('complete_filename'):
+            log_info("Step 2: Filename validated in the same request", job_id)
+            return summary, self._validated_from_response(validated, naming_info, job_id)
+        
+        naming_info = await self._avalidate_filename(
+            naming_info,
+            transcript,
+            original_filename,
+            job_id,
+            prompt_overrides=validation_overrides or naming_overrides,
+            extra_instructions=validation_extra
+        )
+        return summary, naming_info
+    
+    def analyze_transcript(self, *args, **kwargs) -> Tuple[str, Dict[str, Any]]:
+        """Blocking aanalyze_transcript for synchronous callers (runs on the shared background loop)"""
+        return self._run_blocking(self.aanalyze_transcript, *args, **kwargs)
+    
+    def _run_blocking(self, method, *args, **kwargs):
+        """Run one of the async methods on the shared background loop, whose client stays warm between calls"""
+        return run_coroutine(method(*args, **kwargs))
+    
+    async def _aextract_initial_naming_info(self, transcript: str, original_filename: str, job_id: Optional[int] = None, duration_minutes: Optional[int] = None, *, prompt_overrides: Optional[Dict[str, Any]] = None, extra_instructions: str = "") -> Dict[str, Any]:
+        """Step 1: Extract complete filename from AI"""
+        try:
+            naming_prompt, request_options = self._naming_request(transcript, original_filename, duration_minutes, prompt_overrides, extra_instructions, job_id)
             
-            # Clean up the response (remove any extra whitespace/newlines)
-            complete_filename = response.strip()
+            response = await self._aprocess_with_retry(naming_prompt, job_id, expect_json=False, **request_options)
             
-            if complete_filename:
-                log_info(f"Step 1 - AI filename response: '{complete_filename}'", job_id)
-                
-                # Return the complete filename in a format the file namer expects
-                return {
-                    'complete_filename': complete_filename,
-                    'participants': ['AI Generated'],  # Placeholder
-                    'topic': 'AI Generated',  # Placeholder
-                    'meeting_type': 'AI Generated'  # Placeholder
-                }
-            else:
-                log_warning("AI returned empty filename, using fallback", job_id)
-                return self._fallback_naming_extraction(transcript, job_id)
+            return self._naming_from_response(response, transcript, job_id)
             
         except Exception as e:
             log_error(f"Initial naming extraction failed: {e}", job_id)
             return self._get_default_naming_info()
     
-    def _validate_filename(self, naming_info: Dict[str, Any], transcript: str, original_filename: str, job_id: Optional[int] = None, *, prompt_overrides: Optional[Dict[str, Any]] = None, extra_instructions: str = "") -> Dict[str, Any]:
+    def _naming_request(self, transcript: str, original_filename: str, duration_minutes: Optional[int], prompt_overrides: Optional[Dict[str, Any]], extra_instructions: str, job_id: Optional[int] = None) -> Tuple[str, Dict[str, Any]]:
+        """Step 1 prompt and request options. The transcript goes in the system message only when naming
+        runs on the summary's model: prompt-cache prefixes are per model, so otherwise it would be paid
+        for in full, and the naming prompt's excerpt is all the step needs."""
+        model, temperature, max_tokens = resolve_openai_params(config=self.config, overrides=prompt_overrides, step='naming')
+        shared = model == resolve_openai_params(config=self.config, step='summary')[0]
+        naming_prompt = self._naming_prompt(transcript, original_filename, duration_minutes, prompt_overrides, extra_instructions, job_id, shared=shared)
+        return naming_prompt, dict(model=model, temperature=temperature, max_tokens=max_tokens, transcript=transcript if shared else None)
+    
+    def _naming_prompt(self, transcript: str, original_filename: str, duration_minutes: Optional[int], prompt_overrides: Optional[Dict[str, Any]], extra_instructions: str, job_id: Optional[int] = None, *, shared: bool = False) -> str:
+        """Build the Step 1 naming prompt, falling back to the built-in one.
+        shared: the request carries the transcript in its system message, so {transcript} points there."""
+        duration_str = str(duration_minutes) if duration_minutes else 'Unknown'
+        base_template = read_prompt_file('naming', self.config)
+        tsummary = build_transcript_summary(transcript)
+        transcript_text = _TRANSCRIPT_REF if shared else transcript
+        placeholders = {
+            'transcript': transcript_text,
+            'transcript_summary': tsummary,
+            'original_filename': original_filename,
+            'duration_minutes': duration_str,
+        }
+        nmode = (prompt_overrides or {}).get('prompts', {}).get('naming_mode', 'append')
+        naming_prompt = combine_prompt(
+            base_template=base_template,
+            folder_body=extra_instructions or '',
+            placeholders=placeholders,
+            mode=nmode,
+            section_heading='Folder Instructions',
+        )
+        
+        if not naming_prompt.strip():
+            log_warning("Naming extraction prompt not configured, using default", job_id)
+            naming_prompt = self._get_default_naming_prompt().format(
+                transcript=transcript_text,
+                original_filename=original_filename
+            )
+        return naming_prompt
+    
+    def _naming_from_response(self, response: str, transcript: str, job_id: Optional[int] = None) -> Dict[str, Any]:
+        """Turn the Step 1 response into naming info"""
+        # Clean up the response (remove any extra whitespace/newlines)
+        complete_filename = response.strip()
+        
+        if complete_filename:
+            log_info(f"Step 1 - AI filename response: '{complete_filename}'", job_id)
+            
+            # Return the complete filename in a format the file namer expects
+            return {
+                'complete_filename': complete_filename,
+                'participants': ['AI Generated'],  # Placeholder
+                'topic': 'AI Generated',  # Placeholder
+                'meeting_type': 'AI Generated'  # Placeholder
+            }
+        else:
+            log_warning("AI returned empty filename, using fallback", job_id)
+            return self._fallback_naming_extraction(transcript, job_id)
+    
+    async def _avalidate_filename(self, naming_info: Dict[str, Any], transcript: str, original_filename: str, job_id: Optional[int] = None, *, prompt_overrides: Optional[Dict[str, Any]] = None, extra_instructions: str = "") -> Dict[str, Any]:
         """Step 2: Validate and correct the AI-generated complete filename"""
         try:
             log_info("Step 2: Validating AI-generated filename", job_id)
             
-            # Get the complete filename from AI
             proposed_filename = naming_info.get('complete_filename', '')
             if not proposed_filename:
                 log_warning("No complete filename to validate", job_id)
                 return naming_info
             
-            # Create a brief transcript summary for validation context
-            transcript_summary = transcript[:500] + "..." if len(transcript) > 500 else transcript
-            
-            # Get validation prompt
-            validation_template = read_prompt_file('filename-validation', self.config)
-            placeholders = {
-                'proposed_filename': proposed_filename,
-                'original_filename': original_filename,
-                'transcript_summary': transcript_summary
-            }
-            vmode = (prompt_overrides or {}).get('prompts', {}).get('validation_mode', 'replace')
-            validation_prompt = combine_prompt(
-                base_template=validation_template,
-                folder_body=extra_instructions or '',
-                placeholders=placeholders,
-                mode=vmode,
-                section_heading='Folder Validation Rules',
-            )
-            
+            validation_prompt = self._validation_prompt(proposed_filename, transcript, original_filename, prompt_overrides, extra_instructions)
             if not validation_prompt.strip():
                 log_warning("Validation prompt not configured, skipping validation", job_id)
                 return naming_info
             
-            # Process validation - no longer expecting JSON
-            model, temperature, max_tokens = resolve_openai_params(config=self.config, overrides=prompt_overrides)
-            response = self._process_with_retry(validation_prompt, job_id, expect_json=False, model=model, temperature=temperature, max_tokens=max_tokens)
+            model, temperature, max_tokens = resolve_openai_params(config=self.config, overrides=prompt_overrides, step='validation')
+            response = await self._aprocess_with_retry(validation_prompt, job_id, expect_json=False, model=model, temperature=temperature, max_tokens=max_tokens)
             
-            # Clean up the response
-            validation_response = response.strip()
-            log_info(f"Step 2 - Validation response: '{validation_response}'", job_id)
-            
-            if validation_response == "VALID":
-                log_info("Filename validation passed", job_id)
-                return naming_info
-            else:
-                # The response should be the corrected filename
-                log_info(f"Filename corrected to: '{validation_response}'", job_id)
-                return {
-                    'complete_filename': validation_response,
-                    'participants': ['AI Generated'],  # Placeholder
-                    'topic': 'AI Generated',  # Placeholder
-                    'meeting_type': 'AI Generated'  # Placeholder
-                }
+            return self._validated_from_response(response, naming_info, job_id)
             
         except Exception as e:
             log_warning(f"Filename validation failed: {e}. Using original naming info", job_id)
             return naming_info
     
+    def _validation_prompt(self, proposed_filename: str, transcript: str, original_filename: str, prompt_overrides: Optional[Dict[str, Any]], extra_instructions: str) -> str:
+        """Build the Step 2 validation prompt"""
+        # Create a brief transcript summary for validation context
+        transcript_summary = build_transcript_summary(transcript)
+        
+        # Get validation prompt
+        validation_template = read_prompt_file('filename-validation', self.config)
+        placeholders = {
+            'proposed_filename': proposed_filename,
+            'original_filename': original_filename,
+            'transcript_summary': transcript_summary
+        }
+        vmode = (prompt_overrides or {}).get('prompts', {}).get('validation_mode', 'replace')
+        return combine_prompt(
+            base_template=validation_template,
+            folder_body=extra_instructions or '',
+            placeholders=placeholders,
+            mode=vmode,
+            section_heading='Folder Validation Rules',
+        )
+    
+    def _validated_from_response(self, response: str, naming_info: Dict[str, Any], job_id: Optional[int] = None) -> Dict[str, Any]:
+        """Apply the Step 2 verdict: keep the proposal on VALID, otherwise take the correction"""
+        # Clean up the response
+        validation_response = response.strip()
+        log_info(f"Step 2 - Validation response: '{validation_response}'", job_id)
+        
+        if validation_response == "VALID":
+            log_info("Filename validation passed", job_id)
+            return naming_info
+        else:
+            # The response should be the corrected filename
+            log_info(f"Filename corrected to: '{validation_response}'", job_id)
+            return {
+                'complete_filename': validation_response,
+                'participants': ['AI Generated'],  # Placeholder
+                'topic': 'AI Generated',  # Placeholder
+                'meeting_type': 'AI Generated'  # Placeholder
+            }
+    
     def _build_proposed_filename(self, naming_info: Dict[str, Any]) -> str:
         """Build a proposed filename from naming info for validation"""
         parts = []
@@ -250,14 +632,14 @@ class OpenAIProcessor:
             corrected_info = original_info.copy()
             
             # Extract participants (between "with" and "re")
-            with_match = re.search(r'with\s+([^-]+?)\s+re', corrected_filename)
+            with_match = _CORRECTED_PARTICIPANTS.search(corrected_filename)
             if with_match:
                 participants_str = with_match.group(1).strip()
                 participants = [p.strip() for p in participants_str.split(' and ')]
                 corrected_info['participants'] = participants
             
             # Extract topic (between "re" and "-")
-            re_match = re.search(r're\s+([^-]+?)\s*-', corrected_filename)
+            re_match = _CORRECTED_TOPIC.search(corrected_filename)
             if re_match:
                 topic = re_match.group(1).strip()
                 corrected_info['topic'] = topic
@@ -274,96 +656,212 @@ class OpenAIProcessor:
             log_warning(f"Failed to parse corrected filename: {e}", None)
             return original_info
     
-    def _process_with_retry(self, prompt: str, job_id: Optional[int] = None, 
-                           expect_json: bool = False, max_retries: int = 3, *, model: Optional[str] = None, temperature: Optional[float] = None, max_tokens: Optional[int] = None) -> str:
-        """Process prompt with retry logic (Chat Completions for gpt-4*; Responses API for o1*)."""
+    def _request(self, prompt: str, model: Optional[str], temperature: Optional[float], max_tokens: Optional[int], json_schema: Optional[Dict[str, Any]] = None, transcript: Optional[str] = None) -> Tuple[bool, Dict[str, Any]]:
+        """Build the request for the model family: (uses Responses API, keyword arguments).
+        json_schema ({"name", "schema", "strict"}) requests structured output in that shape;
+        transcript goes into the system message, ahead of the step-specific prompt."""
         model_id = (model or self.config.get("openai.model", "gpt-4o"))
         is_o1 = str(model_id).lower().startswith("o1")
-        sys_instructions = "You are a helpful meeting assistant that analyzes transcripts and extracts key information."
+        sys_instructions = None
+        if transcript is not None:
+            sys_instructions = f"{_SYSTEM_INSTRUCTIONS}\n\nTRANSCRIPT:\n{transcript}"
+        if is_o1:
+            # Responses API path
+            # Some o1 models do not support temperature; omit it for compatibility
+            return True, dict(
+                model=model_id,
+                input=[{"role": "user", "content": prompt}],
+                instructions=sys_instructions or _SYSTEM_INSTRUCTIONS,
+                max_output_tokens=(max_tokens if max_tokens is not None else self.config.get("openai.max_tokens", 2000)),
+                **({"text": {"format": {"type": "json_schema", **json_schema}}} if json_schema else {})
+            )
+        # Chat Completions path
+        return False, dict(
+            model=model_id,
+            messages=_make_messages(prompt, sys_instructions),
+            temperature=(temperature if temperature is not None else self.config.get("openai.temperature", 0.7)),
+            max_completion_tokens=(max_tokens if max_tokens is not None else self.config.get("openai.max_tokens", 2000)),
+            **({"response_format": {"type": "json_schema", "json_schema": json_schema}} if json_schema else {})
+        )
+    
+    def _cache_key(self, is_o1: bool, request: Dict[str, Any]) -> Optional[str]:
+        """Cache key for a request, or None when it should not be cached.
+        By default only deterministic requests are cached: sampled ones (temperature > 0, and o1,
+        which always samples) would otherwise pin one draw; deterministic_only: false opts them in."""
+        if self.cache is None:
+            return None
+        if self._cache_deterministic_only and (is_o1 or request.get("temperature") != 0):
+            return None
+        return self.cache.make_key({"responses_api": is_o1, **request})
+    
+    @staticmethod
+    def _request_tokens(request: Dict[str, Any]) -> int:
+        """Tokens a request can use against the TPM limit: instructions and messages plus the output allowance"""
+        text = request.get("instructions", "") + "".join(
+            message["content"] for message in request.get("messages") or request.get("input") or ()
+        )
+        output = request.get("max_output_tokens") or request.get("max_completion_tokens") or 0
+        return estimate_tokens(text, request["model"]) + output
+    
+    @staticmethod
+    def _response_text(is_o1: bool, response) -> str:
+        if is_o1:
+            return getattr(response, 'output_text', None) or ""
+        return response.choices[0].message.content
+    
+    @staticmethod
+    def _delta_text(is_o1: bool, event) -> str:
+        """Text added by one streamed event (Responses API events or Chat Completions chunks)"""
+        if is_o1:
+            return event.delta if getattr(event, 'type', None) == 'response.output_text.delta' else ""
+        return (event.choices[0].delta.content or "") if event.choices else ""
+    
+    async def _astream_text(self, create, is_o1: bool, request: Dict[str, Any]) -> str:
+        """Stream a JSON completion, stopping once the top-level value closes or the text cannot be JSON"""
+        scanner = _JSONScanner()
+        parts = []
+        stream = await create(**request, stream=True)
+        try:
+            async for event in stream:
+                text = self._delta_text(is_o1, event)
+                if text:
+                    parts.append(text)
+                    if scanner.feed(text) is not None:
+                        break
+        finally:
+            await stream.close()
+        return "".join(parts)
+    
+    @staticmethod
+    def _json_ok(content: str, attempt: int, max_retries: int, job_id: Optional[int] = None) -> bool:
+        """False if the response should be retried for invalid JSON; raises once out of attempts"""
+        try:
+            json.loads(content)
+            return True
+        except json.JSONDecodeError:
+            if attempt < max_retries - 1:
+                log_warning(f"Invalid JSON response on attempt {attempt + 1}, retrying", job_id)
+                return False
+            raise ValueError("Failed to get valid JSON response")
+    
+    async def _aprocess_with_retry(self, prompt: str, job_id: Optional[int] = None,
+                                   expect_json: bool = False, max_retries: int = 3, *, model: Optional[str] = None, temperature: Optional[float] = None, max_tokens: Optional[int] = None, json_schema: Optional[Dict[str, Any]] = None, transcript: Optional[str] = None) -> str:
+        """Process prompt with retry logic (Chat Completions for gpt-4*; Responses API for o1*); backoff sleeps yield to the event loop"""
+        is_o1, request = self._request(prompt, model, temperature, max_tokens, json_schema, transcript)
+        cache_key = self._cache_key(is_o1, request)
+        if cache_key:
+            # The cache is SQLite: its reads and (fsync'ing) writes run on a worker thread, not the event loop
+            cached = await asyncio.to_thread(self.cache.get, cache_key)
+            if cached is not None:
+                log_info(f"Using cached OpenAI response ({self.cache.stats()})", job_id)
+                return cached
+        
+        client = self._async_client()
+        create = client.responses.create if is_o1 else client.chat.completions.create
+        tokens = self._request_tokens(request) if self.limiter else 0
         for attempt in range(max_retries):
             try:
-                if is_o1:
-                    # Responses API path
-                    # Some o1 models do not support temperature; omit it for compatibility
-                    response = self.client.responses.create(
-                        model=model_id,
-                        input=[{"role": "user", "content": prompt}],
-                        instructions=sys_instructions,
-                        max_output_tokens=(max_tokens if max_tokens is not None else self.config.get("openai.max_tokens", 2000))
-                    )
-                    content = getattr(response, 'output_text', None) or ""
-                else:
-                    # Chat Completions path
-                    response = self.client.chat.completions.create(
-                        model=model_id,
-                        messages=[
-                            {"role": "system", "content": sys_instructions},
-                            {"role": "user", "content": prompt}
-                        ],
-                        temperature=(temperature if temperature is not None else self.config.get("openai.temperature", 0.7)),
-                        max_completion_tokens=(max_tokens if max_tokens is not None else self.config.get("openai.max_tokens", 2000))
-                    )
-                    content = response.choices[0].message.content
-
-                # Validate JSON if expected
+                if self.limiter:
+                    await self.limiter.aacquire(tokens)
                 if expect_json:
-                    try:
-                        json.loads(content)
-                    except json.JSONDecodeError:
-                        if attempt < max_retries - 1:
-                            log_warning(f"Invalid JSON response on attempt {attempt + 1}, retrying", job_id)
-                            continue
-                        else:
-                            raise ValueError("Failed to get valid JSON response")
-
+                    # Malformed output is caught as it streams in, so a retry starts without waiting for the rest
+                    content = await self._astream_text(create, is_o1, request)
+                else:
+                    content = self._response_text(is_o1, await create(**request))
+                
+                if expect_json and not self._json_ok(content, attempt, max_retries, job_id):
+                    continue
+                
+                if cache_key and content:
+                    await asyncio.to_thread(self.cache.put, cache_key, content)
                 return content
 
             except Exception as e:
-                if attempt < max_retries - 1:
-                    wait_time = 2 ** attempt  # Exponential backoff
-                    log_warning(f"OpenAI API attempt {attempt + 1} failed: {e}. Retrying in {wait_time}s", job_id)
-                    time.sleep(wait_time)
-                else:
+                wait_time = _retry_wait(e, attempt) if attempt < max_retries - 1 else None
+                if wait_time is None:
                     raise e
+                log_warning(f"OpenAI API attempt {attempt + 1} failed: {e}. Retrying in {wait_time:.1f}s", job_id)
+                await asyncio.sleep(wait_time)
+    
+    def batch_summary_job(self, job_id: int, transcript: str, original_filename: str = "", duration_minutes: Optional[int] = None, *, prompt_overrides: Optional[Dict[str, Any]] = None, extra_instructions: str = "") -> Tuple[int, str, Optional[Dict[str, Any]], str]:
+        """submit_batch entry for one transcript's summary, laid out like the live request"""
+        summary_prompt = self._summary_prompt(_TRANSCRIPT_REF, original_filename, duration_minutes, prompt_overrides, extra_instructions)
+        return job_id, summary_prompt, prompt_overrides, transcript
+    
+    def submit_batch(self, jobs: List[Tuple[int, str, Optional[Dict[str, Any]], Optional[str]]]) -> str:
+        """Upload (job_id, prompt, prompt_overrides, transcript) requests as one Batch API job and return its id.
+        Batches finish within 24 hours at half the price, on a quota separate from live requests."""
+        lines = []
+        endpoint = None
+        for job_id, prompt, prompt_overrides, transcript in jobs:
+            model, temperature, max_tokens = resolve_openai_params(config=self.config, overrides=prompt_overrides, step='summary')
+            is_o1, body = self._request(prompt, model, temperature, max_tokens, transcript=transcript)
+            endpoint = "/v1/responses" if is_o1 else "/v1/chat/completions"
+            lines.append(json.dumps({"custom_id": str(job_id), "method": "POST", "url": endpoint, "body": body}))
+        
+        batch_file = self.client.files.create(file=("batch.jsonl", "\n".join(lines).encode("utf-8")), purpose="batch")
+        batch = self.client.batches.create(input_file_id=batch_file.id, endpoint=endpoint, completion_window="24h")
+        log_info(f"Submitted OpenAI batch {batch.id} with {len(lines)} requests")
+        return batch.id
+    
+    def poll_batch(self, batch_id: str) -> Optional[Dict[int, str]]:
+        """Response text by job id once the batch has finished, or None while it is still running.
+        Requests that failed inside the batch are missing from the result; raises if the batch produced no output."""
+        try:
+            batch = self.client.batches.retrieve(batch_id)
+        except Exception as e:
+            if _retry_wait(e, 0) is None:
+                raise
+            log_warning(f"Could not check OpenAI batch {batch_id}: {e}")
+            return None
+        if batch.status in _BATCH_RUNNING:
+            return None
+        if not batch.output_file_id:
+            raise RuntimeError(f"OpenAI batch {batch_id} {batch.status} without output")
+        
+        # Stream the output file rather than loading every response at once
+        results = {}
+        with self.client.files.with_streaming_response.content(batch.output_file_id) as response:
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                item = json.loads(line)
+                result = item.get("response") or {}
+                if result.get("status_code") != 200:
+                    continue
+                text = self._batch_text(result.get("body") or {})
+                if text:
+                    results[int(item["custom_id"])] = text
+        log_info(f"OpenAI batch {batch_id} {batch.status}: {len(results)} responses")
+        return results
+    
+    @staticmethod
+    def _batch_text(body: Dict[str, Any]) -> str:
+        """Output text of a raw Chat Completions or Responses body from a batch output file"""
+        if "choices" in body:
+            return body["choices"][0]["message"]["content"] or ""
+        return "".join(
+            part.get("text", "")
+            for item in body.get("output", [])
+            if item.get("type") == "message"
+            for part in item.get("content", [])
+            if part.get("type") == "output_text"
+        )
     
     def _fallback_naming_extraction(self, transcript: str, job_id: Optional[int] = None) -> Dict[str, Any]:
         """Fallback naming extraction using simple text analysis"""
         log_info("Using fallback naming extraction", job_id)
         
-        # Simple extraction logic
-        participants = []
-        topic = "Meeting"
-        meeting_type = "Meeting"
-        
-        # Look for speaker patterns
-        lines = transcript.split('\n')
-        for line in lines:
-            if line.strip().startswith('[Speaker'):
-                # Extract speaker info if available
-                if ':' in line:
-                    speaker_part = line.split(':')[0]
-                    if 'Speaker' in speaker_part:
-                        participants.append(f"Speaker {len(participants) + 1}")
+        # Look for speaker patterns (at most three participants are used, so stop counting there)
+        speaker_lines = sum(1 for _ in islice(_SPEAKER_LINE.finditer(transcript), 3))
+        participants = [f"Speaker {n}" for n in range(1, speaker_lines + 1)]
         
-        # Remove duplicates and limit
-        participants = list(set(participants))[:3]
+        # The first meeting keyword mentioned sets the type
+        type_match = _MEETING_TYPE_WORDS.search(transcript)
+        meeting_type = type_match.group(0).capitalize() if type_match else "Meeting"
         
-        # Look for common meeting keywords
-        transcript_lower = transcript.lower()
-        if 'call' in transcript_lower:
-            meeting_type = "Call"
-        elif 'interview' in transcript_lower:
-            meeting_type = "Interview"
-        elif 'presentation' in transcript_lower:
-            meeting_type = "Presentation"
-        
-        # Try to extract topic from common phrases
-        topic_keywords = ['regarding', 'about', 'discuss', 'meeting about', 'call about']
-        for keyword in topic_keywords:
-            if keyword in transcript_lower:
-                # Simple topic extraction (this could be improved)
-                topic = "Discussion"
-                break
+        # Simple topic extraction (this could be improved)
+        topic = "Discussion" if _TOPIC_HINT_WORDS.search(transcript) else "Meeting"
         
         return {
             'participants': participants if participants else ["Unknown"],
@@ -412,26 +910,40 @@ Transcript: {transcript}"""
             
             # Remove duplicates using smart matching
             cleaned_participants = []
+            cleaned_words = []
+            # Word -> positions of kept names containing it; names in a subset relation share a word,
+            # so only those positions need comparing (a blank name, a subset of any other, is kept under "")
+            positions_by_word = {}
             
             for participant in participants:
-                is_duplicate = False
-                participant_words = set(participant.lower().split())
+                participant_words = frozenset(participant.lower().split())
+                if participant_words:
+                    candidates = sorted(set(positions_by_word.get('', ())).union(
+                        *(positions_by_word.get(word, ()) for word in participant_words)
+                    ))
+                else:
+                    candidates = range(len(cleaned_participants))
                 
-                for existing in cleaned_participants:
-                    existing_words = set(existing.lower().split())
+                for i in candidates:
+                    existing = cleaned_participants[i]
+                    existing_words = cleaned_words[i]
                     
                     # Check if one is a subset of the other (e.g., "Fox" is subset of "Michael Fox")
-                    if participant_words.issubset(existing_words) or existing_words.issubset(participant_words):
+                    if participant_words <= existing_words or existing_words <= participant_words:
                         # Keep the longer/more complete name
                         if len(participant) > len(existing):
                             # Replace existing with longer name
-                            cleaned_participants[cleaned_participants.index(existing)] = participant
-                        is_duplicate = True
+                            cleaned_participants[i] = participant
+                            cleaned_words[i] = participant_words
+                            for word in participant_words:
+                                positions_by_word.setdefault(word, set()).add(i)
                         log_info(f"Post-processing: Removed duplicate participant '{participant}' (matches '{existing}')", job_id)
                         break
-                
-                if not is_duplicate:
+                else:
+                    for word in participant_words or ('',):
+                        positions_by_word.setdefault(word, set()).add(len(cleaned_participants))
                     cleaned_participants.append(participant)
+                    cleaned_words.append(participant_words)
             
             # Update the naming info
             naming_info['participants'] = cleaned_participants
@@ -454,26 +966,26 @@ Transcript: {transcript}"""
         }
     
     def test_connection(self) -> bool:
-        """Test OpenAI API connection"""
+        """Test OpenAI API connection by looking up the configured model (no tokens billed); a success is reused for a few minutes"""
+        if self._connection_ok_at is not None and time.monotonic() - self._connection_ok_at < _CONNECTION_OK_TTL:
+            return True
         try:
-            model = self.config.get("openai.model", "gpt-4o")
-            if str(model).lower().startswith("o1"):
-                # Responses API path for o1 family
-                resp = self.client.responses.create(
-                    model=model,
-                    input=[{"role": "user", "content": "Hello"}],
-                    max_output_tokens=5
-                )
-                content = getattr(resp, 'output_text', None)
-                return bool(content)
-            else:
-                # Chat Completions path
-                response = self.client.chat.completions.create(
-                    model=model,
-                    messages=[{"role": "user", "content": "Hello"}],
-                    max_completion_tokens=5
-                )
-                return bool(response.choices[0].message.content)
+            # Checks the key and that it can use the model, without running a completion
+            self.client.models.retrieve(self.config.get("openai.model", "gpt-4o"), timeout=10)
+            self._connection_ok_at = time.monotonic()
+            return True
+        except Exception as e:
+            log_error(f"OpenAI connection test failed: {e}")
+            return False
+    
+    async def atest_connection(self) -> bool:
+        """Async test_connection on the running loop's client"""
+        if self._connection_ok_at is not None and time.monotonic() - self._connection_ok_at < _CONNECTION_OK_TTL:
+            return True
+        try:
+            await self._async_client().models.retrieve(self.config.get("openai.model", "gpt-4o"), timeout=10)
+            self._connection_ok_at = time.monotonic()
+            return True
         except Exception as e:
             log_error(f"OpenAI connection test failed: {e}")
             return False
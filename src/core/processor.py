@@ -1,173 +1,415 @@
 import os
+import time
+import errno
+import asyncio
 import shutil
-from datetime import datetime
-from typing import Optional
+import threading
+from typing import Any, Dict, Iterator, List, Optional
 from src.core import Database, DeepgramTranscriber, OpenAIProcessor, IntelligentFileNamer
 from src.utils import (
     ConfigManager,
     log_info,
     log_error,
     log_warning,
+    probe_folders,
     resolve_folder_prompt,
+    run_coroutine,
 )
 
+# Output documents run to megabytes for long recordings; write them in large blocks
+_OUTPUT_BUFSIZE = 1 << 20
+
+# Cross-device moves copy recordings of hundreds of megabytes; shutil's default buffer is 64 KiB
+_COPY_BUFSIZE = 1 << 20
+
+# Seconds a set of connection test results is reused for
+_CONNECTIONS_TTL = 30
+
+def _move_file(source: str, destination: str):
+    """Rename into place; across filesystems copy in 1 MiB blocks and remove the original"""
+    try:
+        os.rename(source, destination)
+        return
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+    try:
+        with open(source, 'rb') as src, open(destination, 'wb') as dst:
+            shutil.copyfileobj(src, dst, length=_COPY_BUFSIZE)
+        # Keep the recording's timestamps, which naming may fall back on
+        shutil.copystat(source, destination)
+    except BaseException:
+        try:
+            os.unlink(destination)
+        except OSError:
+            pass
+        raise
+    os.unlink(source)
+
+def _unique_path(folder: str, filename: str) -> str:
+    """folder/filename, or folder/name_N.ext with the first free N if that is taken"""
+    destination = os.path.join(folder, filename)
+    if not os.path.exists(destination):
+        return destination
+    # One directory listing instead of a stat per candidate name
+    try:
+        with os.scandir(folder) as entries:
+            existing = {entry.name for entry in entries}
+    except FileNotFoundError:
+        return destination
+    counter = 1
+    base_name, ext = os.path.splitext(filename)
+    while f"{base_name}_{counter}{ext}" in existing:
+        counter += 1
+    return os.path.join(folder, f"{base_name}_{counter}{ext}")
+
 class AudioProcessor:
-    def __init__(self):
+    def __init__(self, folders: Optional[dict] = None):
         self.config = ConfigManager()
+        # Absolute folder paths already created at startup (see AudioProcessorApp._ensure_folders)
+        self.folders = folders or {}
         self.db = Database()
         self.deepgram = DeepgramTranscriber()
         self.openai = OpenAIProcessor()
         self.file_namer = IntelligentFileNamer()
+        # (monotonic time, results) of the last connection tests
+        self._connections = None
+        # Prepared jobs waiting on an OpenAI batch, by job id
+        self._batch_jobs = {}
+        self._batch_lock = threading.Lock()
     
-    def process_file(self, file_path: str) -> bool:
+    def process_file(self, file_path: str, *, already_closed: bool = False) -> bool:
         """
         Process a single audio file through the complete pipeline
         
         Args:
             file_path: Path to the audio file to process
-            
+            already_closed: The caller knows the upload is complete (the watcher saw the writer
+                close it, or waited for it to settle), so validation skips its own size re-check
+        
         Returns:
             True if processing succeeded, False otherwise
         """
+        return run_coroutine(self.aprocess_file(file_path, already_closed=already_closed))
+    
+    async def aprocess_file(self, file_path: str, *, already_closed: bool = False) -> bool:
+        """Async process_file: the blocking steps (database, Deepgram, file moves) run in worker threads
+        while the OpenAI requests are awaited on the event loop"""
         job_id = None
         try:
-            filename = os.path.basename(file_path)
-            log_info(f"Starting processing pipeline for: {filename}")
-            
-            # Create job record
-            job_id = self.db.create_job(filename, file_path)
-            self.db.update_job_status(job_id, 'processing')
-            
-            # Validate file
-            if not self._validate_file(file_path, job_id):
-                self.db.update_job_status(job_id, 'failed', 'File validation failed')
+            job_id = await asyncio.to_thread(self._start_job, file_path)
+            job = await self._aprepare_job(file_path, job_id, already_closed)
+            if job is None:
                 return False
             
-            # Resolve folder-specific prompts independently
-            sum_overrides, sum_body, sum_path = resolve_folder_prompt(file_path, 'summary', self.config)
-            name_overrides, name_body, name_path = resolve_folder_prompt(file_path, 'naming', self.config)
-            val_overrides, val_body, val_path = resolve_folder_prompt(file_path, 'filename-validation', self.config)
-            if sum_path:
-                log_info(f"Using folder summary prompt: {sum_path} (len={len(sum_body)})", job_id)
-            if name_path:
-                log_info(f"Using folder naming prompt: {name_path} (len={len(name_body)})", job_id)
-            if val_path:
-                log_info(f"Using folder validation prompt: {val_path} (len={len(val_body)})", job_id)
-
-            # Step 1: Transcribe with Deepgram
-            log_info("Step 1: Transcribing audio with Deepgram", job_id)
-            transcript = self.deepgram.transcribe_file(file_path, job_id)
-            
-            if not transcript or transcript.strip() == "":
-                raise Exception("Empty transcript received from Deepgram")
-            
-            self.db.update_job_transcript(job_id, len(transcript))
-            
-            # Step 2: Extract duration first
-            log_info("Step 2: Extracting duration", job_id)
-            metadata_info = self.file_namer._extract_metadata(file_path, job_id)
-            duration_minutes = None
-            if metadata_info.get('duration'):
-                duration_minutes = max(1, round(metadata_info['duration'] / 60))
-                log_info(f"Extracted duration: {duration_minutes} minutes", job_id)
-            
-            # Step 3: Process with OpenAI (now with duration)
-            log_info("Step 3: Processing transcript with OpenAI", job_id)
-            processed_content = self.openai.process_transcript(
-                transcript,
-                filename,
-                job_id,
-                duration_minutes,
-                prompt_overrides=sum_overrides,
-                extra_instructions=sum_body
-            )
-            
-            # Step 4: Extract naming information with duration
-            log_info("Step 4: Extracting naming information", job_id)
-            naming_info = self.openai.extract_naming_info(
-                transcript,
-                filename,
+            # Steps 3 and 4: Summary and naming with OpenAI (now with duration); the requests run concurrently
+            log_info("Steps 3-4: Processing transcript and extracting naming information with OpenAI", job_id)
+            processed_content, naming_info = await self.openai.aanalyze_transcript(
+                job['transcript'],
+                job['filename'],
                 job_id,
-                duration_minutes,
-                prompt_overrides=name_overrides,
-                extra_instructions=name_body,
-                validation_overrides=val_overrides,
-                validation_extra=val_body,
+                job['duration_minutes'],
+                summary_overrides=job['sum_overrides'],
+                summary_extra=job['sum_body'],
+                naming_overrides=job['name_overrides'],
+                naming_extra=job['name_body'],
+                validation_overrides=job['val_overrides'],
+                validation_extra=job['val_body'],
             )
             
-            # Step 5: Generate intelligent filename
-            log_info("Step 5: Generating intelligent filename", job_id)
-            
-            suggested_filename, confidence = self.file_namer.generate_name(
-                file_path, transcript, naming_info, job_id
-            )
-            
-            # Step 5: Save output
-            log_info("Step 5: Saving processed output", job_id)
-            output_file = self._save_output(
-                processed_content, transcript, suggested_filename, job_id
-            )
-            
-            # Update job with naming and output information
-            self.db.update_job_naming(job_id, suggested_filename, suggested_filename, confidence)
-            self.db.update_job_output(job_id, output_file)
-            
-            # Step 6: Move processed file
-            log_info("Step 6: Moving processed file", job_id)
-            self._move_processed_file(file_path, job_id)
-            
-            # Mark job as completed
-            self.db.update_job_status(job_id, 'completed')
-            log_info(f"Successfully completed processing for: {filename}", job_id)
-            
+            await asyncio.to_thread(self._complete_job, job, job_id, processed_content, naming_info)
             return True
-            
+        
         except Exception as e:
-            error_msg = f"Processing failed: {str(e)}"
-            log_error(error_msg, job_id)
+            await asyncio.to_thread(self._fail_job, file_path, job_id, e)
+            return False
+    
+    def process_batch(self, file_paths: List[str]) -> Optional[str]:
+        """
+        Transcribe many files and send their summaries through the OpenAI Batch API (openai.use_batch_api).
+        Returns once the batch is submitted; poll_batches finishes its jobs when it completes, which can
+        take up to 24 hours. Suited to bulk or overnight runs.
+        
+        Returns:
+            The OpenAI batch id, or None if no file got as far as the batch
+        """
+        jobs = {}
+        requests = []
+        for file_path in file_paths:
+            job_id = None
+            try:
+                job_id = self._start_job(file_path)
+                job = self._prepare_job(file_path, job_id)
+                if job is None:
+                    continue
+                requests.append(self.openai.batch_summary_job(
+                    job_id,
+                    job['transcript'],
+                    job['filename'],
+                    job['duration_minutes'],
+                    prompt_overrides=job['sum_overrides'],
+                    extra_instructions=job['sum_body'],
+                ))
+                jobs[job_id] = job
+            except Exception as e:
+                self._fail_job(file_path, job_id, e)
+        
+        if not jobs:
+            return None
+        
+        # Step 3: Summaries as one batch; naming (short requests that feed each other) stays live
+        try:
+            batch_id = self.openai.submit_batch(requests)
+            self.db.create_batch(batch_id, list(jobs))
+        except Exception as e:
+            for job_id, job in jobs.items():
+                self._fail_job(job['file_path'], job_id, e)
+            return None
+        
+        # Kept so poll_batches need not transcribe again; after a restart it rebuilds them from the jobs table
+        with self._batch_lock:
+            self._batch_jobs.update(jobs)
+        for job_id in jobs:
+            log_info(f"Step 3: Summary queued in OpenAI batch {batch_id}", job_id)
+        return batch_id
+    
+    def poll_batches(self) -> bool:
+        """Check every unfinished OpenAI batch (including ones submitted before a restart) and
+        complete the jobs of those that have finished. Returns True while batches are still pending."""
+        pending = False
+        for batch_id, job_ids in self.db.get_pending_batches():
+            try:
+                summaries = self.openai.poll_batch(batch_id)
+            except Exception as e:
+                self.db.update_batch_status(batch_id, 'failed')
+                for job_id in job_ids:
+                    self._fail_batch_job(job_id, e)
+                continue
+            if summaries is None:
+                pending = True
+                continue
+            
+            self.db.update_batch_status(batch_id, 'completed')
+            for job_id in job_ids:
+                self._finish_batch_job(batch_id, job_id, summaries.get(job_id))
+        return pending
+    
+    def batch_file_paths(self) -> set:
+        """Paths of files whose jobs wait on an unfinished OpenAI batch (left in the watch folder until then)"""
+        paths = set()
+        for _, job_ids in self.db.get_pending_batches():
+            for job_id in job_ids:
+                job = self.db.get_job(job_id)
+                if job and job['status'] == 'processing':
+                    paths.add(job['file_path'])
+        return paths
+    
+    def _finish_batch_job(self, batch_id: str, job_id: int, processed_content: Optional[str]):
+        """Steps 4-6 for one job of a finished batch"""
+        with self._batch_lock:
+            job = self._batch_jobs.pop(job_id, None)
+        if job is None:
+            row = self.db.get_job(job_id)
+            if not row or row['status'] != 'processing':
+                return
+            file_path = row['file_path']
+        else:
+            file_path = job['file_path']
+        
+        try:
+            if not processed_content:
+                raise Exception(f"No summary returned in OpenAI batch {batch_id}")
             
-            if job_id:
-                self.db.update_job_status(job_id, 'failed', error_msg)
+            if job is None:
+                # Submitted before a restart: transcribe again (normally a transcript cache hit)
+                log_info(f"Resuming job from OpenAI batch {batch_id}", job_id)
+                job = self._prepare_job(file_path, job_id)
+                if job is None:
+                    return
             
-            # Move file to error folder
-            try:
-                self._move_error_file(file_path, job_id)
-            except Exception as move_error:
-                log_error(f"Failed to move error file: {move_error}", job_id)
+            log_info("Step 4: Extracting naming information with OpenAI", job_id)
+            naming_info = self.openai.extract_naming_info(
+                job['transcript'],
+                job['filename'],
+                job_id,
+                job['duration_minutes'],
+                prompt_overrides=job['name_overrides'],
+                extra_instructions=job['name_body'],
+                validation_overrides=job['val_overrides'],
+                validation_extra=job['val_body'],
+            )
             
-            return False
+            self._complete_job(job, job_id, processed_content, naming_info)
+        except Exception as e:
+            self._fail_job(file_path, job_id, e)
+    
+    def _fail_batch_job(self, job_id: int, error: Exception):
+        """Fail a job whose batch failed, if it is still waiting on it"""
+        with self._batch_lock:
+            self._batch_jobs.pop(job_id, None)
+        job = self.db.get_job(job_id)
+        if job and job['status'] == 'processing':
+            self._fail_job(job['file_path'], job_id, error)
+    
+    def _start_job(self, file_path: str) -> int:
+        """Create the job record and mark it processing"""
+        filename = os.path.basename(file_path)
+        log_info(f"Starting processing pipeline for: {filename}")
+        
+        # Create job record
+        job_id = self.db.create_job(filename, file_path)
+        self.db.update_job_status(job_id, 'processing')
+        return job_id
+    
+    def _prepare_job(self, file_path: str, job_id: int) -> Optional[Dict[str, Any]]:
+        """Validate, resolve folder prompts, transcribe and read the duration (steps 1-2).
+        Returns None (job marked failed) if the file does not pass validation."""
+        job = self._resolve_job(file_path, job_id)
+        if job is None:
+            return None
+        job['transcript'] = self._transcribe(file_path, job_id)
+        job['duration_minutes'] = self._duration_minutes(file_path, job_id)
+        return job
     
-    def _validate_file(self, file_path: str, job_id: Optional[int] = None) -> bool:
-        """Validate audio file before processing"""
+    async def _aprepare_job(self, file_path: str, job_id: int, already_closed: bool = False) -> Optional[Dict[str, Any]]:
+        """Async _prepare_job: the duration is read while Deepgram transcribes"""
+        job = await asyncio.to_thread(self._resolve_job, file_path, job_id, already_closed)
+        if job is None:
+            return None
+        job['transcript'], job['duration_minutes'] = await asyncio.gather(
+            asyncio.to_thread(self._transcribe, file_path, job_id),
+            asyncio.to_thread(self._duration_minutes, file_path, job_id),
+        )
+        return job
+    
+    def _resolve_job(self, file_path: str, job_id: int, already_closed: bool = False) -> Optional[Dict[str, Any]]:
+        """Validate the file and resolve its folder prompts; None (job marked failed) if validation fails"""
+        # Validate file
+        if not self._validate_file(file_path, job_id, already_closed=already_closed):
+            self.db.update_job_status(job_id, 'failed', 'File validation failed')
+            return None
+        
+        # Resolve folder-specific prompts independently
+        sum_overrides, sum_body, sum_path = resolve_folder_prompt(file_path, 'summary', self.config)
+        name_overrides, name_body, name_path = resolve_folder_prompt(file_path, 'naming', self.config)
+        val_overrides, val_body, val_path = resolve_folder_prompt(file_path, 'filename-validation', self.config)
+        if sum_path:
+            log_info(f"Using folder summary prompt: {sum_path} (len={len(sum_body)})", job_id)
+        if name_path:
+            log_info(f"Using folder naming prompt: {name_path} (len={len(name_body)})", job_id)
+        if val_path:
+            log_info(f"Using folder validation prompt: {val_path} (len={len(val_body)})", job_id)
+        
+        return {
+            'file_path': file_path,
+            'filename': os.path.basename(file_path),
+            'sum_overrides': sum_overrides,
+            'sum_body': sum_body,
+            'name_overrides': name_overrides,
+            'name_body': name_body,
+            'val_overrides': val_overrides,
+            'val_body': val_body,
+        }
+    
+    def _transcribe(self, file_path: str, job_id: int) -> str:
+        """Step 1: Transcribe with Deepgram"""
+        log_info("Step 1: Transcribing audio with Deepgram", job_id)
+        transcript = self.deepgram.transcribe_file(file_path, job_id)
+        
+        if not transcript or transcript.strip() == "":
+            raise Exception("Empty transcript received from Deepgram")
+        
+        # Shown on the dashboard while the OpenAI steps run
+        self.db.update_job_transcript(job_id, len(transcript))
+        return transcript
+    
+    def _duration_minutes(self, file_path: str, job_id: int) -> Optional[int]:
+        """Step 2: Extract duration (needed by the OpenAI prompts)"""
+        log_info("Step 2: Extracting duration", job_id)
+        metadata_info = self.file_namer._extract_metadata(file_path, job_id, duration_only=True)
+        duration_minutes = None
+        if metadata_info.get('duration'):
+            duration_minutes = max(1, round(metadata_info['duration'] / 60))
+            log_info(f"Extracted duration: {duration_minutes} minutes", job_id)
+        return duration_minutes
+    
+    def _complete_job(self, job: Dict[str, Any], job_id: int, processed_content: str, naming_info: Dict[str, Any]):
+        """Name, save and file away a job whose OpenAI results are in (steps 5-6)"""
+        file_path = job['file_path']
+        transcript = job['transcript']
+        
+        # Step 5: Generate intelligent filename
+        log_info("Step 5: Generating intelligent filename", job_id)
+        
+        suggested_filename, confidence = self.file_namer.generate_name(
+            file_path, transcript, naming_info, job_id
+        )
+        
+        # Step 5: Save output
+        log_info("Step 5: Saving processed output", job_id)
+        output_file = self._save_output(
+            processed_content, transcript, suggested_filename, job_id
+        )
+        
+        # Step 6: Move processed file
+        log_info("Step 6: Moving processed file", job_id)
+        self._move_processed_file(file_path, job_id)
+        
+        # Mark job as completed together with its naming and output information in one write,
+        # so a job never has results while still showing as processing
+        self.db.update_job_status(
+            job_id,
+            'completed',
+            suggested_filename=suggested_filename,
+            final_filename=suggested_filename,
+            naming_confidence=confidence,
+            manual_override=False,
+            output_file=output_file,
+        )
+        log_info(f"Successfully completed processing for: {job['filename']}", job_id)
+    
+    def _fail_job(self, file_path: str, job_id: Optional[int], error: Exception):
+        """Record a failed job and move its file to the error folder"""
+        error_msg = f"Processing failed: {str(error)}"
+        log_error(error_msg, job_id)
+        
+        if job_id:
+            self.db.update_job_status(job_id, 'failed', error_msg)
+        
+        # Move file to error folder
         try:
-            # Check if file exists
-            if not os.path.exists(file_path):
+            self._move_error_file(file_path, job_id)
+        except Exception as move_error:
+            log_error(f"Failed to move error file: {move_error}", job_id)
+    
+    def _validate_file(self, file_path: str, job_id: Optional[int] = None, *, already_closed: bool = False) -> bool:
+        """Validate audio file before processing (the write check is skipped once the upload is known complete)"""
+        try:
+            # Check if file exists; one stat answers existence and size
+            try:
+                file_size = os.stat(file_path).st_size
+            except FileNotFoundError:
                 log_error(f"File does not exist: {file_path}", job_id)
                 return False
             
             # Check file size
-            file_size = os.path.getsize(file_path)
             if file_size == 0:
                 log_error(f"File is empty: {file_path}", job_id)
                 return False
             
             # Check file extension
-            supported_formats = self.config.get("processing.supported_formats", [])
             file_ext = os.path.splitext(file_path)[1].lower()
             
-            if file_ext not in supported_formats:
+            if file_ext not in self.config.supported_formats:
                 log_error(f"Unsupported file format: {file_ext}", job_id)
                 return False
             
             # Check if file is still being written (basic check)
-            initial_size = file_size
-            import time
-            time.sleep(1)
-            current_size = os.path.getsize(file_path)
-            
-            if current_size != initial_size:
-                log_warning(f"File appears to be still being written: {file_path}", job_id)
-                return False
+            if not already_closed:
+                time.sleep(1)
+                if os.stat(file_path).st_size != file_size:
+                    log_warning(f"File appears to be still being written: {file_path}", job_id)
+                    return False
             
             log_info(f"File validation passed: {file_path} ({file_size} bytes)", job_id)
             return True
@@ -180,24 +422,17 @@ class AudioProcessor:
                     suggested_filename: str, job_id: Optional[int] = None) -> str:
         """Save processed output to files"""
         try:
-            output_folder = self.config.get("processing.output_folder")
+            output_folder = self._folder('output')
             if not output_folder:
                 raise Exception("Output folder not configured")
             
-            os.makedirs(output_folder, exist_ok=True)
-            
-            # Generate timestamp for uniqueness
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            
             # Save main processed content
             main_filename = f"{suggested_filename}.md"
             main_file_path = os.path.join(output_folder, main_filename)
             
-            # Create comprehensive output
-            full_content = self._create_full_output(processed_content, transcript, suggested_filename)
-            
-            with open(main_file_path, 'w', encoding='utf-8') as f:
-                f.write(full_content)
+            # Write the comprehensive output piece by piece rather than joining it into one string first
+            with open(main_file_path, 'w', encoding='utf-8', buffering=_OUTPUT_BUFSIZE) as f:
+                f.writelines(self._iter_output_chunks(processed_content, transcript, suggested_filename))
             
             log_info(f"Saved processed output to: {main_file_path}", job_id)
             return main_file_path
@@ -206,48 +441,39 @@ class AudioProcessor:
             log_error(f"Error saving output: {e}", job_id)
             raise
     
-    def _create_full_output(self, processed_content: str, transcript: str, filename: str) -> str:
-        """Create comprehensive output document"""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        
+    def _folder(self, name: str) -> Optional[str]:
+        """Processing folder by name; only folders not pre-created at startup are created here"""
+        folder = self.folders.get(name)
+        if folder:
+            return folder
+        folder = self.config.get(f"processing.{name}_folder")
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        return folder
+    
+    def _iter_output_chunks(self, processed_content: str, transcript: str, filename: str) -> Iterator[str]:
+        """Yield the comprehensive output document in order"""
         # The processed_content already contains the full legal summary format
         # We just need to add the full transcript at the end
-        content = f"""{processed_content}
-
----
-
-## Full Transcript
-
-{transcript}
-
----
-
-*This document was automatically generated from audio transcription and AI analysis using Audio Processor v{self.config.get('app.version', '1.0.0')}*
-"""
-        return content
+        yield processed_content
+        yield "\n\n---\n\n## Full Transcript\n\n"
+        yield transcript
+        yield (
+            "\n\n---\n\n"
+            f"*This document was automatically generated from audio transcription and AI analysis using Audio Processor v{self.config.get('app.version', '1.0.0')}*\n"
+        )
     
     def _move_processed_file(self, file_path: str, job_id: Optional[int] = None):
         """Move successfully processed file to processed folder"""
         try:
-            processed_folder = self.config.get("processing.processed_folder")
+            processed_folder = self._folder('processed')
             if not processed_folder:
                 log_warning("Processed folder not configured, keeping file in place", job_id)
                 return
             
-            os.makedirs(processed_folder, exist_ok=True)
-            
-            filename = os.path.basename(file_path)
-            destination = os.path.join(processed_folder, filename)
-            
             # Handle duplicate filenames
-            counter = 1
-            base_name, ext = os.path.splitext(filename)
-            while os.path.exists(destination):
-                new_filename = f"{base_name}_{counter}{ext}"
-                destination = os.path.join(processed_folder, new_filename)
-                counter += 1
-            
-            shutil.move(file_path, destination)
+            destination = _unique_path(processed_folder, os.path.basename(file_path))
+            _move_file(file_path, destination)
             log_info(f"Moved processed file to: {destination}", job_id)
             
         except Exception as e:
@@ -260,25 +486,14 @@ class AudioProcessor:
             if not os.path.exists(file_path):
                 return  # File already moved or doesn't exist
             
-            error_folder = self.config.get("processing.error_folder")
+            error_folder = self._folder('error')
             if not error_folder:
                 log_warning("Error folder not configured, keeping file in place", job_id)
                 return
             
-            os.makedirs(error_folder, exist_ok=True)
-            
-            filename = os.path.basename(file_path)
-            destination = os.path.join(error_folder, filename)
-            
             # Handle duplicate filenames
-            counter = 1
-            base_name, ext = os.path.splitext(filename)
-            while os.path.exists(destination):
-                new_filename = f"{base_name}_{counter}{ext}"
-                destination = os.path.join(error_folder, new_filename)
-                counter += 1
-            
-            shutil.move(file_path, destination)
+            destination = _unique_path(error_folder, os.path.basename(file_path))
+            _move_file(file_path, destination)
             log_info(f"Moved error file to: {destination}", job_id)
             
         except Exception as e:
@@ -286,55 +501,63 @@ class AudioProcessor:
     
     def test_connections(self) -> dict:
         """Test connections to external services"""
-        results = {
-            'deepgram': False,
-            'openai': False,
-            'database': False
-        }
-        
-        try:
-            # Test Deepgram
-            results['deepgram'] = self.deepgram.test_connection()
-        except Exception as e:
-            log_error(f"Deepgram connection test failed: {e}")
+        return run_coroutine(self.atest_connections())
+    
+    async def atest_connections(self) -> dict:
+        """Async test_connections: the three probes run concurrently, and the provider results
+        are reused for a short while so frequent health polls do not hit the providers each time"""
+        results, _ = await self._aprobe_connections()
+        return results
+    
+    async def _aprobe_connections(self) -> tuple:
+        """Connection test results, plus the job stats the database probe read (or its exception)"""
+        cached = self._connections and time.monotonic() - self._connections[0] < _CONNECTIONS_TTL
+        # The database probe is the stats query itself, so it runs every time and its result is reused
+        probes = [asyncio.to_thread(self.db.get_job_stats)]
+        if not cached:
+            probes += [self.deepgram.atest_connection(), self.openai.atest_connection()]
+        stats, *providers = await asyncio.gather(*probes, return_exceptions=True)
         
-        try:
-            # Test OpenAI
-            results['openai'] = self.openai.test_connection()
-        except Exception as e:
-            log_error(f"OpenAI connection test failed: {e}")
+        if cached:
+            results = dict(self._connections[1])
+        else:
+            results = {}
+            for name, label, outcome in (
+                ('deepgram', 'Deepgram', providers[0]),
+                ('openai', 'OpenAI', providers[1]),
+            ):
+                if isinstance(outcome, BaseException):
+                    log_error(f"{label} connection test failed: {outcome}")
+                    results[name] = False
+                else:
+                    results[name] = bool(outcome)
+            self._connections = (time.monotonic(), dict(results))
         
-        try:
-            # Test Database
-            stats = self.db.get_job_stats()
+        if isinstance(stats, BaseException):
+            log_error(f"Database connection test failed: {stats}")
+            results['database'] = False
+        else:
             results['database'] = True
-        except Exception as e:
-            log_error(f"Database connection test failed: {e}")
-        
-        return results
+        return results, stats
     
     def get_health_status(self) -> dict:
         """Get overall system health status"""
-        connections = self.test_connections()
-        stats = self.db.get_job_stats()
-        
-        # Check folder accessibility
-        folders = {
-            'watch': self.config.get("processing.watch_folder"),
-            'processed': self.config.get("processing.processed_folder"),
-            'error': self.config.get("processing.error_folder"),
-            'output': self.config.get("processing.output_folder")
-        }
-        
-        folder_status = {}
-        for name, path in folders.items():
-            try:
-                if path and os.path.exists(path) and os.access(path, os.W_OK):
-                    folder_status[name] = True
-                else:
-                    folder_status[name] = False
-            except:
-                folder_status[name] = False
+        return run_coroutine(self.aget_health_status())
+    
+    async def aget_health_status(self) -> dict:
+        """Async get_health_status: connection probes, job stats and folder checks run together"""
+        # Check folder accessibility (one scandir per shared parent plus an access check each)
+        (connections, stats), folder_status = await asyncio.gather(
+            self._aprobe_connections(),
+            asyncio.to_thread(probe_folders, {
+                'watch': self.config.get("processing.watch_folder"),
+                'processed': self.config.get("processing.processed_folder"),
+                'error': self.config.get("processing.error_folder"),
+                'output': self.config.get("processing.output_folder")
+            }),
+        )
+        if isinstance(stats, BaseException):
+            raise stats
         
         return {
             'connections': connections,
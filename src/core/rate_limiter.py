@@ -0,0 +1,76 @@
+import time
+import asyncio
+import threading
+from functools import lru_cache
+from typing import Optional
+
+try:
+    import tiktoken
+except ImportError:  # optional: token counts fall back to a characters-per-token estimate
+    tiktoken = None
+
+# Used for models tiktoken does not know yet
+_FALLBACK_ENCODING = "o200k_base"
+
+@lru_cache(maxsize=16)
+def _encoding(model: str):
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding(_FALLBACK_ENCODING)
+
+def estimate_tokens(text: str, model: str) -> int:
+    """Prompt tokens for text under model's tokenizer (about 4 characters per token without tiktoken)"""
+    if tiktoken is None:
+        return len(text) // 4 + 1
+    return len(_encoding(model).encode(text, disallowed_special=()))
+
+class _Bucket:
+    """Token bucket refilled continuously at capacity per minute"""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def take(self, amount: float, now: float) -> float:
+        """Reserve amount (the level may go negative) and return how long the caller must wait for it"""
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+        # A single request larger than the bucket would otherwise never fit
+        self.level -= min(amount, self.capacity)
+        return max(0.0, -self.level / self.rate)
+
+class RateLimiter:
+    """Preemptive requests-per-minute and tokens-per-minute limiter shared by every thread and event loop.
+    Capacity is reserved up front, so callers queue in arrival order instead of racing into 429s."""
+
+    def __init__(self, rpm: Optional[float] = None, tpm: Optional[float] = None):
+        self._requests = _Bucket(rpm) if rpm else None
+        self._tokens = _Bucket(tpm) if tpm else None
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens: int, requests: int) -> float:
+        with self._lock:
+            now = time.monotonic()
+            wait = 0.0
+            if self._requests:
+                wait = self._requests.take(requests, now)
+            if self._tokens:
+                wait = max(wait, self._tokens.take(tokens, now))
+            return wait
+
+    def acquire(self, tokens: int, requests: int = 1) -> float:
+        """Block until the request fits the limits; returns the time waited"""
+        wait = self._reserve(tokens, requests)
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    async def aacquire(self, tokens: int, requests: int = 1) -> float:
+        """Async acquire: the wait yields to the event loop"""
+        wait = self._reserve(tokens, requests)
+        if wait:
+            await asyncio.sleep(wait)
+        return wait
@@ -0,0 +1,80 @@
+import os
+import time
+import sqlite3
+import threading
+from typing import Dict, Optional
+from src.utils import log_error
+
+class SQLiteLRUCache:
+    """Persistent string cache in one SQLite table, evicting the least recently used entries beyond
+    max_entries and, when a ttl is given, entries older than ttl seconds"""
+    
+    def __init__(self, path: str, table: str, max_entries: int = 1000, ttl: Optional[float] = None, label: str = "Cache"):
+        self.path = os.path.expanduser(path)
+        self.table = table
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.label = label
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        columns = [row[1] for row in self._conn.execute(f'PRAGMA table_info({table})')]
+        if columns and columns != ['key', 'value', 'expires_at', 'last_used']:
+            # Written by an older layout (CURRENT_TIMESTAMP recency); a cache can simply be rebuilt
+            self._conn.execute(f'DROP TABLE {table}')
+        # last_used is time.time(): CURRENT_TIMESTAMP's one-second resolution ties entries used in the same second
+        self._conn.execute(f'''
+            CREATE TABLE IF NOT EXISTS {table} (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                expires_at REAL,
+                last_used REAL NOT NULL
+            )
+        ''')
+        self._conn.execute(f'CREATE INDEX IF NOT EXISTS idx_{table}_last_used ON {table}(last_used)')
+    
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached value for key, or None on a miss or once it has expired"""
+        now = time.time()
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    f'SELECT value FROM {self.table} WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)',
+                    (key, now)
+                ).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+                self.hits += 1
+                self._conn.execute(f'UPDATE {self.table} SET last_used = ? WHERE key = ?', (now, key))
+                return row[0]
+        except sqlite3.Error as e:
+            log_error(f"{self.label} lookup failed: {e}")
+            return None
+    
+    def put(self, key: str, value: str, ttl: Optional[float] = None):
+        """Store a value (expiring after ttl seconds, default self.ttl), evicting expired and least recently used entries"""
+        ttl = self.ttl if ttl is None else ttl
+        now = time.time()
+        try:
+            with self._lock:
+                self._conn.execute(
+                    f'INSERT OR REPLACE INTO {self.table} (key, value, expires_at, last_used) VALUES (?, ?, ?, ?)',
+                    (key, value, now + ttl if ttl else None, now)
+                )
+                self._conn.execute(f'DELETE FROM {self.table} WHERE expires_at <= ?', (now,))
+                self._conn.execute(f'''
+                    DELETE FROM {self.table} WHERE key IN (
+                        SELECT key FROM {self.table} ORDER BY last_used DESC LIMIT -1 OFFSET ?
+                    )
+                ''', (self.max_entries,))
+        except sqlite3.Error as e:
+            log_error(f"{self.label} store failed: {e}")
+    
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters since startup"""
+        return {'cache_hits': self.hits, 'cache_misses': self.misses}
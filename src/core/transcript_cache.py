@@ -0,0 +1,19 @@
+import json
+import hashlib
+from typing import Dict, Any, Optional
+from src.core.sqlite_cache import SQLiteLRUCache
+
+DEFAULT_CACHE_PATH = "~/.cache/transcription/transcripts.db"
+
+class TranscriptCache(SQLiteLRUCache):
+    """Persistent transcript cache keyed by audio content hash plus transcription options"""
+    
+    def __init__(self, path: Optional[str] = None, max_entries: int = 1000):
+        super().__init__(path or DEFAULT_CACHE_PATH, 'transcripts', max_entries, label="Transcript cache")
+    
+    @staticmethod
+    def make_key(audio, options: Dict[str, Any]) -> str:
+        """SHA-256 of the audio bytes (any buffer, e.g. an mmap) combined with a hash of the options that shape the transcript"""
+        content_hash = hashlib.sha256(audio).hexdigest()
+        options_hash = hashlib.sha256(json.dumps(options, sort_keys=True).encode()).hexdigest()[:16]
+        return f"{content_hash}:{options_hash}"
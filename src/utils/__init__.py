@@ -1,7 +1,28 @@
+import re
+from functools import lru_cache
+import yaml
 from .config_manager import ConfigManager
-from .logger import get_logger, log_info, log_error, log_warning, log_debug
+from .logger import get_logger, log_info, log_error, log_warning, log_debug, log_enabled
+from .background_loop import run_coroutine, close_on_exit
 
-__all__ = ['ConfigManager', 'get_logger', 'log_info', 'log_error', 'log_warning', 'log_debug']
+__all__ = ['ConfigManager', 'get_logger', 'log_info', 'log_error', 'log_warning', 'log_debug', 'log_enabled',
+           'run_coroutine', 'close_on_exit']
+
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # optional: PyYAML built without libyaml parses in pure Python
+    from yaml import SafeLoader as _YamlLoader
+
+# Leading '---' block of a prompt file: front-matter up to the first line starting with '---'
+_FRONT_MATTER = re.compile(r'---(.*?)\n---', re.DOTALL)
+
+
+@lru_cache(maxsize=512)
+def _dir_files(directory: str, mtime_ns: int) -> frozenset:
+    """Names of the regular files in one version of a directory; adding or removing a file changes its mtime"""
+    import os
+    with os.scandir(directory) as it:
+        return frozenset(entry.name for entry in it if entry.is_file())
 
 
 def find_prompt_file(start_path: str, candidate_names: list[str]):
@@ -13,10 +34,14 @@ def find_prompt_file(start_path: str, candidate_names: list[str]):
         return None
     directory = os.path.dirname(os.path.abspath(start_path))
     while True:
+        # One stat per level; the listing is only re-read after the directory changes
+        try:
+            names = _dir_files(directory, os.stat(directory).st_mtime_ns)
+        except OSError:
+            names = frozenset()
         for name in candidate_names or []:
-            candidate = os.path.join(directory, name)
-            if os.path.isfile(candidate):
-                return candidate
+            if name in names:
+                return os.path.join(directory, name)
         parent = os.path.dirname(directory)
         if parent == directory:
             break
@@ -53,15 +78,10 @@ def load_prompt_overrides(prompt_path: str):
     try:
         with open(prompt_path, 'r', encoding='utf-8') as f:
             content = f.read()
-        if content.startswith('---'):
-            end = content.find('\n---', 3)
-            if end != -1:
-                import yaml
-                fm_text = content[3:end].strip()
-                overrides = yaml.safe_load(fm_text) or {}
-                body = content[end+4:].lstrip('\n')
-            else:
-                body = content
+        match = _FRONT_MATTER.match(content)
+        if match:
+            overrides = yaml.load(match.group(1).strip(), Loader=_YamlLoader) or {}
+            body = content[match.end():].lstrip('\n')
         else:
             body = content
     except Exception:
@@ -70,6 +90,13 @@ def load_prompt_overrides(prompt_path: str):
     return overrides, body
 
 
+@lru_cache(maxsize=32)
+def _read_text(path: str, mtime_ns: int, size: int) -> str:
+    """File contents for one version of a file; an edit changes mtime/size and so the cache key"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
 def read_prompt_file(kind: str, config: ConfigManager | None = None) -> str:
     """Read a prompt markdown file from prompts/{kind}.md; fallback to config if missing.
     Recognized kinds: 'summary', 'naming', 'filename-validation'.
@@ -83,9 +110,10 @@ def read_prompt_file(kind: str, config: ConfigManager | None = None) -> str:
     fname = mapping.get(kind, f"{kind}.md")
     path = os.path.join(os.getcwd(), 'prompts', fname)
     try:
-        if os.path.isfile(path):
-            with open(path, 'r', encoding='utf-8') as f:
-                return f.read()
+        # One stat per call; the template itself is only re-read after it changes on disk
+        st = os.stat(path)
+        if os.path.stat.S_ISREG(st.st_mode):
+            return _read_text(path, st.st_mtime_ns, st.st_size)
     except Exception:
         pass
     # Fallback to config keys for backward compatibility
@@ -97,3 +125,37 @@ def read_prompt_file(kind: str, config: ConfigManager | None = None) -> str:
     if kind == 'filename-validation':
         return cfg.get('prompts.filename_validation', '')
     return ''
+
+
+def probe_folders(folders: dict) -> dict:
+    """Check which configured folders exist as directories and are writable.
+    Folders sharing a parent are resolved with one os.scandir of that parent,
+    so each folder costs a cached DirEntry lookup plus a single os.access.
+    Returns {name: bool}.
+    """
+    import os
+    status = {name: False for name in folders}
+    by_parent = {}
+    for name, path in folders.items():
+        if not path:
+            continue
+        path = os.path.abspath(path)
+        if path == os.path.dirname(path):
+            # Filesystem root has no parent entry to scan
+            status[name] = os.path.isdir(path) and os.access(path, os.W_OK)
+            continue
+        by_parent.setdefault(os.path.dirname(path), []).append((name, path))
+    for parent, members in by_parent.items():
+        wanted = {os.path.basename(path) for _, path in members}
+        try:
+            with os.scandir(parent) as it:
+                entries = {entry.name: entry for entry in it if entry.name in wanted}
+        except OSError:
+            continue
+        for name, path in members:
+            entry = entries.get(os.path.basename(path))
+            try:
+                status[name] = bool(entry and entry.is_dir() and os.access(path, os.W_OK))
+            except OSError:
+                status[name] = False
+    return status
@@ -0,0 +1,41 @@
+import asyncio
+import atexit
+import threading
+from typing import Any, Awaitable, Callable, Coroutine, List
+
+# One event loop for the whole process, started on first use. Loop-bound clients (AsyncOpenAI, the
+# async Deepgram transport) created on it live as long as the process, so synchronous callers on any
+# thread share their warm connection pools instead of building and tearing them down per call.
+_loop = None
+_thread = None
+_loop_lock = threading.Lock()
+_exit_callbacks: List[Callable[[], Awaitable[Any]]] = []
+
+def run_coroutine(coro: Coroutine) -> Any:
+    """Run coro on the background event loop and block the calling thread until it finishes"""
+    global _loop, _thread
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            _thread = threading.Thread(target=_loop.run_forever, name="async-loop", daemon=True)
+            _thread.start()
+            atexit.register(_close_clients)
+        loop = _loop
+    if threading.current_thread() is _thread:
+        coro.close()
+        raise RuntimeError("run_coroutine called from the background loop itself; await the coroutine instead")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+def close_on_exit(aclose: Callable[[], Awaitable[Any]]):
+    """Await aclose() on the background loop at exit, once the worker threads using it have finished"""
+    with _loop_lock:
+        _exit_callbacks.append(aclose)
+
+def _close_clients():
+    # atexit runs after the interpreter has joined non-daemon threads (the watcher's pool workers),
+    # so no request is still using the clients being closed
+    for aclose in _exit_callbacks:
+        try:
+            asyncio.run_coroutine_threadsafe(aclose(), _loop).result(timeout=5)
+        except Exception:
+            pass
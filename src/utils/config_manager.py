@@ -1,14 +1,24 @@
 import os
 import yaml
-from typing import Dict, Any
+from typing import Dict, Any, FrozenSet
 from dotenv import load_dotenv
 import re
 
+# {{VAR}} placeholders filled from the environment
+_ENV_PLACEHOLDER = re.compile(r'\{\{(\w+)\}\}')
+
+def _env_value(match: re.Match) -> str:
+    # Keep placeholder (as {{$VAR}}) if env var not found
+    return os.getenv(match.group(1), f"{{{{${match.group(1)}}}}}")
+
 class ConfigManager:
     def __init__(self, config_path: str = "config/config.yaml", env_path: str = "config/.env"):
         self.config_path = config_path
         self.env_path = env_path
         self._config = None
+        self._flat: Dict[str, Any] = {}
+        # Lower-cased audio extensions from processing.supported_formats, for O(1) membership tests
+        self.supported_formats: FrozenSet[str] = frozenset()
         self._load_config()
     
     def _load_config(self):
@@ -22,6 +32,22 @@ class ConfigManager:
         
         # Replace placeholders with environment variables
         self._config = self._replace_env_vars(self._config)
+        self._index()
+    
+    def _index(self):
+        """Rebuild the lookups derived from the loaded configuration"""
+        self._flat = self._flatten(self._config)
+        self.supported_formats = frozenset(ext.lower() for ext in self._flat.get("processing.supported_formats") or [])
+    
+    def _flatten(self, obj: Any, prefix: str = "") -> Dict[str, Any]:
+        """Map every dotted key path (including intermediate sections) to its value"""
+        flat = {}
+        if isinstance(obj, dict):
+            for key, value in obj.items():
+                path = f"{prefix}{key}"
+                flat[path] = value
+                flat.update(self._flatten(value, f"{path}."))
+        return flat
     
     def _replace_env_vars(self, obj: Any) -> Any:
         """Recursively replace {{VAR}} placeholders with environment variables"""
@@ -30,27 +56,23 @@ class ConfigManager:
         elif isinstance(obj, list):
             return [self._replace_env_vars(item) for item in obj]
         elif isinstance(obj, str):
-            # Replace {{VAR}} with environment variable
-            pattern = r'\{\{(\w+)\}\}'
-            matches = re.findall(pattern, obj)
-            for match in matches:
-                env_value = os.getenv(match, f"{{{{${match}}}}}")  # Keep placeholder if env var not found
-                obj = obj.replace(f"{{{{{match}}}}}", env_value)
-            return obj
+            # Replace {{VAR}} with environment variable in one pass
+            return _ENV_PLACEHOLDER.sub(_env_value, obj)
         else:
             return obj
     
     def get(self, key_path: str, default: Any = None) -> Any:
         """Get configuration value using dot notation (e.g., 'app.name')"""
+        return self._flat.get(key_path, default)
+    
+    def set(self, key_path: str, value: Any):
+        """Override a configuration value in memory using dot notation"""
         keys = key_path.split('.')
-        value = self._config
-        
-        try:
-            for key in keys:
-                value = value[key]
-            return value
-        except (KeyError, TypeError):
-            return default
+        section = self._config
+        for key in keys[:-1]:
+            section = section.setdefault(key, {})
+        section[keys[-1]] = value
+        self._index()
     
     def get_all(self) -> Dict[str, Any]:
         """Get all configuration"""
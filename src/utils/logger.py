@@ -1,18 +1,28 @@
+import atexit
 import logging
 import logging.handlers
 import os
-from datetime import datetime
+import queue
+import sys
+import threading
+import time
+from functools import lru_cache
 from typing import Optional
 from src.utils.config_manager import ConfigManager
 
 class Logger:
     _instance = None
     _logger = None
+    _instance_lock = threading.Lock()
     
     def __new__(cls):
         if cls._instance is None:
-            cls._instance = super(Logger, cls).__new__(cls)
-            cls._instance._setup_logger()
+            with cls._instance_lock:
+                if cls._instance is None:
+                    # Publish only once set up, so threads logging concurrently never see a bare instance
+                    instance = super(Logger, cls).__new__(cls)
+                    instance._setup_logger()
+                    cls._instance = instance
         return cls._instance
     
     def _setup_logger(self):
@@ -30,7 +40,7 @@ class Logger:
         self._logger.handlers.clear()
         
         # File handler with rotation
-        log_file = f"logs/audio_processor_{datetime.now().strftime('%Y%m%d')}.log"
+        log_file = f"logs/audio_processor_{time.strftime('%Y%m%d')}.log"
         max_bytes = self._parse_size(config.get("logging.max_file_size", "10MB"))
         backup_count = config.get("logging.backup_count", 5)
         
@@ -40,21 +50,40 @@ class Logger:
             backupCount=backup_count
         )
         
-        # Console handler
-        console_handler = logging.StreamHandler()
-        
         # Formatter
         formatter = logging.Formatter(
             '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
         )
         
         file_handler.setFormatter(formatter)
-        console_handler.setFormatter(formatter)
+        handlers = [file_handler]
+        
+        # Console handler; when stderr is redirected (e.g. the LaunchAgent's log file) it would only
+        # duplicate the log file, so it is kept for terminals and debug runs
+        if sys.stderr.isatty() or self._logger.isEnabledFor(logging.DEBUG):
+            console_handler = logging.StreamHandler()
+            console_handler.setFormatter(formatter)
+            handlers.append(console_handler)
+        
+        # Callers only enqueue the record; a background listener does the file and console I/O.
+        # SimpleQueue is unbounded and its put is a lock-free C call, unlike Queue's condition variables
+        log_queue = queue.SimpleQueue()
+        self._listener = logging.handlers.QueueListener(
+            log_queue, *handlers, respect_handler_level=True
+        )
+        self._logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        self._listener.start()
+        atexit.register(self._listener.stop)
         
-        self._logger.addHandler(file_handler)
-        self._logger.addHandler(console_handler)
+        # Bound once so the log_* helpers skip a getattr per call
+        self._info = self._logger.info
+        self._error = self._logger.error
+        self._warning = self._logger.warning
+        self._debug = self._logger.debug
     
-    def _parse_size(self, size_str: str) -> int:
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _parse_size(size_str: str) -> int:
         """Parse size string like '10MB' to bytes"""
         size_str = size_str.upper()
         if size_str.endswith('KB'):
@@ -70,6 +99,10 @@ class Logger:
         """Get the configured logger instance"""
         return self._logger
     
+    def is_enabled(self, level: str) -> bool:
+        """Check whether messages at the given level would be emitted"""
+        return self._logger.isEnabledFor(getattr(logging, level.upper(), logging.INFO))
+    
     def log_job_event(self, job_id: Optional[int], level: str, message: str):
         """Log an event with job correlation"""
         if job_id:
@@ -78,23 +111,30 @@ class Logger:
         log_method = getattr(self._logger, level.lower(), self._logger.info)
         log_method(message)
 
+def _job_message(message: str, job_id: Optional[int]) -> str:
+    return f"[Job {job_id}] {message}" if job_id else message
+
 # Convenience functions
 def get_logger():
     """Get the singleton logger instance"""
     return Logger().get_logger()
 
+def log_enabled(level: str = "debug") -> bool:
+    """Check a level before building an expensive log message"""
+    return Logger().is_enabled(level)
+
 def log_info(message: str, job_id: Optional[int] = None):
     """Log info message"""
-    Logger().log_job_event(job_id, "info", message)
+    Logger()._info(_job_message(message, job_id))
 
 def log_error(message: str, job_id: Optional[int] = None):
     """Log error message"""
-    Logger().log_job_event(job_id, "error", message)
+    Logger()._error(_job_message(message, job_id))
 
 def log_warning(message: str, job_id: Optional[int] = None):
     """Log warning message"""
-    Logger().log_job_event(job_id, "warning", message)
+    Logger()._warning(_job_message(message, job_id))
 
 def log_debug(message: str, job_id: Optional[int] = None):
     """Log debug message"""
-    Logger().log_job_event(job_id, "debug", message)
+    Logger()._debug(_job_message(message, job_id))
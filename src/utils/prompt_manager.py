@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Dict, Tuple, Optional
+from typing import Dict, Literal, Tuple, Optional
 from .config_manager import ConfigManager
 
 
@@ -12,7 +12,11 @@ class _SafeDict(dict):
 def build_transcript_summary(transcript: str, max_len: int = 500) -> str:
     if not transcript:
         return ''
-    return transcript[:max_len] + '...' if len(transcript) > max_len else transcript
+    if len(transcript) <= max_len:
+        return transcript
+    # End at a line break near the limit (within 20% either side) so the excerpt stops between utterances
+    cut = transcript.find('\n', max_len * 4 // 5, max_len * 6 // 5)
+    return transcript[:cut if cut != -1 else max_len] + '...'
 
 
 def safe_format(template: str, placeholders: Dict[str, object]) -> str:
@@ -31,14 +35,14 @@ def combine_prompt(
     mode: str,
     section_heading: str,
 ) -> str:
-    base = safe_format(base_template or '', placeholders)
     if not folder_body:
-        return base
+        return safe_format(base_template or '', placeholders)
     folder = safe_format(folder_body, placeholders)
     m = (mode or 'replace').lower()
     if m == 'append':
+        base = safe_format(base_template or '', placeholders)
         return f"{base}\n\n# {section_heading}\n{folder}\n"
-    # default replace
+    # default replace: the base template is not used, so it is never formatted
     return folder
 
 
@@ -46,12 +50,17 @@ def resolve_openai_params(
     *,
     config: ConfigManager,
     overrides: Optional[Dict[str, object]] = None,
+    step: Optional[Literal['summary', 'naming', 'validation']] = None,
 ) -> Tuple[str, float, int]:
     ov = (overrides or {}).get('openai', {}) if isinstance(overrides, dict) else {}
+    # openai.<step>.* (e.g. a small model and output cap for the filename steps) falls back to openai.*
+    def setting(name: str, default: object) -> object:
+        value = config.get(f'openai.{step}.{name}') if step else None
+        return config.get(f'openai.{name}', default) if value is None else value
     # Single source of truth for model: config.yaml
-    model = config.get('openai.model', 'gpt-4o')
-    temperature = ov.get('temperature', config.get('openai.temperature', 0.7))
-    max_tokens = config.get('openai.max_tokens', 2000)
+    model = setting('model', 'gpt-4o')
+    temperature = ov.get('temperature', setting('temperature', 0.7))
+    max_tokens = setting('max_tokens', 2000)
     try:
         temperature = float(temperature)
     except Exception:
@@ -1,14 +1,24 @@
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, FileResponse
+from fastapi.responses import HTMLResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
+from typing import AsyncIterator, Awaitable, Callable, List, Optional, Dict, Any
 import os
+import gzip
+import time
+import asyncio
 from datetime import datetime
+from functools import lru_cache
+
+try:
+    import brotli
+except ImportError:  # optional: pages are then sent gzip-compressed (or plain)
+    brotli = None
 
 from src.core import Database, AudioProcessor, FileMonitor
-from src.utils import ConfigManager, log_info, log_error
+from src.utils import ConfigManager, log_info, log_error, probe_folders
 
 # Pydantic models for API
 class JobResponse(BaseModel):
@@ -23,6 +33,13 @@ class JobResponse(BaseModel):
     final_filename: Optional[str] = None
     naming_confidence: Optional[float] = None
 
+class LogResponse(BaseModel):
+    id: int
+    job_id: Optional[int] = None
+    level: str
+    message: str
+    timestamp: str
+
 class StatsResponse(BaseModel):
     total: int
     status_counts: Dict[str, int]
@@ -35,6 +52,11 @@ class HealthResponse(BaseModel):
     folders: Dict[str, bool]
     stats: StatsResponse
 
+class DashboardResponse(BaseModel):
+    health: HealthResponse
+    stats: StatsResponse
+    jobs: List[JobResponse]
+
 class ProcessFileRequest(BaseModel):
     file_path: str
 
@@ -47,8 +69,136 @@ class SettingsRequest(BaseModel):
     error_folder: Optional[str] = None
     output_folder: Optional[str] = None
 
-def create_app() -> FastAPI:
-    """Create and configure the FastAPI application"""
+class _RecentResult:
+    """Last result of an async computation, reused for ttl seconds.
+    Callers arriving while it is being recomputed wait for that one run instead of starting their own."""
+    
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._value = None
+        self._at = 0.0
+        self._lock = asyncio.Lock()
+    
+    def _fresh(self) -> bool:
+        return self._value is not None and time.monotonic() - self._at < self.ttl
+    
+    async def get(self, compute: Callable[[], Awaitable[Any]]) -> Any:
+        if self._fresh():
+            return self._value
+        async with self._lock:
+            if not self._fresh():
+                self._value = await compute()
+                self._at = time.monotonic()
+            return self._value
+    
+    def invalidate(self):
+        """Drop the cached result so the next caller recomputes it (safe from any thread)"""
+        self._at = float('-inf')
+
+class _JobEvents:
+    """Server-sent event streams that are told when the jobs table changes.
+    notify() may be called from any thread; the streams run in the web server's event loop."""
+    KEEPALIVE = 15  # seconds between comment lines that keep idle connections open
+    
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._waiting: set = set()
+    
+    def notify(self):
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self._wake)
+    
+    def _wake(self):
+        for changed in self._waiting:
+            changed.set()
+    
+    async def stream(self) -> AsyncIterator[str]:
+        """One client's events; a burst of changes while it waits becomes a single event"""
+        self._loop = asyncio.get_running_loop()
+        changed = asyncio.Event()
+        self._waiting.add(changed)
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                try:
+                    await asyncio.wait_for(changed.wait(), self.KEEPALIVE)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                changed.clear()
+                yield "event: jobs\ndata: {}\n\n"
+        finally:
+            self._waiting.discard(changed)
+
+class _GZipExceptEvents(GZipMiddleware):
+    """GZipMiddleware that passes /api/events through untouched. Starlette releases before 0.46
+    (which fastapi>=0.104 still allows) compress text/event-stream too, and the compressor
+    buffers each small event until it has a block to emit, so the browser sees nothing."""
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] == "/api/events":
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+# Static pages served from this package
+_WEB_DIR = os.path.dirname(__file__)
+
+@lru_cache(maxsize=8)
+def _page_encodings(path: str, mtime_ns: int) -> Dict[str, bytes]:
+    """One version of a page by content coding, compressed once; editing the file changes its mtime"""
+    with open(path, 'rb') as f:
+        body = f.read()
+    encodings = {'identity': body, 'gzip': gzip.compress(body, compresslevel=9)}
+    if brotli is not None:
+        encodings['br'] = brotli.compress(body, quality=11)
+    return encodings
+
+def _accepted_encodings(accept_encoding: str) -> set:
+    """Content codings an Accept-Encoding header allows (q=0 means refused)"""
+    accepted = set()
+    for part in accept_encoding.split(','):
+        coding, *params = part.split(';')
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if q > 0:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+def _html_page(name: str, accept_encoding: str = '') -> Optional[HTMLResponse]:
+    """The named page from memory (one stat per request), in the best precompressed coding the client
+    accepts, or None if the file is missing"""
+    path = os.path.join(_WEB_DIR, name)
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    encodings = _page_encodings(path, mtime_ns)
+    accepted = _accepted_encodings(accept_encoding)
+    for coding in ('br', 'gzip'):
+        if coding in encodings and coding in accepted:
+            # GZipMiddleware leaves a response that already has a Content-Encoding alone (Vary included)
+            return HTMLResponse(encodings[coding], headers={'Content-Encoding': coding, 'Vary': 'Accept-Encoding'})
+    return HTMLResponse(encodings['identity'])
+
+def _replace_file(path: str, text: str):
+    """Write text to path through a temporary sibling and os.replace, so a crash never leaves it half-written"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def create_app(processor: Optional[AudioProcessor] = None) -> FastAPI:
+    """Create and configure the FastAPI application.
+    processor is the application's existing AudioProcessor, if any; otherwise one is built on first use."""
     
     config = ConfigManager()
     app = FastAPI(
@@ -66,396 +216,139 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
     
+    # Compress the dashboard page and larger JSON responses; the event stream is left uncompressed
+    app.add_middleware(_GZipExceptEvents, minimum_size=1024, compresslevel=6)
+    
     # Initialize components
     db = Database()
-    processor: Optional[AudioProcessor] = None
+    # Single-flight construction of the processor when none was passed in
+    processor_lock = asyncio.Lock()
     
     # Global file monitor instance (will be set by main app)
     file_monitor = None
+    
+    # Every open dashboard tab polls these; bursts share one probe per window
+    recent_health = _RecentResult(10)
+    recent_stats = _RecentResult(15)
+    job_events = _JobEvents()
+    
+    def on_jobs_changed():
+        # Runs in whichever thread wrote the job; the next poll recomputes, then open dashboards reload
+        recent_health.invalidate()
+        recent_stats.invalidate()
+        job_events.notify()
+    
+    Database.add_job_listener(on_jobs_changed)
 
-    def get_processor() -> Optional[AudioProcessor]:
+    async def get_processor() -> Optional[AudioProcessor]:
         nonlocal processor
-        if processor is None:
-            try:
-                processor = AudioProcessor()
-            except Exception as e:
-                # Likely missing API keys; keep as None so admin can configure
-                log_error(f"Processor init failed (likely missing keys): {e}")
-                processor = None
+        if processor is not None:
+            return processor
+        async with processor_lock:
+            if processor is None:
+                try:
+                    # Building the clients and database is blocking; keep it off the event loop
+                    processor = await asyncio.to_thread(AudioProcessor)
+                except Exception as e:
+                    # Likely missing API keys; keep as None so admin can configure
+                    log_error(f"Processor init failed (likely missing keys): {e}")
+                    processor = None
         return processor
     
     @app.get("/", response_class=HTMLResponse)
-    async def root():
+    async def root(request: Request):
         """Serve the main dashboard"""
-        return """
-        <!DOCTYPE html>
-        <html lang=\"en\">
-        <head>
-            <meta charset=\"utf-8\" />
-            <meta name=\"viewport\" content=\"width=device-width, initial-scale=1\" />
-            <title>Audio Processor</title>
-            <link rel="stylesheet" href="https://unpkg.com/@picocss/pico@2/css/pico.min.css" />
-            <style>
-                /* Lightweight, Pico-friendly pills and badges */
-                .brand { display: flex; align-items: center; gap: .5rem; }
-                .brand .app-icon {
-                    display: inline-grid; place-items: center; width: 28px; height: 28px;
-                    border-radius: 8px; background: linear-gradient(135deg,#4c8dff,#7aa8ff); color: #fff;
-                }
-                .brand small { display: block; margin-top: .125rem; }
-                .mini-stats { display: flex; flex-wrap: wrap; gap: .5rem; margin-top: .5rem; align-items: center; }
-                .pill { display: inline-flex; align-items: center; gap: .375rem; padding: .25rem .5rem; border-radius: 999px; border: 1px solid #E5E7EB; background: #fff; font-size: .75rem; color: #334155; }
-                .dot { width: .5rem; height: .5rem; border-radius: 999px; display: inline-block; background: #94A3B8; }
-                .dot-success { background: #22C55E; }
-                .dot-danger { background: #EF4444; }
-                .badge { display: inline-flex; align-items: center; padding: .15rem .5rem; border-radius: 999px; font-size: .75rem; border: 1px solid #E5E7EB; background: #F8FAFC; color: #334155; }
-                .badge-green  { border-color: #BBF7D0; background: #ECFDF5; color: #166534; }
-                .badge-amber  { border-color: #FDE68A; background: #FFFBEB; color: #92400E; }
-                .badge-rose   { border-color: #FECDD3; background: #FFF1F2; color: #9F1239; }
-                .badge-indigo { border-color: #C7D2FE; background: #EEF2FF; color: #3730A3; }
-                .toolbar-row { display: flex; align-items: center; gap: 0.75rem; }
-                .toolbar-row input, .toolbar-row select, .toolbar-row button { 
-                    height: 2.5rem; margin: 0; padding: 0.5rem; box-sizing: border-box; 
-                    border: 1px solid #ccc; border-radius: 0.375rem; font-size: 0.875rem;
-                }
-                .toolbar-row input { flex: 1; }
-                .toolbar-row select { width: 140px; flex-shrink: 0; }
-                .toolbar-row button { flex-shrink: 0; background: #1d4ed8; color: white; cursor: pointer; }
-            </style>
-        </head>
-        <body>
-            <header class="container">
-                <nav>
-                    <ul>
-                        <li>
-                            <div class="brand">
-                                <span class="app-icon">🎵</span>
-                                <div>
-                                    <strong>Audio Processor</strong>
-                                    <small class="secondary">Real-time transcription & smart naming</small>
-                                </div>
-                            </div>
-                        </li>
-                    </ul>
-                    <ul>
-                        <li><a href="/admin" role="button">Admin</a></li>
-                    </ul>
-                </nav>
-                <div id="mini-stats" class="mini-stats"></div>
-            </header>
-            <main class="container">
-                <div class="grid gap-5">
-                    <div class="bg-white border border-neutral-200 rounded-xl shadow-sm">
-                        <div class="px-4 py-4 border-b border-neutral-200">
-                            <div class="toolbar-row">
-                                <input id="search" placeholder="Search filename..." />
-                                <select id="statusFilter">
-                                    <option value="">All statuses</option>
-                                    <option value="completed">Completed</option>
-                                    <option value="processing">Processing</option>
-                                    <option value="failed">Failed</option>
-                                    <option value="pending">Pending</option>
-                                </select>
-                                <button id="refreshBtn">Refresh</button>
-                            </div>
-                        </div>
-                        <div class="w-full overflow-auto">
-                            <table class="w-full text-sm">
-                                <thead class="bg-neutral-50 text-neutral-600 text-xs uppercase">
-                                    <tr>
-                                        <th class="py-2 px-3 text-left w-20 font-medium">ID</th>
-                                        <th class="py-2 px-3 text-left font-medium">Filename</th>
-                                        <th class="py-2 px-3 text-left w-36 font-medium">Status</th>
-                                        <th class="py-2 px-3 text-left w-56 font-medium">Created</th>
-                                        <th class="py-2 px-3 text-left font-medium">Suggested Name</th>
-                                        <th class="py-2 px-3 text-left w-28 font-medium">Confidence</th>
-                                    </tr>
-                                </thead>
-                                <tbody id="jobs-tbody" class="divide-y divide-neutral-100">
-                                    <tr><td colspan="6" class="text-neutral-500 italic py-5 px-3">Loading...</td></tr>
-                                </tbody>
-                            </table>
-                        </div>
-                    </div>
-                    
-                </div>
-            </main>
-            
-            <script>
-                function dbg(msg) {
-                    try {
-                        const el = document.getElementById('debug');
-                        if (el) { el.textContent = String(msg); }
-                        // eslint-disable-next-line no-console
-                        console.log('[UI]', msg);
-                    } catch (_) {}
-                }
-                const state = { jobs: [], stats: null, health: null };
-                const tbody = document.getElementById('jobs-tbody');
-                const searchEl = document.getElementById('search');
-                const filterEl = document.getElementById('statusFilter');
-                const miniStatsEl = document.getElementById('mini-stats');
-                const refreshBtn = document.getElementById('refreshBtn');
-                const statusTabs = document.getElementById('statusTabs');
-
-                if (refreshBtn) refreshBtn.addEventListener('click', () => loadData());
-                if (searchEl) searchEl.addEventListener('input', () => renderJobs());
-                if (filterEl) filterEl.addEventListener('change', () => loadJobs());
-                if (statusTabs) {
-                    statusTabs.addEventListener('click', (e) => {
-                        const btn = e.target.closest('button[data-status]');
-                        if (!btn) return;
-                        const val = btn.getAttribute('data-status') || '';
-                        if (filterEl) filterEl.value = val;
-                        [...statusTabs.querySelectorAll('button')].forEach(b => b.classList.remove('ring-2','ring-sky-300'));
-                        btn.classList.add('ring-2','ring-sky-300');
-                        loadJobs();
-                    });
-                }
-
-                async function loadData() {
-                    try {
-                        dbg('Loading data…');
-                        await Promise.all([loadHealth(), loadStats(), loadJobs()]);
-                        dbg(`Loaded: jobs=${state.jobs?.length || 0}`);
-                    } catch (e) {
-                        dbg(`Load error: ${e && e.message ? e.message : e}`);
-                    }
-                }
-
-                async function loadHealth() {
-                    try {
-                        const res = await fetch('/api/health');
-                        if (!res.ok) throw new Error(`Health ${res.status}`);
-                        state.health = await res.json();
-                        renderHealth();
-                        renderMiniStats();
-                    } catch (e) {
-                        console.error(e);
-                        const hc = document.getElementById('health-content');
-                        if (hc) hc.innerHTML = '<div class="muted">Failed to load health.</div>';
-                        dbg('Health load failed');
-                    }
-                }
-
-                async function loadStats() {
-                    try {
-                        const res = await fetch('/api/stats');
-                        if (!res.ok) throw new Error(`Stats ${res.status}`);
-                        state.stats = await res.json();
-                        renderStats();
-                        renderMiniStats();
-                    } catch (e) {
-                        console.error(e);
-                        const sc = document.getElementById('stats-content');
-                        if (sc) sc.innerHTML = '<div class="muted">Failed to load statistics.</div>';
-                        dbg('Stats load failed');
-                    }
-                }
-
-                async function loadJobs() {
-                    try {
-                        const status = filterEl.value ? `&status=${encodeURIComponent(filterEl.value)}` : '';
-                        const res = await fetch(`/api/jobs?limit=50${status}`);
-                        if (!res.ok) throw new Error(`Jobs ${res.status}`);
-                        state.jobs = await res.json();
-                        renderJobs();
-                        dbg(`Jobs loaded: ${state.jobs && state.jobs.length}`);
-                    } catch (e) {
-                        console.error(e);
-                        tbody.innerHTML = '<tr><td colspan="6" class="muted" style="padding:20px">Failed to load jobs.</td></tr>';
-                        dbg('Jobs load failed');
-                    }
-                }
-
-                function renderMiniStats() {
-                    if (!miniStatsEl) return;
-                    const parts = [];
-                    if (state.health) {
-                        const h = state.health;
-                        const ok = v => v ? 'dot-success' : 'dot-danger';
-                        const pill = (content) => `<span class=\"pill\">${content}</span>`;
-                        parts.push(pill(`<span class=\"dot ${ok(h.healthy)}\"></span>Overall`));
-                        parts.push(pill(`<span class=\"dot ${ok(h.connections.deepgram)}\"></span>Deepgram`));
-                        parts.push(pill(`<span class=\"dot ${ok(h.connections.openai)}\"></span>OpenAI`));
-                        parts.push(pill(`<span class=\"dot ${ok(h.connections.database)}\"></span>Database`));
-                        parts.push(pill(`<span class=\"dot ${ok(h.folders.watch)}\"></span>Watch`));
-                        parts.push(pill(`<span class=\"dot ${ok(h.folders.processed)}\"></span>Processed`));
-                        parts.push(pill(`<span class=\"dot ${ok(h.folders.error)}\"></span>Error`));
-                        parts.push(pill(`<span class=\"dot ${ok(h.folders.output)}\"></span>Output`));
-                    }
-                    if (state.stats) {
-                        const pillPlain = (label, value) => `<span class=\"pill\">${label}: <strong>${value}</strong></span>`;
-                        parts.push(pillPlain('Total', state.stats.total));
-                        parts.push(pillPlain('Today', state.stats.today));
-                        parts.push(pillPlain('Success', `${state.stats.success_rate}%`));
-                    }
-                    miniStatsEl.innerHTML = parts.join(' ');
-                }
-
-                function renderHealth() {
-                    const h = state.health; if (!h) return;
-                    const ok = v => `<span class=\"dot ${v ? 'dot-success' : 'dot-danger'}\"></span>${v ? 'OK' : 'Issue'}`;
-                    const hc = document.getElementById('health-content');
-                    if (hc) hc.innerHTML = `
-                        <div class=\"kpi\"><div>Overall</div><div class=\"value\">${h.healthy ? 'Healthy' : 'Issues Detected'}</div></div>
-                        <div class=\"kpi\"><div>Deepgram</div><div>${ok(h.connections.deepgram)}</div></div>
-                        <div class=\"kpi\"><div>OpenAI</div><div>${ok(h.connections.openai)}</div></div>
-                        <div class=\"kpi\"><div>Database</div><div>${ok(h.connections.database)}</div></div>
-                        <div class=\"kpi\"><div>Watch Folder</div><div>${ok(h.folders.watch)}</div></div>
-                        <div class=\"kpi\"><div>Processed Folder</div><div>${ok(h.folders.processed)}</div></div>
-                        <div class=\"kpi\"><div>Error Folder</div><div>${ok(h.folders.error)}</div></div>
-                        <div class=\"kpi\"><div>Output Folder</div><div>${ok(h.folders.output)}</div></div>
-                    `;
-                }
-
-                function renderStats() {
-                    const s = state.stats; if (!s) return;
-                    const sc = document.getElementById('stats-content');
-                    if (sc) sc.innerHTML = `
-                        <div class=\"kpi\"><div>Total Jobs</div><div class=\"value\">${s.total}</div></div>
-                        <div class=\"kpi\"><div>Today's Jobs</div><div class=\"value\">${s.today}</div></div>
-                        <div class=\"kpi\"><div>Success Rate</div><div class=\"value\">${s.success_rate}%</div></div>
-                        <div class=\"kpi\"><div>Completed</div><div>${s.status_counts.completed || 0}</div></div>
-                        <div class=\"kpi\"><div>Processing</div><div>${s.status_counts.processing || 0}</div></div>
-                        <div class=\"kpi\"><div>Failed</div><div>${s.status_counts.failed || 0}</div></div>
-                        <div class=\"kpi\"><div>Pending</div><div>${s.status_counts.pending || 0}</div></div>
-                    `;
-                }
-
-                function renderJobs() {
-                    const q = (searchEl && searchEl.value) ? searchEl.value.toLowerCase() : '';
-                    const rows = state.jobs
-                        .filter(j => !q || j.filename.toLowerCase().includes(q))
-                        .map(job => {
-                            const created = formatDate(job.created_at);
-                            const conf = job.naming_confidence ? (job.naming_confidence * 100).toFixed(1) + '%' : '-';
-                            return `
-                                <tr class=\"hover:bg-neutral-50 dark:hover:bg-neutral-800/60\">
-                                    <td>${job.id}</td>
-                                    <td class=\"text-neutral-800 dark:text-neutral-100\">${escapeHtml(job.filename)}</td>
-                                    <td><span class=\"${statusBadgeClass(job.status)}\">${job.status}</span></td>
-                                    <td>${created}</td>
-                                    <td class=\"text-neutral-700 dark:text-neutral-300\">${job.suggested_filename ? escapeHtml(job.suggested_filename) : '-'} </td>
-                                    <td>${conf}</td>
-                                </tr>
-                            `;
-                        });
-                    tbody.innerHTML = rows.length ? rows.join('') : `<tr><td colspan=\"6\" class=\"text-gray-500 italic py-5 px-3\">No jobs found.</td></tr>`;
-                }
-
-                function escapeHtml(value) {
-                    try {
-                        const span = document.createElement('span');
-                        span.textContent = value == null ? '' : String(value);
-                        return span.innerHTML;
-                    } catch (_) {
-                        return value == null ? '' : String(value);
-                    }
-                }
-
-                function formatDate(value) {
-                    try {
-                        if (!value) return '-';
-                        // Normalize "YYYY-MM-DD HH:MM:SS" to ISO for Safari
-                        const iso = typeof value === 'string' && value.indexOf(' ') > -1 ? value.replace(' ', 'T') : value;
-                        const d = new Date(iso);
-                        return isNaN(d.getTime()) ? value : d.toLocaleString();
-                    } catch (_) { return value || '-'; }
-                }
-
-                if (document.readyState === 'loading') {
-                    document.addEventListener('DOMContentLoaded', () => {
-                        dbg('DOM ready');
-                        loadData();
-                        setInterval(loadData, 30000);
-                    });
-                } else {
-                    dbg('DOM already ready');
-                    loadData();
-                    setInterval(loadData, 30000);
-                }
-                function statusBadgeClass(s) {
-                    const base = 'badge';
-                    switch ((s || '').toLowerCase()) {
-                        case 'completed':
-                            return base + ' badge-green';
-                        case 'processing':
-                            return base + ' badge-amber';
-                        case 'failed':
-                            return base + ' badge-rose';
-                        case 'pending':
-                        default:
-                            return base + ' badge-indigo';
-                    }
-                }
-            </script>
-        </body>
-        </html>
-        """
+        page = _html_page('dashboard.html', request.headers.get('accept-encoding', ''))
+        if page is None:
+            raise HTTPException(status_code=404, detail="Dashboard not found")
+        return page
 
     @app.get("/admin")
-    async def admin_page():
+    async def admin_page(request: Request):
         """Serve static admin page"""
-        admin_path = os.path.join(os.path.dirname(__file__), 'admin.html')
-        if not os.path.exists(admin_path):
+        page = _html_page('admin.html', request.headers.get('accept-encoding', ''))
+        if page is None:
             raise HTTPException(status_code=404, detail="Admin page not found")
-        return FileResponse(admin_path, media_type='text/html')
+        return page
     
     @app.get("/api/health", response_model=HealthResponse)
     async def get_health():
         """Get system health status"""
         try:
-            # Try full health via processor; fall back if not available
-            p = get_processor()
-            if p is not None:
-                health = p.get_health_status()
-                return HealthResponse(**health)
-            # Fallback health without processor (e.g., keys missing)
-            cfg = ConfigManager()
-            folders = {
-                'watch': cfg.get("processing.watch_folder"),
-                'processed': cfg.get("processing.processed_folder"),
-                'error': cfg.get("processing.error_folder"),
-                'output': cfg.get("processing.output_folder"),
-            }
-            folder_status = {}
-            for name, path in folders.items():
-                try:
-                    folder_status[name] = bool(path and os.path.exists(path) and os.access(path, os.W_OK))
-                except Exception:
-                    folder_status[name] = False
-            stats = db.get_job_stats()
-            return HealthResponse(
-                healthy=False,
-                connections={
-                    'deepgram': False,
-                    'openai': bool(os.getenv('OPENAI_API_KEY')),
-                    'database': True,
-                },
-                folders=folder_status,
-                stats=stats,
-            )
+            return await recent_health.get(compute_health)
         except Exception as e:
             log_error(f"Error getting health status: {e}")
             raise HTTPException(status_code=500, detail="Failed to get health status")
     
+    async def compute_health() -> HealthResponse:
+        # Try full health via processor; fall back if not available
+        p = await get_processor()
+        if p is not None:
+            health = await p.aget_health_status()
+            return HealthResponse(**health)
+        # Fallback health without processor (e.g., keys missing)
+        folders = {
+            'watch': config.get("processing.watch_folder"),
+            'processed': config.get("processing.processed_folder"),
+            'error': config.get("processing.error_folder"),
+            'output': config.get("processing.output_folder"),
+        }
+        # Folder probes are blocking; run them off the event loop beside the (shared) stats query
+        folder_status, stats = await asyncio.gather(
+            asyncio.to_thread(probe_folders, folders),
+            recent_stats.get(compute_stats),
+        )
+        return HealthResponse(
+            healthy=False,
+            connections={
+                'deepgram': False,
+                'openai': bool(os.getenv('OPENAI_API_KEY')),
+                'database': True,
+            },
+            folders=folder_status,
+            stats=stats,
+        )
+    
     @app.get("/api/stats", response_model=StatsResponse)
     async def get_stats():
         """Get processing statistics"""
         try:
-            stats = db.get_job_stats()
-            return StatsResponse(**stats)
+            return await recent_stats.get(compute_stats)
         except Exception as e:
             log_error(f"Error getting stats: {e}")
             raise HTTPException(status_code=500, detail="Failed to get statistics")
     
+    async def compute_stats() -> StatsResponse:
+        return StatsResponse(**await asyncio.to_thread(db.get_job_stats))
+    
+    @app.get("/api/dashboard", response_model=DashboardResponse)
+    async def get_dashboard(status: Optional[str] = None, limit: int = 50, offset: int = 0, q: Optional[str] = None):
+        """Health, statistics and a page of jobs in one response, for the dashboard's polling"""
+        try:
+            health, jobs = await asyncio.gather(
+                recent_health.get(compute_health),
+                asyncio.to_thread(db.get_jobs, status=status, limit=limit, offset=offset, q=q),
+            )
+            # Health already carries the job statistics; don't query them a second time
+            return DashboardResponse(health=health, stats=health.stats, jobs=jobs)
+        except Exception as e:
+            log_error(f"Error getting dashboard data: {e}")
+            raise HTTPException(status_code=500, detail="Failed to get dashboard data")
+    
+    @app.get("/api/events")
+    async def get_events():
+        """Server-sent events: a `jobs` event each time jobs are created, updated or removed"""
+        return StreamingResponse(
+            job_events.stream(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache"},
+        )
+    
     @app.get("/api/jobs", response_model=List[JobResponse])
-    async def get_jobs(status: Optional[str] = None, limit: int = 50, offset: int = 0):
-        """Get jobs with optional filtering"""
+    async def get_jobs(status: Optional[str] = None, limit: int = 50, offset: int = 0, q: Optional[str] = None):
+        """Get jobs with optional filtering; q matches a filename substring"""
         try:
-            jobs = db.get_jobs(status=status, limit=limit, offset=offset)
-            return [JobResponse(**job) for job in jobs]
+            return await asyncio.to_thread(db.get_jobs, status=status, limit=limit, offset=offset, q=q)
         except Exception as e:
             log_error(f"Error getting jobs: {e}")
             raise HTTPException(status_code=500, detail="Failed to get jobs")
@@ -464,10 +357,10 @@ def create_app() -> FastAPI:
     async def get_job(job_id: int):
         """Get specific job details"""
         try:
-            job = db.get_job(job_id)
+            job = await asyncio.to_thread(db.get_job, job_id)
             if not job:
                 raise HTTPException(status_code=404, detail="Job not found")
-            return JobResponse(**job)
+            return job
         except HTTPException:
             raise
         except Exception as e:
@@ -484,7 +377,7 @@ def create_app() -> FastAPI:
                 raise HTTPException(status_code=404, detail="File not found")
             
             # Process file in background
-            p = get_processor()
+            p = await get_processor()
             if p is None:
                 raise HTTPException(status_code=400, detail="Service not configured. Please set API keys on /admin")
             background_tasks.add_task(p.process_file, file_path)
@@ -511,42 +404,51 @@ def create_app() -> FastAPI:
             log_error(f"Error getting monitor status: {e}")
             raise HTTPException(status_code=500, detail="Failed to get monitor status")
     
-    @app.get("/api/logs")
+    @app.get("/api/logs", response_model=List[LogResponse])
     async def get_logs(job_id: Optional[int] = None, level: Optional[str] = None, 
-                      limit: int = 100, offset: int = 0):
-        """Get application logs"""
+                      limit: int = 100, offset: int = 0, before_id: Optional[int] = None):
+        """Get application logs, newest first; pass the last id seen as before_id for the next page"""
         try:
-            logs = db.get_logs(job_id=job_id, level=level, limit=limit, offset=offset)
+            logs = await asyncio.to_thread(db.get_logs, job_id=job_id, level=level, limit=limit, offset=offset, before_id=before_id)
             return logs
         except Exception as e:
             log_error(f"Error getting logs: {e}")
             raise HTTPException(status_code=500, detail="Failed to get logs")
 
+    # Settings only change through save_settings, which clears this
+    settings_snapshot: Optional[Dict[str, Any]] = None
+    
     @app.get("/api/settings")
     async def get_settings():
         """Read current settings from environment/config"""
+        nonlocal settings_snapshot
         try:
-            cfg = ConfigManager()
-            return {
-                "model": cfg.get("openai.model"),
-                "deepgram_api_key": bool(os.getenv("DEEPGRAM_API_KEY")),
-                "openai_api_key": bool(os.getenv("OPENAI_API_KEY")),
-                "watch_folder": os.getenv("WATCH_FOLDER") or cfg.get("processing.watch_folder"),
-                "processed_folder": os.getenv("PROCESSED_FOLDER") or cfg.get("processing.processed_folder"),
-                "error_folder": os.getenv("ERROR_FOLDER") or cfg.get("processing.error_folder"),
-                "output_folder": os.getenv("OUTPUT_FOLDER") or cfg.get("processing.output_folder"),
-            }
+            if settings_snapshot is None:
+                settings_snapshot = read_settings()
+            return dict(settings_snapshot)
         except Exception as e:
             log_error(f"Error reading settings: {e}")
             raise HTTPException(status_code=500, detail="Failed to read settings")
+    
+    def read_settings() -> Dict[str, Any]:
+        # API keys are reported only as present or missing
+        return {
+            "model": config.get("openai.model"),
+            "deepgram_api_key": bool(os.getenv("DEEPGRAM_API_KEY")),
+            "openai_api_key": bool(os.getenv("OPENAI_API_KEY")),
+            "watch_folder": os.getenv("WATCH_FOLDER") or config.get("processing.watch_folder"),
+            "processed_folder": os.getenv("PROCESSED_FOLDER") or config.get("processing.processed_folder"),
+            "error_folder": os.getenv("ERROR_FOLDER") or config.get("processing.error_folder"),
+            "output_folder": os.getenv("OUTPUT_FOLDER") or config.get("processing.output_folder"),
+        }
 
     @app.post("/api/settings")
     async def save_settings(req: SettingsRequest):
         """Persist settings into config/.env and config.yaml (model) so app can use them next start"""
+        nonlocal settings_snapshot
         try:
             os.makedirs("config", exist_ok=True)
             path = os.path.join("config", ".env")
-            cfg = ConfigManager()
 
             # Load existing lines to preserve unknown keys
             existing: Dict[str, str] = {}
@@ -554,10 +456,9 @@ def create_app() -> FastAPI:
                 try:
                     with open(path, "r", encoding="utf-8") as f:
                         for line in f:
-                            if not line.strip() or line.strip().startswith("#"):
-                                continue
-                            if "=" in line:
-                                k, v = line.strip().split("=", 1)
+                            line = line.strip()
+                            if line and not line.startswith("#") and "=" in line:
+                                k, v = line.split("=", 1)
                                 existing[k] = v
                 except Exception:
                     pass
@@ -578,26 +479,26 @@ def create_app() -> FastAPI:
                 "OUTPUT_FOLDER": q(req.output_folder) if req.output_folder is not None else existing.get("OUTPUT_FOLDER"),
             }
 
-            # Write merged
-            with open(path, "w", encoding="utf-8") as f:
-                f.write("# Managed by admin UI\n")
-                for k, v in updates.items():
-                    if v is not None:
-                        f.write(f"{k}={v}\n")
+            # Write merged (keys the form doesn't manage are kept as they were)
+            merged = {**existing, **{k: v for k, v in updates.items() if v is not None}}
+            _replace_file(path, "# Managed by admin UI\n" + "".join(f"{k}={v}\n" for k, v in merged.items()))
 
             # If model provided, update config.yaml directly
             if req.model is not None:
                 try:
                     import yaml
-                    with open(cfg.config_path, 'r', encoding='utf-8') as f:
+                    with open(config.config_path, 'r', encoding='utf-8') as f:
                         data = yaml.safe_load(f) or {}
                     if 'openai' not in data or not isinstance(data['openai'], dict):
                         data['openai'] = {}
                     data['openai']['model'] = req.model
-                    with open(cfg.config_path, 'w', encoding='utf-8') as f:
-                        yaml.safe_dump(data, f, sort_keys=False, allow_unicode=True)
+                    _replace_file(config.config_path, yaml.safe_dump(data, sort_keys=False, allow_unicode=True))
                 except Exception as e:
                     log_error(f"Failed to update config.yaml model: {e}")
+            
+            # The handlers share one ConfigManager; pick up the files just written
+            config.reload()
+            settings_snapshot = None
 
             return {"message": "Settings saved. Restart app to apply."}
         except Exception as e: